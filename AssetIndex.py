@@ -0,0 +1,216 @@
+from .REEMeshFile import *
+from .REEMDFFile import *
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import os
+import sqlite3
+
+# Full suffixes, other version 10 files (.uvs.10, ...) are not MDF files
+meshExtension = ".mesh.1808282334"
+mdfExtension = ".mdf2.10"
+
+# Indexes written with another schema version are rebuilt from scratch
+schemaVersion = 2
+
+schema = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS meshes (
+    fileId INTEGER PRIMARY KEY REFERENCES files(id) ON DELETE CASCADE,
+    lodCount INTEGER,
+    vertexCount INTEGER,  -- of the highest quality LOD
+    faceCount INTEGER,
+    faceIndexSize INTEGER,
+    hasShadowGeo INTEGER,
+    boneCount INTEGER
+);
+CREATE TABLE IF NOT EXISTS meshMaterials (
+    fileId INTEGER REFERENCES files(id) ON DELETE CASCADE,
+    slot INTEGER,
+    name TEXT
+);
+CREATE TABLE IF NOT EXISTS meshBones (
+    fileId INTEGER REFERENCES files(id) ON DELETE CASCADE,
+    boneIndex INTEGER,
+    name TEXT
+);
+CREATE TABLE IF NOT EXISTS mdfMaterials (
+    fileId INTEGER REFERENCES files(id) ON DELETE CASCADE,
+    name TEXT,
+    shaderType INTEGER,
+    flags INTEGER,
+    masterMaterialFilePath TEXT
+);
+CREATE TABLE IF NOT EXISTS mdfTextures (
+    fileId INTEGER REFERENCES files(id) ON DELETE CASCADE,
+    materialName TEXT,
+    type TEXT,
+    filePath TEXT
+);
+CREATE INDEX IF NOT EXISTS meshMaterialNames ON meshMaterials(name);
+CREATE INDEX IF NOT EXISTS meshBoneNames ON meshBones(name);
+CREATE INDEX IF NOT EXISTS mdfMaterialNames ON mdfMaterials(name);
+CREATE INDEX IF NOT EXISTS mdfTexturePaths ON mdfTextures(filePath);
+"""
+
+
+def ReadAssetInfo(path: str, kind: str) -> dict:
+    # Runs in a worker process, reads what the index keeps of one file into plain values that are cheap to send back
+    # Meshes are only summarized from their headers, no vertex data is decoded
+    try:
+        if kind == 'MESH':
+            summary = REEMesh.Probe(path)
+            return {"lodCount": summary.lodCount, "vertexCount": summary.lodVertexCounts[0] if summary.lodCount else 0,
+                    "faceCount": summary.lodFaceCounts[0] if summary.lodCount else 0,
+                    "faceIndexSize": summary.faceIndexSize, "hasShadowGeo": summary.hasShadowGeo,
+                    "boneCount": summary.boneCount, "materialNames": summary.materialNames,
+                    "boneNames": summary.boneNames}
+
+        mdf = MDF(MapFile(path))
+        return {"materials": [(material.name, material.shaderType, material.flags, material.masterMaterialFilePath,
+                               [(texture.type, texture.filePath) for texture in material.textureInfo])
+                              for material in mdf.materials]}
+    except Exception as error:
+        return {"error": f"{type(error).__name__}: {error}"}
+
+
+class AssetIndex:
+    # SQLite index of the meshes and MDF files under an asset root (the x64 folder), built without Blender
+    # Paths are stored relative to the root with forward slashes
+    def __init__(self, databasePath: str):
+        self.databasePath = databasePath
+        self.connection = sqlite3.connect(databasePath)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != schemaVersion:
+            with self.connection:
+                for table, in self.connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+                    self.connection.execute(f"DROP TABLE {table}")
+        self.connection.executescript(schema)
+        self.connection.execute(f"PRAGMA user_version = {schemaVersion}")
+
+    @staticmethod
+    def FindAssets(root: str) -> dict[str, tuple[str, int, int]]:
+        # Kind, size and modification time of every mesh and MDF file under the root, by relative path
+        assets: dict[str, tuple[str, int, int]] = {}
+        for dirPath, dirNames, fileNames in os.walk(root):
+            for fileName in fileNames:
+                isMesh = fileName.endswith(meshExtension)
+                if not isMesh and not fileName.endswith(mdfExtension):
+                    continue
+
+                path = os.path.join(dirPath, fileName)
+                stat = os.stat(path)
+                assets[os.path.relpath(path, root).replace(os.sep, '/')] = \
+                    ('MESH' if isMesh else 'MDF', stat.st_size, stat.st_mtime_ns)
+        return assets
+
+    def Update(self, root: str, processes: int or None = None) -> tuple[int, int]:
+        # Reads the files that are new or changed since the last update and forgets the ones that are gone, returns
+        # how many were read and how many were removed
+        assets = self.FindAssets(root)
+        known = {path: (size, mtime) for path, size, mtime in
+                 self.connection.execute("SELECT path, size, mtime FROM files")}
+
+        removed = [path for path in known if path not in assets]
+        changed = [path for path, (kind, size, mtime) in assets.items() if known.get(path) != (size, mtime)]
+
+        with self.connection:
+            self.connection.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in removed])
+
+        if changed:
+            with ProcessPoolExecutor(processes, mp_context=get_context('spawn')) as executor:
+                infos = executor.map(ReadAssetInfo, [os.path.join(root, path) for path in changed],
+                                     [assets[path][0] for path in changed], chunksize=16)
+                # Results are written in batches as they arrive, one transaction each
+                batch: list[tuple[str, dict]] = []
+                for path, info in zip(changed, infos):
+                    batch.append((path, info))
+                    if len(batch) == 256:
+                        self.__Write(batch, assets)
+                        batch = []
+                self.__Write(batch, assets)
+
+        return len(changed), len(removed)
+
+    def __Write(self, batch: list[tuple[str, dict]], assets: dict[str, tuple[str, int, int]]):
+        with self.connection:
+            for path, info in batch:
+                kind, size, mtime = assets[path]
+                self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+                fileId = self.connection.execute(
+                    "INSERT INTO files (path, kind, size, mtime, error) VALUES (?, ?, ?, ?, ?)",
+                    (path, kind, size, mtime, info.get("error"))).lastrowid
+                if "error" in info:
+                    continue
+
+                if kind == 'MESH':
+                    self.connection.execute(
+                        "INSERT INTO meshes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (fileId, info["lodCount"], info["vertexCount"], info["faceCount"], info["faceIndexSize"],
+                         info["hasShadowGeo"], info["boneCount"]))
+                    self.connection.executemany("INSERT INTO meshMaterials VALUES (?, ?, ?)",
+                                                [(fileId, slot, name) for slot, name in
+                                                 enumerate(info["materialNames"])])
+                    self.connection.executemany("INSERT INTO meshBones VALUES (?, ?, ?)",
+                                                [(fileId, idx, name) for idx, name in enumerate(info["boneNames"])])
+                else:
+                    for name, shaderType, flags, masterMaterialFilePath, textures in info["materials"]:
+                        self.connection.execute("INSERT INTO mdfMaterials VALUES (?, ?, ?, ?, ?)",
+                                                (fileId, name, shaderType, flags, masterMaterialFilePath))
+                        self.connection.executemany("INSERT INTO mdfTextures VALUES (?, ?, ?, ?)",
+                                                    [(fileId, name, textureType, filePath) for textureType, filePath
+                                                     in textures])
+
+    def MeshesUsingMaterial(self, materialName: str) -> list[str]:
+        return [path for path, in self.connection.execute(
+            "SELECT DISTINCT files.path FROM meshMaterials JOIN files ON files.id = meshMaterials.fileId "
+            "WHERE meshMaterials.name = ? ORDER BY files.path", (materialName,))]
+
+    def MeshesUsingBone(self, boneName: str) -> list[str]:
+        return [path for path, in self.connection.execute(
+            "SELECT DISTINCT files.path FROM meshBones JOIN files ON files.id = meshBones.fileId "
+            "WHERE meshBones.name = ? ORDER BY files.path", (boneName,))]
+
+    def MDFsUsingTexture(self, texturePath: str) -> list[str]:
+        # Texture paths as the MDF files store them, without the .11 extension
+        return [path for path, in self.connection.execute(
+            "SELECT DISTINCT files.path FROM mdfTextures JOIN files ON files.id = mdfTextures.fileId "
+            "WHERE mdfTextures.filePath = ? ORDER BY files.path", (texturePath.replace('\\', '/'),))]
+
+    def MaterialTextures(self, mdfPath: str) -> dict[str, list[tuple[str, str]]]:
+        # Texture type and path of every material of an MDF file
+        textures: dict[str, list[tuple[str, str]]] = {}
+        for materialName, textureType, filePath in self.connection.execute(
+                "SELECT mdfTextures.materialName, mdfTextures.type, mdfTextures.filePath FROM mdfTextures "
+                "JOIN files ON files.id = mdfTextures.fileId WHERE files.path = ? ORDER BY mdfTextures.rowid",
+                (mdfPath,)):
+            textures.setdefault(materialName, []).append((textureType, filePath))
+        return textures
+
+    def FolderCounts(self, folder: str = "") -> tuple[int, int, int]:
+        # Mesh, vertex and face counts of all the meshes under a folder (relative to the root, empty for all), only the
+        # highest quality LOD of each mesh counts
+        folder = folder.replace('\\', '/').strip('/')
+        pattern = folder.replace('%', '\\%').replace('_', '\\_') + '/%' if folder else '%'
+        meshCount, vertexCount, faceCount = self.connection.execute(
+            "SELECT COUNT(*), TOTAL(meshes.vertexCount), TOTAL(meshes.faceCount) FROM meshes "
+            "JOIN files ON files.id = meshes.fileId WHERE files.path LIKE ? ESCAPE '\\'", (pattern,)).fetchone()
+        return meshCount, int(vertexCount), int(faceCount)
+
+    def FailedFiles(self) -> list[tuple[str, str]]:
+        return self.connection.execute("SELECT path, error FROM files WHERE error IS NOT NULL ORDER BY path").fetchall()
+
+    def Close(self):
+        self.connection.close()
+
+    def __enter__(self) -> 'AssetIndex':
+        return self
+
+    def __exit__(self, *args):
+        self.Close()
@@ -0,0 +1,227 @@
+from .REEMeshWriter import *
+from .REEMDFFile import *
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+defaultBaselinePath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "BenchmarkBaseline.json")
+
+# Sizes swept by the benchmark, every sweep keeps the other sizes at their default
+vertexSweep = [1_000, 10_000, 100_000, 1_000_000, 2_000_000]
+quickVertexSweep = [1_000, 10_000, 100_000]
+boneSweep = [1, 10, 100, 1000]
+materialSweep = [1, 10, 100, 500]
+defaultVertexCount = 10_000
+defaultBoneCount = 64
+defaultMaterialCount = 8
+
+# Every case timed on a generated mesh (when its sweep includes it)
+meshCases = ["REEMesh", "REEMesh.Probe", "ReadStrided", "NormalAndTangent.Decode", "ReadStrided.half",
+             "SkinWeights.Decode", "NameTable"]
+
+
+def GenerateMDF(materialCount: int, textureCount: int = 8, propertyCount: int = 24) -> bytearray:
+    # An MDF file of made up materials, texture types, property names and the master material are shared between
+    # materials as they are in real files, material names and texture paths are unique
+    writer = BinaryWriter()
+    writer.Write(GetStruct('<IHHQ').pack(0x0046444D, 19, materialCount, 0))
+    materialsOffset = writer.Reserve(Material.size * materialCount)
+    writer.Align()
+
+    strings: dict[str, int] = {}
+    stringRefs: list[tuple[int, str]] = []
+
+    materialRecords = np.zeros(materialCount, Material.dtype)
+    for i in range(materialCount):
+        textureRecords = np.zeros(textureCount, TextureInfo.dtype)
+        propertyRecords = np.zeros(propertyCount, PropertyInfo.dtype)
+        propertyRecords['parameterCount'] = [1 if j % 3 == 1 else 4 for j in range(propertyCount)]
+        propertyRecords['propertyOffsetInBuffer'] = 16 * np.arange(propertyCount)
+
+        textureInfoOffset = writer.pos
+        stringRefs += [(textureInfoOffset + j * TextureInfo.size, f"TextureType_{j}") for j in range(textureCount)]
+        stringRefs += [(textureInfoOffset + j * TextureInfo.size + 16, f"Textures/Material_{i}/Texture_{j}.tex")
+                       for j in range(textureCount)]
+        writer.Write(textureRecords)
+        writer.Align()
+
+        propertyInfoOffset = writer.pos
+        stringRefs += [(propertyInfoOffset + j * PropertyInfo.size, f"Property_{j}") for j in range(propertyCount)]
+        writer.Write(propertyRecords)
+        writer.Align()
+
+        propertyBufferOffset = writer.Write(np.arange(4 * propertyCount, dtype=GetDType(np.single)))
+        writer.Align()
+
+        materialRecords[i] = PackRecord(Material.dtype, propertyBufferSize=16 * propertyCount,
+                                        propertyCount=propertyCount, textureCount=textureCount,
+                                        flags=MaterialFlags.BaseTwoSideEnable, propertyInfoOffset=propertyInfoOffset,
+                                        textureInfoOffset=textureInfoOffset, propertyBufferOffset=propertyBufferOffset)
+        materialRef = materialsOffset + i * Material.size
+        stringRefs += [(materialRef, f"Material_{i}"), (materialRef + 56, "Materials/Master.mmtr")]
+    writer.WriteAt(materialsOffset, materialRecords)
+
+    # Strings go last, each one written once no matter how many records point at it
+    for ref, string in stringRefs:
+        if string not in strings:
+            strings[string] = writer.Write(string.encode('utf-16-le') + b'\0\0')
+        writer.WriteAt(ref, GetStruct('<Q').pack(strings[string]))
+    writer.Align()
+    return writer.buffer
+
+
+def Measure(function, repeat: int, minTime: float) -> tuple[float, float]:
+    # Best time of a few runs and the peak traced memory of one more run, small cases run until they took minTime
+    # seconds in total so their best time settles, the traced run is kept apart since tracing slows allocations down
+    best = float('inf')
+    total = 0.0
+    runs = 0
+    while runs < repeat or (total < minTime and runs < 1000):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        runs += 1
+
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def MeshCases(vertexCount: int, boneCount: int, materialCount: int, label: str, readers: bool = False,
+              names: bool = False, pattern: str = "") -> Iterator[tuple[str, bytes, int, object]]:
+    # Name, input, vertex count and function of each case timed on a generated mesh, the mesh is only generated if
+    # some case of it is going to run
+    if not any(pattern in f"{case}/{label}" for case in meshCases):
+        return
+
+    fileBuffer = bytes(GenerateSyntheticMesh(vertexCount, boneCount, materialCount).ToBytes())
+    yield f"REEMesh/{label}", fileBuffer, vertexCount, lambda: REEMesh(fileBuffer).Close()
+    yield f"REEMesh.Probe/{label}", fileBuffer, vertexCount, lambda: REEMesh.Probe(fileBuffer)
+
+    reModel = REEMesh(fileBuffer, lazy=True)
+    if readers:
+        # The hot decode paths on their own, each on the stream it decodes
+        vertexBufferHeader = reModel.vertexBufferHeader
+        for element in vertexBufferHeader.vertexElementHeaders:
+            pos = vertexBufferHeader.vertexBufferOffset + element.offsetInVertexBuffer
+            stream = fileBuffer[pos:pos + vertexCount * element.bytesPerVertex]
+            match element.elementType:
+                case VertexElementHeader.ElementType.VertexPosition:
+                    yield f"ReadStrided/{label}", stream, vertexCount, \
+                        lambda stream=stream: np.array(ReadStrided(stream, 0, vertexCount, np.single, 3, 12))
+                case VertexElementHeader.ElementType.NormalsTangents:
+                    yield f"NormalAndTangent.Decode/{label}", stream, vertexCount, \
+                        lambda stream=stream: NormalAndTangent.Decode(stream, 0, vertexCount)
+                case VertexElementHeader.ElementType.UV0:
+                    yield f"ReadStrided.half/{label}", stream, vertexCount, \
+                        lambda stream=stream: np.array(ReadStrided(stream, 0, vertexCount, np.half, 2, 4))
+                case VertexElementHeader.ElementType.BoneInfo:
+                    yield f"SkinWeights.Decode/{label}", stream, vertexCount, \
+                        lambda stream=stream: SkinWeights.Decode(stream, 0, vertexCount)
+
+    if names:
+        # The name table closes the file
+        header = reModel.header
+        yield f"NameTable/{label}", fileBuffer[header.nameTableOffset:], 0, \
+            lambda: NameTable(fileBuffer, header.nameTableOffset, header.nameTableNodeCount)
+    reModel.Close()
+
+
+def Cases(quick: bool = False, pattern: str = "") -> Iterator[tuple[str, bytes, int, object]]:
+    for vertexCount in quickVertexSweep if quick else vertexSweep:
+        yield from MeshCases(vertexCount, defaultBoneCount, defaultMaterialCount, f"vertices={vertexCount}",
+                             readers=True, pattern=pattern)
+
+    for boneCount in boneSweep:
+        yield from MeshCases(defaultVertexCount, boneCount, defaultMaterialCount, f"bones={boneCount}", names=True,
+                             pattern=pattern)
+
+    for materialCount in materialSweep:
+        # A mainmesh can only hold 255 submeshes, so meshes stop there while MDF files go all the way
+        if materialCount <= 255:
+            yield from MeshCases(defaultVertexCount, defaultBoneCount, materialCount, f"materials={materialCount}",
+                                 pattern=pattern)
+        if pattern not in f"MDF/materials={materialCount}":
+            continue
+        fileBuffer = bytes(GenerateMDF(materialCount))
+        yield f"MDF/materials={materialCount}", fileBuffer, 0, lambda fileBuffer=fileBuffer: MDF(fileBuffer)
+
+
+def Run(quick: bool = False, repeat: int = 3, minTime: float = 0.2, pattern: str = "") -> dict[str, dict]:
+    results: dict[str, dict] = {}
+    for name, data, vertexCount, function in Cases(quick, pattern):
+        if pattern not in name:
+            continue
+
+        seconds, peak = Measure(function, repeat, minTime)
+        results[name] = {"seconds": seconds, "MBps": len(data) / 1e6 / seconds,
+                         "verticesPerSecond": vertexCount / seconds if vertexCount else None,
+                         "peakMemoryMB": peak / 1e6, "inputMB": len(data) / 1e6}
+        print(FormatResult(name, results[name]), flush=True)
+    return results
+
+
+def FormatResult(name: str, result: dict) -> str:
+    verticesPerSecond = f"{result['verticesPerSecond']:14,.0f} vert/s" if result["verticesPerSecond"] else " " * 21
+    return f"{name:<44} {result['seconds'] * 1000:10.2f} ms {result['MBps']:10.1f} MB/s {verticesPerSecond} " \
+           f"{result['peakMemoryMB']:9.1f} MB peak"
+
+
+def Compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    # Cases that got slower or use more memory than the baseline allows, cases missing from either side are skipped
+    regressions: list[str] = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["seconds"] > base["seconds"] * (1 + tolerance):
+            regressions.append(f"{name}: {base['seconds'] * 1000:.2f} ms -> {result['seconds'] * 1000:.2f} ms")
+        # Small allocations jitter, so memory only counts once it grows by a megabyte as well
+        if result["peakMemoryMB"] > base["peakMemoryMB"] * (1 + tolerance) + 1:
+            regressions.append(f"{name}: {base['peakMemoryMB']:.1f} MB -> {result['peakMemoryMB']:.1f} MB peak")
+    return regressions
+
+
+def Main(argv: list[str] or None = None) -> int:
+    parser = argparse.ArgumentParser(prog=f"python -m {__package__}.Benchmark",
+                                     description="Time the mesh, MDF and name table parsers on generated files")
+    parser.add_argument("--quick", action="store_true", help="stop the vertex sweep at 100k vertices")
+    parser.add_argument("-k", "--filter", default="", help="only run the cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, the best one counts (default: 3)")
+    parser.add_argument("--baseline", default=defaultBaselinePath,
+                        help="baseline JSON, written by the first run and compared against after that")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="slowdown allowed before a case counts as a regression (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    results = Run(args.quick, args.repeat, pattern=args.filter)
+
+    baseline: dict[str, dict] = {}
+    if os.path.isfile(args.baseline):
+        with open(args.baseline, 'r') as baselineFile:
+            baseline = json.load(baselineFile)
+
+    regressions = Compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"Regression: {regression}", file=sys.stderr)
+
+    if args.update_baseline or not baseline:
+        # Cases left out of this run keep their old baseline
+        with open(args.baseline, 'w') as baselineFile:
+            json.dump({**baseline, **results}, baselineFile, indent=1, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(Main())
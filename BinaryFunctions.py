@@ -1,8 +1,26 @@
+import mmap
 import struct
 import numpy as np
+from functools import lru_cache
 from typing import Literal
 
 
+@lru_cache(maxsize=None)
+def GetDType(npType: type, endianness: Literal['little', 'big'] = "little") -> np.dtype:
+    # Byte ordered dtypes are built once and reused by every read
+    return np.dtype(npType).newbyteorder('>' if endianness == 'big' else '<')
+
+
+@lru_cache(maxsize=None)
+def GetStruct(byteFormat: str) -> struct.Struct:
+    # Precompiled struct for a format string
+    return struct.Struct(byteFormat)
+
+
+def _UnpackScalar(buffer: bytes, pos: int, formatChar: str, endianness: Literal['little', 'big']) -> int or float:
+    return GetStruct(('>' if endianness == 'big' else '<') + formatChar).unpack_from(buffer, pos)[0]
+
+
 def ReadInt(buffer: bytes, pos: int = 0, size: int = 4, signed: bool = False,
             endianness: Literal['little', 'big'] = "little") -> int:
     return int.from_bytes(buffer[pos:pos + size], endianness, signed=signed)
@@ -11,83 +29,107 @@ def ReadInt(buffer: bytes, pos: int = 0, size: int = 4, signed: bool = False,
 def ReadByte(buffer: bytes, pos: int = 0, count: int = 0, signed: bool = False,
              endianness: Literal['little', 'big'] = "little") -> int or np.ndarray:
     if count > 0:
-        npType = np.byte if signed else np.ubyte
-        dt = np.dtype(npType).newbyteorder('>' if endianness == 'big' else '<')
-        return np.frombuffer(buffer, dt, count, pos)
+        return np.frombuffer(buffer, GetDType(np.byte if signed else np.ubyte, endianness), count, pos)
     else:
-        return int.from_bytes(buffer[pos:pos+1], endianness, signed=signed)
+        return _UnpackScalar(buffer, pos, 'b' if signed else 'B', endianness)
 
 
 def ReadInt16(buffer: bytes, pos: int = 0, count: int = 0, signed: bool = False,
               endianness: Literal['little', 'big'] = "little") -> int or np.ndarray:
     if count > 0:
-        npType = np.short if signed else np.ushort
-        dt = np.dtype(npType).newbyteorder('>' if endianness == 'big' else '<')
-        return np.frombuffer(buffer, dt, count, pos)
+        return np.frombuffer(buffer, GetDType(np.short if signed else np.ushort, endianness), count, pos)
     else:
-        return int.from_bytes(buffer[pos:pos+2], endianness, signed=signed)
+        return _UnpackScalar(buffer, pos, 'h' if signed else 'H', endianness)
 
 
 def ReadInt32(buffer: bytes, pos: int = 0, count: int = 0, signed: bool = False,
               endianness: Literal['little', 'big'] = "little") -> int or np.ndarray:
     if count > 0:
-        npType = np.intc if signed else np.uintc
-        dt = np.dtype(npType).newbyteorder('>' if endianness == 'big' else '<')
-        return np.frombuffer(buffer, dt, count, pos)
+        return np.frombuffer(buffer, GetDType(np.intc if signed else np.uintc, endianness), count, pos)
     else:
-        return int.from_bytes(buffer[pos:pos+4], endianness, signed=signed)
+        return _UnpackScalar(buffer, pos, 'i' if signed else 'I', endianness)
 
 
 def ReadInt64(buffer: bytes, pos: int = 0, count: int = 0, signed: bool = False,
               endianness: Literal['little', 'big'] = "little") -> int or np.ndarray:
     if count > 0:
-        npType = np.longlong if signed else np.ulonglong
-        dt = np.dtype(npType).newbyteorder('>' if endianness == 'big' else '<')
-        return np.frombuffer(buffer, dt, count, pos)
+        return np.frombuffer(buffer, GetDType(np.longlong if signed else np.ulonglong, endianness), count, pos)
     else:
-        return int.from_bytes(buffer[pos:pos+8], endianness, signed=signed)
+        return _UnpackScalar(buffer, pos, 'q' if signed else 'Q', endianness)
 
 
 def ReadHalfFloat(buffer: bytes, pos: int = 0, count: int = 0,
                   endianness: Literal['little', 'big'] = "little") -> float or np.ndarray:
     if count > 0:
-        dt = np.dtype(np.half).newbyteorder('>' if endianness == 'big' else '<')
-        return np.frombuffer(buffer, dt, count, pos)
+        return np.frombuffer(buffer, GetDType(np.half, endianness), count, pos)
     else:
-        byteFormat = 'e'
-        if endianness == 'little':
-            byteFormat = '<e'
-        elif endianness == "big":
-            byteFormat = '>e'
-        return struct.unpack(byteFormat, bytes(buffer[pos:pos+2]))[0]
+        return _UnpackScalar(buffer, pos, 'e', endianness)
 
 
 def ReadFloat(buffer: bytes, pos: int = 0, count: int = 0,
               endianness: Literal['little', 'big'] = "little") -> float or np.ndarray:
     if count > 0:
-        dt = np.dtype(np.single).newbyteorder('>' if endianness == 'big' else '<')
-        return np.frombuffer(buffer, dt, count, pos)
+        return np.frombuffer(buffer, GetDType(np.single, endianness), count, pos)
     else:
-        byteFormat = 'f'
-        if endianness == 'little':
-            byteFormat = '<f'
-        elif endianness == "big":
-            byteFormat = '>f'
-        return struct.unpack(byteFormat, bytes(buffer[pos:pos+4]))[0]
+        return _UnpackScalar(buffer, pos, 'f', endianness)
 
 
 def ReadDouble(buffer: bytes, pos: int = 0, count: int = 0,
                endianness: Literal['little', 'big'] = "little") -> float or np.ndarray:
     if count > 0:
-        dt = np.dtype(np.double).newbyteorder('>' if endianness == 'big' else '<')
-        return np.frombuffer(buffer, dt, count, pos)
+        return np.frombuffer(buffer, GetDType(np.double, endianness), count, pos)
+    else:
+        return _UnpackScalar(buffer, pos, 'd', endianness)
+
+
+def ReadStrided(buffer: bytes, pos: int = 0, count: int = 0, npType: type = np.ubyte, width: int = 1,
+                stride: int = 0, endianness: Literal['little', 'big'] = "little") -> np.ndarray:
+    # Returns a (count, width) view over interleaved records that are stride bytes apart
+    dt = GetDType(npType, endianness)
+    return np.ndarray((count, width), dt, buffer, pos, (stride if stride > 0 else dt.itemsize * width, dt.itemsize))
+
+
+def WriteStrided(records: np.ndarray, pos: int, values: np.ndarray, npType: type = np.ubyte,
+                 endianness: Literal['little', 'big'] = "little"):
+    # Inverse of ReadStrided, stores (count, width) values pos bytes into each row of a (count, stride) byte array
+    dt = GetDType(npType, endianness)
+    values = np.ascontiguousarray(values, dt).reshape((len(records), -1))
+    records[:, pos:pos + values.shape[1] * dt.itemsize] = values.view(np.ubyte)
+
+
+def MapFile(path: str) -> mmap.mmap:
+    # Read-only memory map of the whole file, pages are only loaded from disk once they are touched
+    with open(path, 'rb') as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def ReadStruct(buffer: bytes, pos: int = 0, dtype: np.dtype = np.dtype(np.ubyte),
+               count: int or None = None) -> np.void or np.ndarray:
+    # Reads one record (count is None) or a whole table of records laid out as described by a structured dtype
+    if count is not None:
+        return np.frombuffer(buffer, dtype, count, pos)
     else:
-        byteFormat = 'd'
-        if endianness == 'little':
-            byteFormat = '<d'
-        elif endianness == "big":
-            byteFormat = '>d'
-        return struct.unpack(byteFormat, bytes(buffer[pos:pos+8]))[0]
+        return np.frombuffer(buffer, dtype, 1, pos)[0]
+
+
+def AssignFields(target: object, record: np.void):
+    # Copies the fields of a structured record to attributes of the same name, scalars as Python values and arrays as
+    # copies, so nothing keeps the buffer the record was read from alive
+    for name in record.dtype.names:
+        value = record[name]
+        setattr(target, name, value.item() if np.ndim(value) == 0 else value.copy())
+
+
+def PackRecord(dtype: np.dtype, source: object or None = None, **values) -> np.ndarray:
+    # Builds one structured record, the inverse of AssignFields: fields come from the attributes of the same name on
+    # the source (if it has them), then from the keyword values, anything else is left zero
+    record = np.zeros((), dtype)
+    for name in dtype.names:
+        if name in values:
+            record[name] = values[name]
+        elif source is not None and hasattr(source, name):
+            record[name] = getattr(source, name)
+    return record
 
 
 def ReadUTF8String(buffer: bytes, pos: int = 0, size: int = 0) -> str:
@@ -110,5 +152,145 @@ def ReadUTF16String(buffer: bytes, pos: int = 0, size: int = 0) -> str:
     #return bytes(buffer[pos:pos+len]).decode("utf-16")
 
 
+def ReadUTF8Strings(buffer: bytes, offsets: list[int] or np.ndarray) -> list[str]:
+    # Decodes many NUL terminated strings at once by finding every terminator of the region they share in one pass
+    offsets = np.asarray(offsets, np.int64)
+    if offsets.size == 0:
+        return []
+
+    start = int(offsets.min())
+    end = buffer.find(b'\x00', int(offsets.max()))
+    end = len(buffer) if end == -1 else end + 1
+
+    region = np.frombuffer(buffer, np.ubyte, end - start, start)
+    terminators = np.append(np.flatnonzero(region == 0), region.size)
+    starts = offsets - start
+    ends = terminators[np.searchsorted(terminators, starts)]
+
+    regionBytes = region.tobytes()
+    return [regionBytes[s:e].decode('utf-8') for s, e in zip(starts.tolist(), ends.tolist())]
+
+
+def ReadUTF16Strings(buffer: bytes, offsets: list[int] or np.ndarray) -> list[str]:
+    # Decodes many NUL terminated UTF-16 strings at once by finding every terminator of the region they share in one
+    # pass, strings that are not 2 byte aligned with the first one fall back to ReadUTF16String
+    offsets = np.asarray(offsets, np.int64)
+    if offsets.size == 0:
+        return []
+
+    start = int(offsets.min())
+    lastOffset = int(offsets.max())
+    end = buffer.find(b'\x00\x00', lastOffset)
+    while end != -1 and (end - lastOffset) % 2 != 0:
+        end = buffer.find(b'\x00\x00', end + 1)
+    end = start + (len(buffer) - start) // 2 * 2 if end == -1 else end + 2
+
+    region = np.frombuffer(buffer, np.dtype(np.ushort).newbyteorder('<'), (end - start) // 2, start)
+    terminators = np.append(np.flatnonzero(region == 0) * 2, region.size * 2)
+    starts = offsets - start
+    ends = terminators[np.searchsorted(terminators, starts)]
+
+    regionBytes = region.tobytes()
+    return [regionBytes[s:e].decode('utf-16') if s % 2 == 0 else ReadUTF16String(buffer, s + start)
+            for s, e in zip(starts.tolist(), ends.tolist())]
+
+
 ReadString = ReadUTF8String
 ReadWString = ReadUTF16String
+
+
+class BinaryReader:
+    # Sequential reader over a buffer, memoryview or memory map that keeps its own cursor
+    def __init__(self, buffer: bytes or bytearray or memoryview or mmap.mmap, pos: int = 0,
+                 endianness: Literal['little', 'big'] = "little"):
+        self.buffer = buffer
+        self.pos = pos
+        self.endianness = endianness
+        self.__order = '>' if endianness == 'big' else '<'
+
+    def Seek(self, pos: int) -> 'BinaryReader':
+        self.pos = pos
+        return self
+
+    def Skip(self, size: int) -> 'BinaryReader':
+        self.pos += size
+        return self
+
+    def UnpackFrom(self, byteFormat: str, pos: int) -> tuple:
+        # Reads several fields with one precompiled struct without moving the cursor
+        return GetStruct(self.__order + byteFormat).unpack_from(self.buffer, pos)
+
+    def Unpack(self, byteFormat: str) -> tuple:
+        # Reads several fields with one precompiled struct at the cursor and moves past them
+        compiled = GetStruct(self.__order + byteFormat)
+        values = compiled.unpack_from(self.buffer, self.pos)
+        self.pos += compiled.size
+        return values
+
+    def ReadByte(self, signed: bool = False) -> int:
+        return self.Unpack('b' if signed else 'B')[0]
+
+    def ReadInt16(self, signed: bool = False) -> int:
+        return self.Unpack('h' if signed else 'H')[0]
+
+    def ReadInt32(self, signed: bool = False) -> int:
+        return self.Unpack('i' if signed else 'I')[0]
+
+    def ReadInt64(self, signed: bool = False) -> int:
+        return self.Unpack('q' if signed else 'Q')[0]
+
+    def ReadHalfFloat(self) -> float:
+        return self.Unpack('e')[0]
+
+    def ReadFloat(self) -> float:
+        return self.Unpack('f')[0]
+
+    def ReadDouble(self) -> float:
+        return self.Unpack('d')[0]
+
+    def ReadArray(self, npType: type, count: int) -> np.ndarray:
+        dt = GetDType(npType, self.endianness)
+        array = np.frombuffer(self.buffer, dt, count, self.pos)
+        self.pos += dt.itemsize * count
+        return array
+
+    def ReadStruct(self, dtype: np.dtype, count: int or None = None) -> np.void or np.ndarray:
+        record = ReadStruct(self.buffer, self.pos, dtype, count)
+        self.pos += dtype.itemsize * (1 if count is None else count)
+        return record
+
+
+class BinaryWriter:
+    # Appends to a growing buffer, whole arrays are written with a single copy
+    # Space for records whose offsets are not known yet is reserved first and filled in with WriteAt later
+    def __init__(self):
+        self.buffer = bytearray()
+
+    @property
+    def pos(self) -> int:
+        return len(self.buffer)
+
+    def Align(self, alignment: int = 16) -> int:
+        self.buffer.extend(bytes(-len(self.buffer) % alignment))
+        return len(self.buffer)
+
+    def Reserve(self, size: int) -> int:
+        pos = len(self.buffer)
+        self.buffer.extend(bytes(size))
+        return pos
+
+    def Write(self, data: bytes or bytearray or np.ndarray) -> int:
+        pos = len(self.buffer)
+        self.buffer += self.__Bytes(data)
+        return pos
+
+    def WriteAt(self, pos: int, data: bytes or bytearray or np.ndarray):
+        data = self.__Bytes(data)
+        self.buffer[pos:pos + len(data)] = data
+
+    @staticmethod
+    def __Bytes(data: bytes or bytearray or np.ndarray) -> bytes or bytearray or memoryview:
+        # Arrays (records included) are written as the raw bytes of their elements, without a copy when contiguous
+        if type(data) == np.ndarray:
+            return memoryview(np.ascontiguousarray(data).reshape(-1).view(np.ubyte))
+        return data
@@ -0,0 +1,328 @@
+from .REEMeshFile import *
+from .REEMDFFile import *
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import argparse
+import json
+import struct
+import sys
+import zlib
+
+# glTF component types of the array types written
+componentTypes = {np.dtype(np.int8): 5120, np.dtype(np.uint8): 5121, np.dtype(np.int16): 5122,
+                  np.dtype(np.uint16): 5123, np.dtype(np.uint32): 5125, np.dtype(np.float32): 5126}
+accessorTypes = {1: "SCALAR", 2: "VEC2", 3: "VEC3", 4: "VEC4", 16: "MAT4"}
+
+# Texture types that end up as the base color and normal textures of the glTF materials
+baseColorTextureTypes = ('BaseDielectricMap', 'BaseMetalMap', 'AlbedoMap', 'BaseColorMap', 'BaseMap')
+shaderTypeNames = {shaderType.value: shaderType.name for shaderType in ShaderType}
+
+
+class GLBBuilder:
+    # JSON and binary chunk of a glTF binary file, every array goes into the binary chunk whole
+    def __init__(self, generator: str = "RE Engine Model Utilities"):
+        self.gltf: dict = {"asset": {"version": "2.0", "generator": generator}, "scene": 0, "scenes": [{"nodes": []}],
+                           "nodes": [], "meshes": [], "materials": [], "buffers": [], "bufferViews": [],
+                           "accessors": []}
+        self.__chunks: list[bytes or memoryview] = []
+        self.__size = 0
+
+    def AddBufferView(self, data: bytes or np.ndarray, target: int or None = None, byteStride: int or None = None,
+                      mimeType: str or None = None) -> int:
+        # Appends the data 4 byte aligned and returns the index of its buffer view, or of the image with a mime type
+        data = memoryview(np.ascontiguousarray(data)).cast('B') if type(data) == np.ndarray else data
+        bufferView = {"buffer": 0, "byteOffset": self.__size, "byteLength": len(data)}
+        if target is not None:
+            bufferView["target"] = target
+        if byteStride is not None:
+            bufferView["byteStride"] = byteStride
+
+        self.__chunks.append(data)
+        self.__size += len(data)
+        padding = -self.__size % 4
+        if padding:
+            self.__chunks.append(bytes(padding))
+            self.__size += padding
+
+        self.gltf["bufferViews"].append(bufferView)
+        if mimeType is None:
+            return len(self.gltf["bufferViews"]) - 1
+
+        self.gltf.setdefault("images", []).append({"bufferView": len(self.gltf["bufferViews"]) - 1,
+                                                   "mimeType": mimeType})
+        return len(self.gltf["images"]) - 1
+
+    def AddAccessor(self, array: np.ndarray, target: int or None = None, bounds: tuple or None = None,
+                    normalized: bool = False) -> int:
+        # Accessor of a (count, components) array, or (count, 4, 4) for matrices
+        count = len(array)
+        components = int(np.prod(array.shape[1:])) if array.ndim > 1 else 1
+        array = array.astype(array.dtype.newbyteorder('<'), copy=False)
+        accessor = {"bufferView": self.AddBufferView(array, target), "componentType": componentTypes[array.dtype],
+                    "count": count, "type": accessorTypes[components]}
+        if normalized:
+            accessor["normalized"] = True
+        if bounds is not None:
+            accessor["min"], accessor["max"] = [list(map(float, corner)) for corner in bounds]
+
+        self.gltf["accessors"].append(accessor)
+        return len(self.gltf["accessors"]) - 1
+
+    def AddNode(self, node: dict) -> int:
+        self.gltf["nodes"].append(node)
+        return len(self.gltf["nodes"]) - 1
+
+    def Write(self, path: str):
+        self.gltf["buffers"] = [{"byteLength": self.__size}] if self.__size else []
+        jsonChunk = json.dumps({key: value for key, value in self.gltf.items() if value != []},
+                               separators=(',', ':')).encode('utf-8')
+        jsonChunk += b' ' * (-len(jsonChunk) % 4)
+
+        with open(path, 'wb') as file:
+            file.write(struct.pack('<III', 0x46546C67, 2, 12 + 8 + len(jsonChunk) + (8 + self.__size
+                                                                                      if self.__size else 0)))
+            file.write(struct.pack('<II', len(jsonChunk), 0x4E4F534A))
+            file.write(jsonChunk)
+            if self.__size:
+                file.write(struct.pack('<II', self.__size, 0x004E4942))
+                for chunk in self.__chunks:
+                    file.write(chunk)
+
+
+def EncodePNG(pixels: np.ndarray) -> bytes:
+    # Minimal RGBA PNG of a (height, width, 4) byte image
+    height, width = pixels.shape[0:2]
+    rows = np.concatenate([np.zeros((height, 1), np.uint8), pixels.reshape((height, width * 4))], axis=1)
+
+    def Chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    return b'\x89PNG\r\n\x1a\n' + Chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)) +\
+        Chunk(b'IDAT', zlib.compress(rows.tobytes(), 6)) + Chunk(b'IEND', b'')
+
+
+def LoadTextureDecoder():
+    # The texture decoder is a native library that is not available everywhere, textures are only referenced then
+    try:
+        from . import TextureImport
+        return TextureImport
+    except OSError:
+        return None
+
+
+def NormalizeRows(array: np.ndarray) -> np.ndarray:
+    lengths = np.linalg.norm(array, axis=1, keepdims=True)
+    return np.divide(array, lengths, out=np.zeros_like(array), where=lengths > 0.0)
+
+
+def AddMaterials(builder: GLBBuilder, reModel: REEMesh, mdf: MDF or None, textureRoot: str or None,
+                 useHQTex: bool, embedTextures: bool):
+    textureDecoder = LoadTextureDecoder() if embedTextures and textureRoot is not None else None
+    textureIndices: dict[str, int] = {}
+
+    def AddTexture(filePath: str) -> int or None:
+        # Every texture file is decoded and embedded once, no matter how many materials use it
+        if filePath not in textureIndices:
+            texPath = ResolveTexturePath(filePath, textureRoot, useHQTex)
+            textureIndices[filePath] = None
+            if texPath is not None:
+                image = textureDecoder.TEX(texPath, 'RGBA')
+                pixels = np.asarray(image.buffer, np.uint8).reshape((image.height, image.width, 4))
+                imageIndex = builder.AddBufferView(EncodePNG(pixels), mimeType="image/png")
+                builder.gltf.setdefault("textures", []).append({"source": imageIndex})
+                textureIndices[filePath] = len(builder.gltf["textures"]) - 1
+        return textureIndices[filePath]
+
+    for materialName in reModel.materialNames:
+        material = {"name": materialName, "pbrMetallicRoughness": {"metallicFactor": 0.0}}
+        mdfMaterial = mdf[materialName] if mdf is not None else None
+        if mdfMaterial is not None:
+            # The texture references are always kept, they are the only link to the textures when not embedded
+            material["extras"] = {"shaderType": shaderTypeNames.get(mdfMaterial.shaderType, mdfMaterial.shaderType),
+                                  "masterMaterial": mdfMaterial.masterMaterialFilePath,
+                                  "textures": {tex.type: tex.filePath for tex in mdfMaterial.textureInfo}}
+
+            if mdfMaterial.flags & (MaterialFlags.TwoSideEnable | MaterialFlags.BaseTwoSideEnable |
+                                    MaterialFlags.ForcedTwoSideEnable):
+                material["doubleSided"] = True
+            if mdfMaterial.flags & (MaterialFlags.AlphaTestEnable | MaterialFlags.BaseAlphaTestEnable |
+                                    MaterialFlags.ForcedAlphaTestEnable):
+                material["alphaMode"] = 'MASK'
+
+            if textureDecoder is not None:
+                for tex in mdfMaterial.textureInfo:
+                    if tex.type in baseColorTextureTypes and "baseColorTexture" not in material["pbrMetallicRoughness"]:
+                        textureIndex = AddTexture(tex.filePath)
+                        if textureIndex is not None:
+                            material["pbrMetallicRoughness"]["baseColorTexture"] = {"index": textureIndex}
+                    elif "Normal" in tex.type and "normalTexture" not in material:
+                        textureIndex = AddTexture(tex.filePath)
+                        if textureIndex is not None:
+                            material["normalTexture"] = {"index": textureIndex}
+
+        builder.gltf["materials"].append(material)
+
+
+def AddArmature(builder: GLBBuilder, reModel: REEMesh) -> tuple[list[int], int or None]:
+    # One node per bone under its parent, the file matrices are row-major with the translation in the last row, which
+    # is the same memory order as the column-major glTF matrices
+    armature = reModel.armature
+    boneNodes = [builder.AddNode({"name": reModel.boneNames[i],
+                                  "matrix": armature.localBoneTransforms[i].ravel().tolist()})
+                 for i in range(armature.boneCount)]
+
+    rootNodes: list[int] = []
+    for i, parent in enumerate(armature.boneHierarchy['parent'].tolist()):
+        if 0 <= parent < armature.boneCount and parent != i:
+            builder.gltf["nodes"][boneNodes[parent]].setdefault("children", []).append(boneNodes[i])
+        else:
+            rootNodes.append(boneNodes[i])
+
+    if not boneNodes:
+        return rootNodes, None
+
+    builder.gltf.setdefault("skins", []).append({
+        "joints": boneNodes, "skeleton": rootNodes[0],
+        "inverseBindMatrices": builder.AddAccessor(armature.inverseGlobalTransfroms.astype(np.float32))})
+    return rootNodes, len(builder.gltf["skins"]) - 1
+
+
+def ConvertToGLB(meshPath: str, outPath: str, mdfPath: str or None = None, lod: int = 0,
+                 textureRoot: str or None = None, useHQTex: bool = True, embedTextures: bool = True,
+                 loadArmature: bool = True):
+    # Writes one LOD of the main geometry as a single mesh with one primitive per submesh, decoded one submesh at a
+    # time and written straight from the decoded arrays
+    reModel = REEMesh(MapFile(meshPath), lazy=True)
+    mdf = MDF(MapFile(mdfPath)) if mdfPath is not None else None
+    if textureRoot is None and mdfPath is not None:
+        textureRoot = GetMDFRoot(mdfPath)
+
+    builder = GLBBuilder()
+    AddMaterials(builder, reModel, mdf, textureRoot, useHQTex, embedTextures)
+
+    rootNodes: list[int] = []
+    skinIndex: int or None = None
+    loadArmature = loadArmature and reModel.hasArmature
+    if loadArmature:
+        rootNodes, skinIndex = AddArmature(builder, reModel)
+        skinBoneMap = reModel.armature.skinBoneMap.astype(np.uint16)
+
+    primitives: list[dict] = []
+    for lodIdx, mmIdx, smIdx, submesh in reModel.IterSubmeshes(lodCount=lod + 1):
+        if lodIdx != lod or submesh.vertexCount == 0 or submesh.faceIndexCount == 0:
+            continue
+
+        attributes = {"POSITION": builder.AddAccessor(np.asarray(submesh.vertexBuffer, np.float32), 34962,
+                                                      submesh.boundingBox)}
+        if len(submesh.normals):
+            attributes["NORMAL"] = builder.AddAccessor(NormalizeRows(submesh.normals), 34962)
+            tangents = np.empty((submesh.vertexCount, 4), np.float32)
+            tangents[:, 0:3] = NormalizeRows(submesh.tangents[:, 0:3])
+            tangents[:, 3] = np.where(submesh.tangents[:, 3] < 0.0, -1.0, 1.0)
+            if tangents[:, 0:3].any():
+                attributes["TANGENT"] = builder.AddAccessor(tangents, 34962)
+
+        for layer, uvs in enumerate((submesh.uv0s, submesh.uv1s)):
+            if len(uvs):
+                attributes[f"TEXCOORD_{layer}"] = builder.AddAccessor(uvs.astype(np.float32), 34962)
+
+        if skinIndex is not None and len(submesh.boneWeights):
+            weights = submesh.boneWeights
+            weightSums = weights.sum(axis=1, keepdims=True)
+            weights = np.divide(weights, weightSums, out=np.zeros_like(weights), where=weightSums > 0.0)
+            joints = np.where(weights > 0.0, skinBoneMap[submesh.boneIndices], 0).astype(np.uint16)
+            for influenceSet in range(2):
+                influences = slice(influenceSet * 4, influenceSet * 4 + 4)
+                attributes[f"JOINTS_{influenceSet}"] = builder.AddAccessor(joints[:, influences], 34962)
+                attributes[f"WEIGHTS_{influenceSet}"] = builder.AddAccessor(weights[:, influences], 34962)
+
+        primitives.append({"attributes": attributes, "material": submesh.materialID,
+                           "indices": builder.AddAccessor(submesh.faces.reshape(-1).astype(
+                               np.uint32 if submesh.faces.dtype.itemsize == 4 else np.uint16), 34963)})
+
+    modelName = os.path.splitext(os.path.splitext(os.path.basename(meshPath))[0])[0]
+    if primitives:
+        builder.gltf["meshes"].append({"name": modelName, "primitives": primitives})
+        meshNode = {"name": modelName, "mesh": 0}
+        if skinIndex is not None:
+            meshNode["skin"] = skinIndex
+        rootNodes.insert(0, builder.AddNode(meshNode))
+
+    builder.gltf["scenes"][0]["nodes"] = [builder.AddNode({"name": modelName, "children": rootNodes})]
+    builder.Write(outPath)
+    reModel.Close()
+
+
+def ConvertFile(task: tuple[str, str, str or None, dict]) -> tuple[str, str or None]:
+    # Runs in a worker process, returns the mesh path and the error if the conversion failed
+    meshPath, outPath, mdfPath, options = task
+    try:
+        os.makedirs(os.path.dirname(outPath) or '.', exist_ok=True)
+        ConvertToGLB(meshPath, outPath, mdfPath, **options)
+        return meshPath, None
+    except Exception as error:
+        return meshPath, f"{type(error).__name__}: {error}"
+
+
+def FindConversions(inputPath: str, outputPath: str or None) -> list[tuple[str, str, str or None]]:
+    # Mesh, output and MDF (with the same name next to the mesh, if there) paths of a file or every mesh in a folder
+    def MDFPath(meshPath: str) -> str or None:
+        mdfPath = os.path.join(os.path.dirname(meshPath),
+                               os.path.splitext(os.path.splitext(os.path.basename(meshPath))[0])[0] + ".mdf2.10")
+        return mdfPath if os.path.isfile(mdfPath) else None
+
+    def GLBName(meshPath: str) -> str:
+        return os.path.splitext(os.path.splitext(os.path.basename(meshPath))[0])[0] + ".glb"
+
+    if os.path.isfile(inputPath):
+        outPath = outputPath if outputPath is not None else os.path.join(os.path.dirname(inputPath),
+                                                                         GLBName(inputPath))
+        if os.path.isdir(outPath):
+            outPath = os.path.join(outPath, GLBName(inputPath))
+        return [(inputPath, outPath, MDFPath(inputPath))]
+
+    outputRoot = outputPath if outputPath is not None else inputPath
+    conversions: list[tuple[str, str, str or None]] = []
+    for dirPath, dirNames, fileNames in os.walk(inputPath):
+        for fileName in sorted(fileNames):
+            if fileName.endswith(".1808282334"):
+                meshPath = os.path.join(dirPath, fileName)
+                outDir = os.path.join(outputRoot, os.path.relpath(dirPath, inputPath))
+                conversions.append((meshPath, os.path.normpath(os.path.join(outDir, GLBName(meshPath))),
+                                    MDFPath(meshPath)))
+    return conversions
+
+
+def Main(argv: list[str] or None = None) -> int:
+    parser = argparse.ArgumentParser(prog=f"python -m {__package__}.GLTFExport",
+                                     description="Convert RE Engine meshes (.mesh.1808282334) to glTF binary (.glb)")
+    parser.add_argument("input", help="mesh file, or folder to convert every mesh under")
+    parser.add_argument("-o", "--output", help="output file or folder (default: next to the input)")
+    parser.add_argument("--lod", type=int, default=0, help="LOD group to convert (default: 0, the highest quality)")
+    parser.add_argument("--root", help="asset root (x64) the textures are resolved against")
+    parser.add_argument("--no-armature", action="store_true", help="skip the bones and skinning")
+    parser.add_argument("--no-textures", action="store_true", help="only reference the textures, do not embed them")
+    parser.add_argument("--lq-textures", action="store_true", help="ignore the streaming (high quality) textures")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    options = {"lod": args.lod, "textureRoot": args.root, "useHQTex": not args.lq_textures,
+               "embedTextures": not args.no_textures, "loadArmature": not args.no_armature}
+    tasks = [(meshPath, outPath, mdfPath, options) for meshPath, outPath, mdfPath in
+             FindConversions(args.input, args.output)]
+
+    if len(tasks) == 1:
+        results = [ConvertFile(tasks[0])]
+    else:
+        with ProcessPoolExecutor(args.jobs, mp_context=get_context('spawn')) as executor:
+            results = list(executor.map(ConvertFile, tasks))
+
+    failures = [(meshPath, error) for meshPath, error in results if error is not None]
+    for meshPath, error in failures:
+        print(f"{meshPath}: {error}", file=sys.stderr)
+    print(f"Converted {len(results) - len(failures)} of {len(results)} meshes")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(Main())
@@ -1,5 +1,7 @@
 from .REEMeshFile import *
 from .REEMDFFile import *
+from .MeshCache import *
+from .ParsePool import *
 from . import Shader
 from . import CustomNodes
 import mathutils
@@ -11,26 +13,166 @@ transformMatrix = mathutils.Matrix([ [1.0, 0.0,  0.0, 0.0],
                                      [0.0, 0.0, -1.0, 0.0],
                                      [0.0, 1.0,  0.0, 0.0],
                                      [0.0, 0.0,  0.0, 0.0] ])
+# The same rotation for NumPy, positions and normals are brought into Blender space with it before they are handed over
+transformRotation = np.array(transformMatrix.to_3x3(), dtype=np.float32)
+
+
+def FillMeshGeometry(mesh: bpy.types.Mesh, positions: np.ndarray,
+                     polygons: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Fills an empty mesh with vertices and polygons of one size (triangles or quads) straight from arrays with
+    # foreach_set, the positions are transformed on the way
+    # Returns the transformed positions and the vertex index of every loop, which is also the index for gathering any
+    # per vertex data (UVs, normals) per loop
+    positions = np.asarray(positions, np.float32).reshape((-1, 3)) @ transformRotation.T
+    polygonSize = polygons.shape[1] if np.ndim(polygons) == 2 else 3
+    loopVertexIndices = np.ascontiguousarray(polygons, np.int32).reshape(-1)
+    polygonCount = len(loopVertexIndices) // polygonSize
+
+    mesh.vertices.add(len(positions))
+    mesh.vertices.foreach_set("co", positions.ravel())
+    mesh.loops.add(len(loopVertexIndices))
+    mesh.loops.foreach_set("vertex_index", loopVertexIndices)
+    # Polygon sizes follow from the loop starts, loop_total is read only
+    mesh.polygons.add(polygonCount)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, len(loopVertexIndices), polygonSize, dtype=np.int32))
+    mesh.update(calc_edges=True)
+    return positions, loopVertexIndices
+
+
+def AssignVertexGroups(obj: bpy.types.Object, groupIndices: np.ndarray, weights: np.ndarray):
+    # Adds every vertex to the groups it has a weight for, with one call per group and weight value instead of one
+    # per vertex, the weights are 8-bit in the files so a group never needs more than 255 calls
+    # Like adding them one by one with REPLACE, the last weight slot of a vertex wins when it names a group twice
+    weightedVerts, weightSlots = np.nonzero(weights > 0.0)
+    if weightedVerts.size == 0:
+        return
+    groups = groupIndices[weightedVerts, weightSlots].astype(np.int64)
+    vertexWeights = weights[weightedVerts, weightSlots]
+
+    vertexGroupKeys = weightedVerts.astype(np.int64) * len(obj.vertex_groups) + groups
+    _, lastSlots = np.unique(vertexGroupKeys[::-1], return_index=True)
+    lastSlots = len(vertexGroupKeys) - 1 - lastSlots
+    weightedVerts, groups, vertexWeights = weightedVerts[lastSlots], groups[lastSlots], vertexWeights[lastSlots]
+
+    batchKeys = groups * 256 + np.rint(vertexWeights * 255.0).astype(np.int64)
+    order = np.argsort(batchKeys, kind='stable')
+    batchStarts = np.flatnonzero(np.diff(batchKeys[order], prepend=-1))
+    for batch in np.split(order, batchStarts[1:]):
+        obj.vertex_groups[int(groups[batch[0]])].add(weightedVerts[batch].tolist(), float(vertexWeights[batch[0]]),
+                                                     "REPLACE")
+
+
+# Corners of a box from its min (0) and max (1) corner, per axis, and the quads between them
+boxCornerSelect = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+                            [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]])
+boxQuads = np.array([[0, 3, 2, 1], [4, 5, 6, 7], [0, 1, 5, 4], [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]])
+
+
+def BoxMeshData(boundingBoxes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Vertices (count * 8, 3) and quads (count * 6, 4) of many boxes given as min and max corners (count, 2, 3)
+    boundingBoxes = np.asarray(boundingBoxes, np.float32).reshape((-1, 2, 3))
+    vertices = boundingBoxes[:, boxCornerSelect, np.arange(3)]
+    quads = boxQuads[np.newaxis] + (np.arange(len(boundingBoxes)) * 8)[:, np.newaxis, np.newaxis]
+    return vertices.reshape((-1, 3)), quads.reshape((-1, 4))
+
+
+def LoadREModelProxy(meshPath: str, mdfPath: str or None = None, proxyMode: str = 'BOX',
+                     reModel: REEMesh or None = None, fileSystem: PakFileSystem or None = None, **loadOptions):
+    # Imports a model as boxes only, either one per submesh of the highest quality LOD or one per skinned bone, the
+    # full model gets loaded in place of the proxy later with the same options (see LoadProxyGeometry)
+    if reModel is None:
+        reModel = ReadREModel(meshPath, lazy=True, memoryMap=True, fileSystem=fileSystem)
+
+    boundingBoxes = reModel.boneBoundingBoxes if proxyMode == 'BONE_BOX' else np.zeros((0, 2, 3), np.single)
+    if len(boundingBoxes) == 0:
+        # Only the positions of the highest quality LOD are decoded for its boxes
+        boundingBoxes = (reModel.mainModel.lodGroups[0].submeshBoundingBoxes if reModel.mainModel.lodGroups
+                         else np.zeros((0, 2, 3), np.single))
+
+    modelName = os.path.splitext(os.path.splitext(os.path.basename(meshPath))[0])[0]
+    proxyCollection = bpy.data.collections.new(f"{modelName} (Proxy)")
+    proxyCollection["reGeometryType"] = 'PROXY'
+    bpy.context.scene.collection.children.link(proxyCollection)
+
+    vertices, quads = BoxMeshData(boundingBoxes)
+    proxyMesh = bpy.data.meshes.new(f"{modelName} - Proxy")
+    FillMeshGeometry(proxyMesh, vertices, quads)
+
+    proxyObject = bpy.data.objects.new(f"{modelName} - Proxy", proxyMesh)
+    proxyObject.display_type = 'WIRE'
+    proxyObject["reProxyMeshPath"] = meshPath
+    proxyObject["reProxyMDFPath"] = mdfPath if mdfPath is not None else ""
+    proxyObject["reProxyOptions"] = {name: value for name, value in loadOptions.items() if value is not None}
+    # Models read from paks keep the paks, the file system is opened again for them when the model gets loaded
+    if fileSystem is not None:
+        proxyObject["reProxyPakPaths"] = fileSystem.pakPaths
+    proxyCollection.objects.link(proxyObject)
+
+    return proxyObject
+
+
+def IsREModelProxy(obj: bpy.types.Object or None) -> bool:
+    return obj is not None and "reProxyMeshPath" in obj
+
+
+def LoadProxyGeometry(proxyObject: bpy.types.Object, meshCache: MeshCache or None = None):
+    # Replaces a proxy with the full model it stands in for
+    meshPath = proxyObject["reProxyMeshPath"]
+    mdfPath = proxyObject["reProxyMDFPath"] or None
+    loadOptions = proxyObject["reProxyOptions"].to_dict()
+    pakPaths = list(proxyObject.get("reProxyPakPaths", []))
+    proxyCollections = list(proxyObject.users_collection)
+
+    proxyMesh = proxyObject.data
+    bpy.data.objects.remove(proxyObject)
+    bpy.data.meshes.remove(proxyMesh)
+    for collection in proxyCollections:
+        if collection.get("reGeometryType") == 'PROXY' and not collection.all_objects:
+            bpy.data.collections.remove(collection)
+
+    if not pakPaths:
+        LoadREModel(meshPath, mdfPath, meshCache=meshCache, **loadOptions)
+        return
+
+    with PakFileSystem(pakPaths) as fileSystem:
+        LoadREModel(meshPath, mdfPath, fileSystem=fileSystem, **loadOptions)
+
+
+def LoadREModels(meshPaths: list[str], mdfPaths: list[str or None] or None = None, processes: int or None = None,
+                 fileSystem: PakFileSystem or None = None, meshCache: MeshCache or None = None, **loadOptions):
+    # Imports many models, their vertex data is decoded by worker processes while the models that are already done
+    # get built here
+    # The workers read files on disk, models in paks are read and imported one after the other, and so are proxies,
+    # which only need the headers and the positions of one LOD
+    # With a cache, models already in it are loaded from it and the ones decoded by the workers are added to it by
+    # LoadREModel
+    mdfPaths = mdfPaths if mdfPaths is not None else [None] * len(meshPaths)
+    if fileSystem is not None or loadOptions.get("proxyMode", 'NONE') != 'NONE':
+        for meshPath, mdfPath in zip(meshPaths, mdfPaths):
+            LoadREModel(meshPath, mdfPath, meshCache=meshCache, fileSystem=fileSystem, **loadOptions)
+        return
+
+    decodeInPool = [meshCache is None or not meshCache.Contains(meshPath) for meshPath in meshPaths]
+    with ParsePool(processes) as pool:
+        parsedModels = pool.Map([meshPath for meshPath, decode in zip(meshPaths, decodeInPool) if decode])
+        try:
+            for meshPath, mdfPath, decode in zip(meshPaths, mdfPaths, decodeInPool):
+                reModel = next(parsedModels)[1] if decode else None
+                LoadREModel(meshPath, mdfPath, meshCache=meshCache, reModel=reModel, **loadOptions)
+        finally:
+            # Releases the last model decoded by the pool
+            parsedModels.close()
+
+
+def ReadMDFFile(path: str, memoryMap: bool = False, fileSystem: PakFileSystem or None = None) -> MDF:
+    # A memory mapped MDF is parsed in place without reading the file into memory first
+    # With a pak file system the path is a path inside the paks
+    if fileSystem is not None:
+        return MDF(fileSystem.Read(path))
+
+    if memoryMap:
+        return MDF(MapFile(path))
 
-
-def GetMDFRoot(path: str) -> str:
-    from pathlib import Path
-    parts = Path(path).parts
-
-    # Look for the x64 folder and return its directory if present
-    for idx, part in enumerate(parts):
-        if part.lower() == "x64":
-            root = parts[0]
-            for i in range(1, idx + 1):
-                root = os.path.join(root, parts[i])
-
-            return root
-
-    # Return the directory of the mdf file itself if not x64 folder was found
-    return os.path.dirname(path)
-
-
-def ReadMDFFile(path: str) -> MDF:
     mdfBuffer = None
     with open(path, 'rb') as reMDFFile:
         mdfBuffer = reMDFFile.read(-1)
@@ -40,20 +182,55 @@ def ReadMDFFile(path: str) -> MDF:
 
     return MDF(mdfBuffer)
 
-def ReadREModel(path: str) -> REEMesh:
-    meshBuffer = None
-    with open(path, 'rb') as reModelFile:
-        meshBuffer = reModelFile.read(-1)
+def GetMeshCache(maxSize: int = 2 * 1024 ** 3) -> MeshCache:
+    # The cache lives in the data files directory of the Blender user resources, Blender has no cache resource type
+    return MeshCache(bpy.utils.user_resource('DATAFILES', path="re_engine_model", create=True), maxSize)
 
-    if meshBuffer is None:
-        raise RuntimeError(f"Failed to open \"{path}\"")
+def ReadREModel(path: str, lazy: bool = False, memoryMap: bool = False,
+                meshCache: MeshCache or None = None, fileSystem: PakFileSystem or None = None) -> REEMesh:
+    # A memory mapped model is parsed in place and its arrays are views into the mapping
+    # With a cache, the vertex streams come from it if the file was cached before, nothing is added to it here
+    # With a pak file system the path is a path inside the paks, meshes are only read once so they skip its cache,
+    # and so does the mesh cache, which keys files by their state on disk
+    if fileSystem is not None:
+        return REEMesh(fileSystem.Read(path, cache=False), lazy)
+
+    decodedElements = meshCache.Load(path) if meshCache is not None else None
 
-    return REEMesh(meshBuffer)
+    if memoryMap:
+        reModel = REEMesh(MapFile(path), lazy, decodedElements)
+    else:
+        meshBuffer = None
+        with open(path, 'rb') as reModelFile:
+            meshBuffer = reModelFile.read(-1)
+
+        if meshBuffer is None:
+            raise RuntimeError(f"Failed to open \"{path}\"")
+
+        reModel = REEMesh(meshBuffer, lazy, decodedElements)
+
+    return reModel
 
 def LoadREModel(meshPath: str, mdfPath: str or None = None, useHQTex: bool = True, assetRoot: str or None = None,
-                hqLODOnly: bool = False, mainGeoOnly: bool = False, loadArmature: bool = True):
-    # Open the model file and read it
-    reModel = ReadREModel(meshPath)
+                hqLODOnly: bool = False, mainGeoOnly: bool = False, loadArmature: bool = True,
+                proxyMode: str = 'NONE', meshCache: MeshCache or None = None, reModel: REEMesh or None = None,
+                fileSystem: PakFileSystem or None = None):
+    # An already read model (e.g. from a ParsePool) can be passed in, it is not read again
+    # With a pak file system the mesh, MDF and asset root paths are paths inside the paks (natives/x64/...)
+    if proxyMode != 'NONE':
+        LoadREModelProxy(meshPath, mdfPath, proxyMode, reModel, fileSystem, useHQTex=useHQTex, assetRoot=assetRoot,
+                         hqLODOnly=hqLODOnly, mainGeoOnly=mainGeoOnly, loadArmature=loadArmature)
+        return
+
+    # Open the model file and read it, only the geometry that ends up being imported gets decoded
+    if reModel is None:
+        reModel = ReadREModel(meshPath, lazy=True, memoryMap=True, meshCache=meshCache, fileSystem=fileSystem)
+
+    # With a cache, the streams of the LODs being imported are decoded once up front and added to it, the submeshes
+    # then take their arrays from them and the LODs that are not imported are never decoded
+    if meshCache is not None and fileSystem is None:
+        reModel.DecodeElements(1 if hqLODOnly else None, not mainGeoOnly)
+        meshCache.Store(meshPath, reModel)
 
     loadArmature = loadArmature and reModel.hasArmature
 
@@ -61,9 +238,6 @@ def LoadREModel(meshPath: str, mdfPath: str or None = None, useHQTex: bool = Tru
     modelCollection = bpy.data.collections.new(os.path.splitext(os.path.splitext(os.path.basename(meshPath))[0])[0])
     bpy.context.scene.collection.children.link(modelCollection)
 
-    # Get the name string buffer from the file
-    nameBuffer: list[str] = reModel.nameTable.nameList
-
     # Set up the armature
     armature = bpy.data.armatures.new("Armature")
     armatureObject = bpy.data.objects.new("Armature", armature)
@@ -83,10 +257,9 @@ def LoadREModel(meshPath: str, mdfPath: str or None = None, useHQTex: bool = Tru
     # Create the materials
     mdf: MDF or None = None
     if mdfPath is not None:
-        mdf = ReadMDFFile(mdfPath)
+        mdf = ReadMDFFile(mdfPath, memoryMap=True, fileSystem=fileSystem)
 
-    for matNameIdx in reModel.materialNameIndexBuffer:
-        matName = nameBuffer[matNameIdx]
+    for matName in reModel.materialNames:
         mat = Shader.CreateMaterial(matName)
 
         if len(mat.node_tree.links) == 0 and len(mat.node_tree.nodes) == 0:
@@ -108,24 +281,13 @@ def LoadREModel(meshPath: str, mdfPath: str or None = None, useHQTex: bool = Tru
                     outShader.ChangeType(reShaderType)
 
                 for tex in mdfMat.textureInfo:
-                    lqTexPath = tex.filePath
-                    hqTexPath = os.path.join("Streaming", tex.filePath)
-
-                    lqTexPath = os.path.join(assetRoot, lqTexPath + ".11") if assetRoot is not None else\
-                        os.path.join(GetMDFRoot(mdfPath), lqTexPath + ".11")
-
-                    hqTexPath = os.path.join(assetRoot, hqTexPath + ".11") if assetRoot is not None else\
-                        os.path.join(GetMDFRoot(mdfPath), hqTexPath + ".11")
-
-                    texPath:str or None = None
-
-                    if useHQTex and os.path.isfile(hqTexPath):
-                        texPath = hqTexPath
-                    elif os.path.isfile(lqTexPath):
-                        texPath = lqTexPath
+                    texPath = ResolveTexturePath(tex.filePath, assetRoot if assetRoot is not None else
+                                                 GetMDFRoot(mdfPath), useHQTex, fileSystem)
 
                     if texPath is not None:
-                        texNode = Shader.AddRETextureToMaterial(mat, texPath)
+                        # The texture decoder reads files on disk, textures in paks get extracted for it
+                        texNode = Shader.AddRETextureToMaterial(mat, fileSystem.LocalPath(texPath)
+                                                                if fileSystem is not None else texPath)
                         mat.node_tree.links.new(texNode.outputs['Color'], mdfNode.inputs[tex.type])
                         mat.node_tree.links.new(texNode.outputs['Alpha'], mdfNode.inputs[f"{tex.type} - Alpha"])
                         texNodes.append(texNode)
@@ -189,18 +351,17 @@ def LoadREModel(meshPath: str, mdfPath: str or None = None, useHQTex: bool = Tru
     if loadArmature:
         # Set up bones
         bones = reModel.armature.globalBoneTransforms  # From the file
-        bone_index_buffer = reModel.boneNameIndexBuffer
 
         # First we add all the bones to blender scene because we might need to index bones that need to be there later
         for i in range(reModel.armature.boneCount):
-            bone_from_file = bones[i]
-            bone = armature.edit_bones.new(nameBuffer[bone_index_buffer[i]])
-            bone.matrix = bone_from_file.transformMatrix
+            bone = armature.edit_bones.new(reModel.boneNames[i])
+            bone.matrix = bones[i]
             bone.use_relative_parent = True
 
         # Then we set the parents for the bones
+        boneParents = reModel.armature.boneHierarchy['parent'].tolist()
         for i in range(reModel.armature.boneCount):
-            bone_parent_index = reModel.armature.boneHierarchy[i].parent
+            bone_parent_index = boneParents[i]
             bone = armature.edit_bones[i]
 
             if bone_parent_index != -1:
@@ -238,111 +399,85 @@ def LoadREModel(meshPath: str, mdfPath: str or None = None, useHQTex: bool = Tru
 
         if geoIdx == 0:
             geoCollection = bpy.data.collections.new("Main Geometry")
+            geoCollection["reGeometryType"] = 'MAIN'
             modelCollection.children.link(geoCollection)
             geo = reModel.mainModel
         elif reModel.hasShadowGeo:
             geoCollection = bpy.data.collections.new("Shadow Geometry")
+            geoCollection["reGeometryType"] = 'SHADOW'
             modelCollection.children.link(geoCollection)
             geo = reModel.shadowModel
 
         if geo is None:
             continue
 
-        # Import all the meshes within a lod group
-        for lodIdx, lodGroup in (enumerate(geo.lodGroups[0:1]) if hqLODOnly else enumerate(geo.lodGroups) ):
-            lodCollection = bpy.data.collections.new(f"LOD Group - {lodIdx} ({geoIdx} {lodIdx})")
-            geoCollection.children.link(lodCollection)
-
-            for mmIdx, mainmesh in enumerate(lodGroup.mainmeshes):
+        # Import all the meshes within a lod group, one decoded submesh at a time
+        # Collections are made when the LOD changes, the first mainmesh of a LOD may have no submeshes to yield
+        lodCollection = None
+        lodCollectionIdx = None
+        mainMeshCollection = None
+        for lodIdx, mmIdx, smIdx, submesh in reModel.IterSubmeshes(geoIdx == 1, 1 if hqLODOnly else None):
+            if lodIdx != lodCollectionIdx:
+                lodCollection = bpy.data.collections.new(f"LOD Group - {lodIdx} ({geoIdx} {lodIdx})")
+                geoCollection.children.link(lodCollection)
+                lodCollectionIdx = lodIdx
+
+            if smIdx == 0:
                 mainMeshCollection = bpy.data.collections.new(f"Mainmesh - {mmIdx} ({geoIdx} {lodIdx} {mmIdx})")
                 lodCollection.children.link(mainMeshCollection)
 
-                for smIdx, submesh in enumerate(mainmesh.submeshes):
-                    # Fetching the name of the material
-                    materialName = nameBuffer[reModel.materialNameIndexBuffer[submesh.materialID]]
-
-                    # Create the meshes
-                    mesh = bpy.data.meshes.new(f"LODGroup_{lodIdx}_Mainmesh_{mmIdx}_Submesh{smIdx} - {materialName}")
-                    mesh.from_pydata(submesh.vertexBuffer, [], submesh.faces)
-                    mesh.update()
-
-                    # Make object from mesh
-                    submeshObject = bpy.data.objects.new(f"Submesh - {smIdx} ({geoIdx} {lodIdx} {mmIdx} {smIdx})", mesh)
-
-                    # Apply uvs (Horizontally flipped)
-                    # First layer:
-                    if submesh.uv0s.any():
-                        mesh.uv_layers.new(name='UV_0')
-                        uv0Data = mesh.uv_layers[0].data
-
-                        for u in range(len(uv0Data)):
-                            uv = submesh.uv0s[mesh.loops[u].vertex_index]
-                            uv0Data[u].uv = (uv[0], 1.0 - uv[1])
-
-                    # Second layer:
-                    if submesh.uv1s.any():
-                        mesh.uv_layers.new(name='UV_1')
-                        uv1Data = mesh.uv_layers[1].data
-
-                        for u in range(len(uv1Data)):
-                            uv = submesh.uv1s[mesh.loops[u].vertex_index]
-                            uv1Data[u].uv = (uv[0], 1.0 - uv[1])
-
-                        mesh.update()
-
-                    # Apply normals and calculate tangents
-                    normal_data: list[mathutils.Vector] = []
-
-                    for face in mesh.polygons:
-                        for vert_index in face.vertices:
-                            n_and_t = submesh.normalsTangents[vert_index]
-                            normal = mathutils.Vector(
-                                [n_and_t.normalX,
-                                 n_and_t.normalY,
-                                 n_and_t.normalZ]
-                            )
-                            normal.normalize()
-                            normal_data.append(normal)
-
-                    # Enable smooth for polygons
-                    mesh.polygons.foreach_set("use_smooth", np.full(len(mesh.polygons), True, dtype=bool))
-
-                    # Setting the normals
-                    mesh.normals_split_custom_set(normal_data)
-                    mesh.use_auto_smooth = True
-                    if submesh.uv0s.any():
-                        mesh.calc_tangents(uvmap="UV_0")
-                    mesh.update()
-
-                    if loadArmature:
-                        # Create vertex groups for each bone
-                        for i in range(reModel.armature.boneCount):
-                            submeshObject.vertex_groups.new(name=nameBuffer[reModel.boneNameIndexBuffer[i]])
-
-                        # Assign vertices to vertex groups
-                        for vert in mesh.vertices:
-                            v = vert.index
-                            boneIndices = submesh.boneInfo[v].indices
-                            weights = submesh.boneInfo[v].weights
-
-                            for boneIdx, boneIndex in enumerate(boneIndices):
-                                if weights[boneIdx] > 0.0:
-                                    vgroup = submeshObject.vertex_groups[reModel.armature.skinBoneMap[boneIndex]]
-                                    vgroup.add([v], weights[boneIdx], "REPLACE")
-
-                        # Assign the Armature modifier to the model
-                        modifier = submeshObject.modifiers.new(type='ARMATURE', name="Armature")
-                        modifier.object = armatureObject
-
-                    # Apply transformation
-                    mesh.transform(transformMatrix)
-                    mesh.update()
-
-                    # Apply material
-                    submeshObject.data.materials.append(bpy.data.materials.get(materialName))
-
-                    # Add the object to collection
-                    mainMeshCollection.objects.link(submeshObject)
+            # Fetching the name of the material
+            materialName = reModel.materialNames[submesh.materialID]
+
+            # Create the meshes
+            mesh = bpy.data.meshes.new(f"LODGroup_{lodIdx}_Mainmesh_{mmIdx}_Submesh{smIdx} - {materialName}")
+            _, loopVertexIndices = FillMeshGeometry(mesh, submesh.vertexBuffer, submesh.faces)
+
+            # Make object from mesh
+            submeshObject = bpy.data.objects.new(f"Submesh - {smIdx} ({geoIdx} {lodIdx} {mmIdx} {smIdx})", mesh)
+
+            # Apply uvs (Horizontally flipped), every layer is gathered per loop with the same loop vertex indices
+            for layerName, uvs in (('UV_0', submesh.uv0s), ('UV_1', submesh.uv1s)):
+                if uvs.any():
+                    loopUVs = uvs[loopVertexIndices].astype(np.float32)
+                    loopUVs[:, 1] = 1.0 - loopUVs[:, 1]
+                    mesh.uv_layers.new(name=layerName).data.foreach_set("uv", loopUVs.ravel())
+
+            # Apply normals (rotated like the positions) and calculate tangents
+            normal_data = (submesh.normals @ transformRotation.T)[loopVertexIndices]
+            normalLengths = np.linalg.norm(normal_data, axis=1, keepdims=True)
+            np.divide(normal_data, normalLengths, out=normal_data, where=normalLengths > 0.0)
+
+            # Enable smooth for polygons
+            mesh.polygons.foreach_set("use_smooth", np.full(len(mesh.polygons), True, dtype=bool))
+
+            # Setting the normals
+            mesh.normals_split_custom_set(normal_data)
+            mesh.use_auto_smooth = True
+            if submesh.uv0s.any():
+                mesh.calc_tangents(uvmap="UV_0")
+            mesh.update()
+
+            if loadArmature:
+                # Create vertex groups for each bone
+                for boneName in reModel.boneNames:
+                    submeshObject.vertex_groups.new(name=boneName)
+
+                AssignVertexGroups(submeshObject, reModel.armature.skinBoneMap[submesh.boneIndices],
+                                   submesh.boneWeights)
+
+                # Assign the Armature modifier to the model
+                modifier = submeshObject.modifiers.new(type='ARMATURE', name="Armature")
+                modifier.object = armatureObject
+
+            # Apply material
+            submeshObject.data.materials.append(bpy.data.materials.get(materialName))
+
+            # Add the object to collection
+            mainMeshCollection.objects.link(submeshObject)
+
+    # Everything needed from the file is in Blender by now, so its mapping can go
+    reModel.Close()
 
     if loadArmature:
         # Apply the transformation matrix to the armature in pose mode
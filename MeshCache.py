@@ -0,0 +1,167 @@
+from .REEMeshFile import *
+import hashlib
+import json
+import os
+import shutil
+
+
+class MeshCache:
+    # Decoded vertex streams of mesh files kept on disk as raw .npy files, a later import of the same file loads them
+    # instead of decoding it again
+    # Entries are named by the hash of the file content, the least recently used ones are removed once the cache grows
+    # past its size limit
+    # An entry only holds the streams an import decoded, each from the first vertex up to where the import stopped, a
+    # later import that needs more of the file adds to it
+    version = 2
+
+    def __init__(self, directory: str, maxSize: int = 2 * 1024 ** 3):
+        self.directory = directory
+        self.maxSize = maxSize
+        os.makedirs(directory, exist_ok=True)
+
+        # Content hash of every file seen so far, by path, size and modification time, and the size of every entry on
+        # disk by content hash, so the cache only gets scanned when it went over its size limit
+        self.__indexPath = os.path.join(directory, "index.json")
+        self.__index: dict[str, dict[str, str or int]] = {"files": {}, "sizes": {}}
+        if os.path.isfile(self.__indexPath):
+            try:
+                with open(self.__indexPath, 'r') as indexFile:
+                    index = json.load(indexFile)
+                if index.get("version") == self.version:
+                    self.__index = {"files": index["files"], "sizes": index["sizes"]}
+            except (OSError, ValueError, KeyError, AttributeError):
+                pass
+
+    @staticmethod
+    def HashFile(path: str) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, 'rb') as file:
+            while chunk := file.read(1 << 24):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def ContentHash(self, path: str) -> str:
+        # The file is only hashed again when its path, size or modification time changed
+        stat = os.stat(path)
+        fileKey = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+
+        contentHash = self.__index["files"].get(fileKey)
+        if contentHash is None:
+            contentHash = self.HashFile(path)
+            self.__index["files"][fileKey] = contentHash
+            self.__SaveIndex()
+        return contentHash
+
+    @property
+    def size(self) -> int:
+        # Total size of the entries in bytes, as tracked by Store and Trim
+        return sum(self.__index["sizes"].values())
+
+    def Contains(self, path: str) -> bool:
+        return self.__ReadMeta(os.path.join(self.directory, self.ContentHash(path))) is not None
+
+    def Load(self, path: str) -> dict[int, np.ndarray or tuple] or None:
+        # Streams of the file by element index, or None if it is not cached
+        # They are read into memory rather than mapped, Windows can't remove or replace files that are still mapped and
+        # entries have to stay removable by Trim and Store while the imported model is alive
+        entryDir = os.path.join(self.directory, self.ContentHash(path))
+        meta = self.__ReadMeta(entryDir)
+        if meta is None:
+            return None
+
+        try:
+            elements: dict[int, np.ndarray or tuple] = {}
+            for index, (partCount, _) in meta["elements"].items():
+                parts = tuple(np.load(os.path.join(entryDir, f"element{index}_{part}.npy"))
+                              for part in range(partCount))
+                elements[int(index)] = parts if partCount > 1 else parts[0]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        # Marks the entry as the most recently used
+        os.utime(os.path.join(entryDir, "meta.json"))
+        return elements
+
+    def Store(self, path: str, reModel: REEMesh):
+        # Writes the streams the model has decoded and kept, streams the entry already holds as many vertices of are
+        # skipped, so storing a model loaded from the cache writes nothing
+        contentHash = self.ContentHash(path)
+        entryDir = os.path.join(self.directory, contentHash)
+        meta = self.__ReadMeta(entryDir) or {"version": self.version, "elements": {}}
+
+        vertexBufferHeader = reModel.vertexBufferHeader
+        newElements = {index: decoded for index, decoded in vertexBufferHeader.DecodedElements().items()
+                       if vertexBufferHeader.DecodedVertexCount(index) > meta["elements"].get(str(index), (0, 0))[1]}
+        if not newElements:
+            return
+
+        os.makedirs(entryDir, exist_ok=True)
+        for index, decoded in newElements.items():
+            parts = decoded if type(decoded) == tuple else (decoded,)
+            for part, array in enumerate(parts):
+                self.__Replace(os.path.join(entryDir, f"element{index}_{part}.npy"),
+                               lambda file: np.save(file, np.ascontiguousarray(array)))
+            meta["elements"][str(index)] = (len(parts), vertexBufferHeader.DecodedVertexCount(index))
+
+        # The metadata goes in last, an entry only ever lists streams that are completely written
+        self.__Replace(os.path.join(entryDir, "meta.json"), lambda file: file.write(json.dumps(meta).encode()))
+
+        self.__index["sizes"][contentHash] = self.__EntrySize(entryDir)
+        self.__SaveIndex()
+        if self.size > self.maxSize:
+            self.Trim()
+
+    def Trim(self):
+        # Removes the least recently used entries until the cache fits in its size limit
+        # The entries are scanned again here, which also corrects the tracked sizes if the directory was changed from
+        # outside
+        entries: list[tuple[float, int, str]] = []
+        for name in os.listdir(self.directory):
+            entryDir = os.path.join(self.directory, name)
+            metaPath = os.path.join(entryDir, "meta.json")
+            if not os.path.isfile(metaPath):
+                continue
+            entries.append((os.path.getmtime(metaPath), self.__EntrySize(entryDir), name))
+
+        sizes = {name: entrySize for _, entrySize, name in entries}
+        totalSize = sum(sizes.values())
+        for _, entrySize, name in sorted(entries):
+            if totalSize <= self.maxSize:
+                break
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+            totalSize -= entrySize
+            del sizes[name]
+
+        # Forget the hashes of files whose entry is gone
+        self.__index = {"files": {fileKey: contentHash for fileKey, contentHash in self.__index["files"].items()
+                                  if contentHash in sizes},
+                        "sizes": sizes}
+        self.__SaveIndex()
+
+    def Clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+        self.__index = {"files": {}, "sizes": {}}
+
+    def __ReadMeta(self, entryDir: str) -> dict or None:
+        try:
+            with open(os.path.join(entryDir, "meta.json"), 'r') as metaFile:
+                meta = json.load(metaFile)
+        except (OSError, ValueError):
+            return None
+        return meta if type(meta) == dict and meta.get("version") == self.version else None
+
+    @staticmethod
+    def __EntrySize(entryDir: str) -> int:
+        return sum(os.path.getsize(os.path.join(entryDir, fileName)) for fileName in os.listdir(entryDir))
+
+    @staticmethod
+    def __Replace(path: str, write):
+        # Writes next to the file and swaps it in, a reader sees either the old or the new file
+        with open(path + ".tmp", 'wb') as file:
+            write(file)
+        os.replace(path + ".tmp", path)
+
+    def __SaveIndex(self):
+        with open(self.__indexPath, 'w') as indexFile:
+            json.dump({"version": self.version, **self.__index}, indexFile)
@@ -0,0 +1,269 @@
+from .BinaryFunctions import *
+from collections import OrderedDict
+from enum import IntEnum
+import os
+import shutil
+import tempfile
+import zlib
+
+# Entries compressed with zstd need the zstandard module, which Blender does not ship
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def Murmur3Hash(data: bytes, seed: int = 0xFFFFFFFF) -> int:
+    # 32-bit x86 MurmurHash3
+    def RotateLeft(value: int, count: int) -> int:
+        return ((value << count) | (value >> (32 - count))) & 0xFFFFFFFF
+
+    def MixKey(key: int) -> int:
+        return (RotateLeft((key * 0xCC9E2D51) & 0xFFFFFFFF, 15) * 0x1B873593) & 0xFFFFFFFF
+
+    hashValue = seed
+    blockCount = len(data) // 4
+    for key, in GetStruct('<I').iter_unpack(data[0:blockCount * 4]):
+        hashValue = (RotateLeft(hashValue ^ MixKey(key), 13) * 5 + 0xE6546B64) & 0xFFFFFFFF
+
+    tail = data[blockCount * 4:]
+    if tail:
+        hashValue ^= MixKey(int.from_bytes(tail, 'little'))
+
+    hashValue ^= len(data)
+    hashValue = ((hashValue ^ (hashValue >> 16)) * 0x85EBCA6B) & 0xFFFFFFFF
+    hashValue = ((hashValue ^ (hashValue >> 13)) * 0xC2B2AE35) & 0xFFFFFFFF
+    return hashValue ^ (hashValue >> 16)
+
+
+def NormalizePakPath(path: str) -> str:
+    return path.replace('\\', '/').lstrip('/')
+
+
+def PakPathHash(path: str) -> int:
+    # Entries are found by the hashes of the lower and upper case UTF-16 path, as one 64-bit key (upper, lower)
+    path = NormalizePakPath(path)
+    return (Murmur3Hash(path.upper().encode('utf-16-le')) << 32) | Murmur3Hash(path.lower().encode('utf-16-le'))
+
+
+class PakHeader:
+    def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0):
+        AssignFields(self, ReadStruct(buffer, pos, self.dtype))
+        if self.magic != 0x414B504B:  # KPKA
+            raise RuntimeError("Wrong magic, file format not supported!")
+        if self.majorVersion not in (2, 4):
+            raise RuntimeError(f"Pak version {self.majorVersion} is not supported!")
+        if self.featureFlags & 0x8:
+            raise RuntimeError("Paks with an encrypted entry table are not supported!")
+
+    dtype = np.dtype([
+        ('magic', '<u4'),
+        ('majorVersion', '<u1'),
+        ('minorVersion', '<u1'),
+        ('featureFlags', '<u2'),
+        ('fileCount', '<u4'),
+        ('fingerprint', '<u4'),
+    ])
+
+    size = dtype.itemsize
+
+
+class PakEntry:
+    class CompressionType(IntEnum):
+        NoCompression = 0
+        Deflate = 1
+        Zstd = 2
+
+    # Version 4 entry, version 2 entries (v2dtype) are read into the same layout
+    dtype = np.dtype([
+        ('hashNameLower', '<u4'),
+        ('hashNameUpper', '<u4'),
+        ('offset', '<u8'),
+        ('compressedSize', '<u8'),
+        ('decompressedSize', '<u8'),
+        ('attributes', '<u8'),
+        ('checksum', '<u8'),
+    ])
+
+    size = dtype.itemsize
+
+    # Version 2 entries are never compressed
+    v2dtype = np.dtype([
+        ('offset', '<u8'),
+        ('compressedSize', '<u8'),
+        ('hashNameLower', '<u4'),
+        ('hashNameUpper', '<u4'),
+    ])
+
+
+class PakFile:
+    # A .pak archive of the game, only its header and entry table are read up front, entries are read from the mapped
+    # file and decompressed when asked for
+    def __init__(self, path: str):
+        self.path = path
+        self.fileBuffer = MapFile(path)
+        self.header = PakHeader(self.fileBuffer, 0)
+
+        if self.header.majorVersion == 4:
+            self.entries: np.ndarray = ReadStruct(self.fileBuffer, PakHeader.size, PakEntry.dtype,
+                                                  self.header.fileCount).copy()
+        else:
+            v2Entries = ReadStruct(self.fileBuffer, PakHeader.size, PakEntry.v2dtype, self.header.fileCount)
+            self.entries = np.zeros(self.header.fileCount, PakEntry.dtype)
+            for name in PakEntry.v2dtype.names:
+                self.entries[name] = v2Entries[name]
+            self.entries['decompressedSize'] = v2Entries['compressedSize']
+
+        # Entry index by path hash
+        keys = (self.entries['hashNameUpper'].astype(np.uint64) << np.uint64(32)) | self.entries['hashNameLower']
+        self.entryIndices: dict[int, int] = dict(zip(keys.tolist(), range(self.header.fileCount)))
+
+    def Find(self, path: str) -> int or None:
+        return self.entryIndices.get(PakPathHash(path))
+
+    def Contains(self, path: str) -> bool:
+        return PakPathHash(path) in self.entryIndices
+
+    def ReadEntry(self, index: int) -> bytes:
+        entry = self.entries[index]
+        offset, compressedSize = int(entry['offset']), int(entry['compressedSize'])
+        if (int(entry['attributes']) >> 16) & 0xFF:
+            raise RuntimeError("Encrypted pak entries are not supported!")
+
+        data = self.fileBuffer[offset:offset + compressedSize]
+        match int(entry['attributes']) & 0xF:
+            case PakEntry.CompressionType.NoCompression:
+                return data
+
+            case PakEntry.CompressionType.Deflate:
+                return zlib.decompress(data, -15, int(entry['decompressedSize']))
+
+            case PakEntry.CompressionType.Zstd:
+                if zstandard is None:
+                    raise RuntimeError("Reading zstd compressed pak entries needs the zstandard module!")
+                return zstandard.ZstdDecompressor().decompress(data, int(entry['decompressedSize']))
+
+        raise RuntimeError(f"Unknown pak compression type {int(entry['attributes']) & 0xF}!")
+
+    def Read(self, path: str) -> bytes:
+        index = self.Find(path)
+        if index is None:
+            raise FileNotFoundError(f"\"{path}\" is not in \"{self.path}\"")
+        return self.ReadEntry(index)
+
+    def Close(self):
+        self.fileBuffer.close()
+
+
+def FindPakFiles(gameDirectory: str) -> list[str]:
+    # The paks of a game directory in load order, patch paks (re_chunk_000.pak.patch_001.pak) sort after the paks
+    # they patch
+    return sorted(os.path.join(gameDirectory, fileName) for fileName in os.listdir(gameDirectory)
+                  if fileName.lower().endswith(".pak"))
+
+
+class PakFileSystem:
+    # Files of one or more paks by their path in the game (natives/x64/...), entries of later paks replace the ones
+    # of earlier paks with the same path as the game does with its patches
+    # Decompressed entries are kept in a small LRU cache, tools that need a file on disk get the entry extracted to a
+    # temporary directory instead
+    def __init__(self, pakPaths: list[str], cacheSize: int = 256 * 1024 ** 2):
+        self.pakPaths = list(pakPaths)
+        self.paks: list[PakFile] = [PakFile(path) for path in self.pakPaths]
+        self.cacheSize = cacheSize
+
+        self.__entries: dict[int, tuple[PakFile, int]] = {}
+        for pak in self.paks:
+            self.__entries.update((key, (pak, index)) for key, index in pak.entryIndices.items())
+
+        self.__cache: OrderedDict[int, bytes] = OrderedDict()
+        self.__cacheUsed = 0
+        self.__extractDir: str or None = None
+
+    @staticmethod
+    def FromGameDirectory(gameDirectory: str, cacheSize: int = 256 * 1024 ** 2) -> 'PakFileSystem':
+        return PakFileSystem(FindPakFiles(gameDirectory), cacheSize)
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def IsFile(self, path: str) -> bool:
+        return PakPathHash(path) in self.__entries
+
+    def Read(self, path: str, cache: bool = True) -> bytes:
+        key = PakPathHash(path)
+        data = self.__cache.get(key)
+        if data is not None:
+            self.__cache.move_to_end(key)
+            return data
+
+        location = self.__entries.get(key)
+        if location is None:
+            raise FileNotFoundError(f"\"{path}\" is not in any of the paks")
+        data = location[0].ReadEntry(location[1])
+
+        # Entries bigger than the whole cache are never kept
+        if cache and len(data) <= self.cacheSize:
+            self.__cache[key] = data
+            self.__cacheUsed += len(data)
+            while self.__cacheUsed > self.cacheSize:
+                self.__cacheUsed -= len(self.__cache.popitem(last=False)[1])
+        return data
+
+    def LocalPath(self, path: str) -> str:
+        # A file on disk with the content of the entry, under the same relative path and so with the same name
+        if self.__extractDir is None:
+            self.__extractDir = tempfile.mkdtemp(prefix="re_engine_pak_")
+
+        localPath = os.path.join(self.__extractDir, *NormalizePakPath(path).split('/'))
+        if not os.path.isfile(localPath):
+            os.makedirs(os.path.dirname(localPath), exist_ok=True)
+            with open(localPath, 'wb') as file:
+                file.write(self.Read(path, cache=False))
+        return localPath
+
+    def ClearCache(self):
+        self.__cache.clear()
+        self.__cacheUsed = 0
+
+    def Close(self):
+        self.ClearCache()
+        for pak in self.paks:
+            pak.Close()
+        if self.__extractDir is not None:
+            shutil.rmtree(self.__extractDir, ignore_errors=True)
+            self.__extractDir = None
+
+    def __enter__(self) -> 'PakFileSystem':
+        return self
+
+    def __exit__(self, *args):
+        self.Close()
+
+
+def WritePakFile(path: str, files: dict[str, bytes], compress: bool = True):
+    # Writes a version 4 pak of the given files by path, deflate compressed where that makes them smaller
+    # Meant for building small test archives, the checksums are left zero
+    writer = BinaryWriter()
+    writer.Write(PackRecord(PakHeader.dtype, magic=0x414B504B, majorVersion=4, fileCount=len(files)))
+    entriesOffset = writer.Reserve(PakEntry.size * len(files))
+
+    entries = np.zeros(len(files), PakEntry.dtype)
+    for i, (filePath, data) in enumerate(files.items()):
+        stored = data
+        if compress:
+            compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+            compressed = compressor.compress(data) + compressor.flush()
+            stored = compressed if len(compressed) < len(data) else data
+        useDeflate = stored is not data
+
+        key = PakPathHash(filePath)
+        entries[i] = PackRecord(PakEntry.dtype, hashNameLower=key & 0xFFFFFFFF, hashNameUpper=key >> 32,
+                                offset=writer.Write(stored), compressedSize=len(stored),
+                                decompressedSize=len(data),
+                                attributes=PakEntry.CompressionType.Deflate if useDeflate else
+                                PakEntry.CompressionType.NoCompression)
+    writer.WriteAt(entriesOffset, entries)
+
+    with open(path, 'wb') as file:
+        file.write(writer.buffer)
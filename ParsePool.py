@@ -0,0 +1,155 @@
+from .REEMeshFile import *
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from multiprocessing import get_context, shared_memory
+from typing import Iterator
+import os
+
+
+def ReadGeometryBuffersHeader(fileBuffer: bytes or bytearray or mmap.mmap) -> GeometryBuffersHeader:
+    header = Header(fileBuffer, 0)
+    return GeometryBuffersHeader(fileBuffer, header.vertexBufferHeaderOffset, fileBuffer,
+                                 DetectFaceIndexSize(fileBuffer, header))
+
+
+def DecodeElementsInto(path: str, blockName: str, elementOffsets: list[tuple[int, list[int]]]):
+    # Runs in a worker process, decodes element streams of a mesh file straight into the shared memory block of the
+    # parent at the offsets it laid out, so nothing but the block name and the offsets is pickled
+    vertexBufferHeader = ReadGeometryBuffersHeader(MapFile(path))
+    block = shared_memory.SharedMemory(blockName)
+    try:
+        for index, offsets in elementOffsets:
+            decoded = vertexBufferHeader.DecodeElement(index, 0, vertexBufferHeader.elementVertexCounts[index])
+            parts = decoded if type(decoded) == tuple else (decoded,)
+            for part, offset, (shape, dtype) in zip(parts, offsets, vertexBufferHeader.DecodedLayout(index)):
+                np.ndarray(shape, dtype, block.buf, offset)[...] = part
+            del decoded, parts
+    finally:
+        block.close()
+
+
+class ParseJob:
+    # A mesh file whose vertex streams are being decoded by the pool
+    def __init__(self, path: str, lazy: bool, block: shared_memory.SharedMemory,
+                 layout: dict[int, list[tuple[int, tuple[int, int], np.dtype]]], futures: list[Future]):
+        self.path = path
+        self.lazy = lazy
+        self.__block = block
+        self.__layout = layout
+        self.__futures = futures
+        self.__unlinked = False
+        self.__reModel: REEMesh or None = None
+
+    def Done(self) -> bool:
+        return all(future.done() for future in self.__futures)
+
+    def Result(self) -> REEMesh:
+        # Waits for the workers and builds the model on top of the streams they decoded, the arrays live in the
+        # shared block until Release
+        if self.__reModel is not None:
+            return self.__reModel
+
+        try:
+            for future in self.__futures:
+                future.result()
+        finally:
+            self.__Unlink()
+
+        decodedElements: dict[int, np.ndarray or tuple] = {}
+        for index, parts in self.__layout.items():
+            arrays = tuple(np.ndarray(shape, dtype, self.__block.buf, offset) for offset, shape, dtype in parts)
+            decodedElements[index] = arrays if len(arrays) > 1 else arrays[0]
+
+        self.__reModel = REEMesh(MapFile(self.path), self.lazy, decodedElements)
+        return self.__reModel
+
+    def __Unlink(self):
+        # Once every worker is done with the block, only the mapping of this process keeps it alive
+        if not self.__unlinked:
+            for future in self.__futures:
+                future.cancel()
+            for future in self.__futures:
+                if not future.cancelled():
+                    future.exception()
+            self.__block.unlink()
+            self.__unlinked = True
+
+    def Release(self) -> bool:
+        # Frees the shared block, only possible once no array of the model is referenced anymore
+        if self.__block is not None:
+            self.__Unlink()
+
+        if self.__reModel is not None:
+            self.__reModel.Close()
+            self.__reModel = None
+
+        if self.__block is not None:
+            try:
+                self.__block.close()
+            except BufferError:
+                return False
+            self.__block = None
+        return True
+
+
+class ParsePool:
+    # Decodes mesh files in worker processes, the results come back through shared memory instead of being pickled
+    # The headers are read in this process (they are small), so the layout of every decoded array is known up front
+    # and each element stream becomes its own task, which also spreads a single large file over the workers
+    def __init__(self, processes: int or None = None):
+        self.processes: int = processes if processes is not None else os.cpu_count() or 1
+        self.__executor = ProcessPoolExecutor(self.processes, mp_context=get_context('spawn'))
+
+    def Submit(self, path: str, lazy: bool = True) -> ParseJob:
+        fileBuffer = MapFile(path)
+        vertexBufferHeader = ReadGeometryBuffersHeader(fileBuffer)
+
+        # Every decoded array gets a 16 byte aligned place in one block per file
+        layout: dict[int, list[tuple[int, tuple[int, int], np.dtype]]] = {}
+        blockSize = 0
+        for index in range(len(vertexBufferHeader.vertexElementHeaders)):
+            layout[index] = []
+            for shape, dtype in vertexBufferHeader.DecodedLayout(index):
+                layout[index].append((blockSize, shape, dtype))
+                blockSize += (shape[0] * shape[1] * dtype.itemsize + 15) // 16 * 16
+
+        block = shared_memory.SharedMemory(create=True, size=max(blockSize, 1))
+        futures = [self.__executor.submit(DecodeElementsInto, path, block.name,
+                                          [(index, [offset for offset, _, _ in parts])])
+                   for index, parts in layout.items()]
+        return ParseJob(path, lazy, block, layout, futures)
+
+    def Map(self, paths: list[str], lazy: bool = True, window: int or None = None) -> Iterator[tuple[str, REEMesh]]:
+        # Yields the models in order, each one is released when the next is asked for
+        # Only a window of files (twice the worker count by default) is submitted at a time, the next file goes in as
+        # each model is released, so the shared memory in use follows the window rather than the whole selection
+        window = max(window if window is not None else 2 * self.processes, 1)
+        pending = iter(paths)
+        jobs: deque[ParseJob] = deque()
+        try:
+            for path in pending:
+                jobs.append(self.Submit(path, lazy))
+                if len(jobs) == window:
+                    break
+
+            while jobs:
+                job = jobs[0]
+                yield job.path, job.Result()
+                job.Release()
+                jobs.popleft()
+
+                path = next(pending, None)
+                if path is not None:
+                    jobs.append(self.Submit(path, lazy))
+        finally:
+            for job in jobs:
+                job.Release()
+
+    def Close(self):
+        self.__executor.shutdown()
+
+    def __enter__(self) -> 'ParsePool':
+        return self
+
+    def __exit__(self, *args):
+        self.Close()
@@ -1,5 +1,7 @@
 from .BinaryFunctions import *
+from .PakFile import *
 from enum import IntEnum
+import os
 
 class ShaderType(IntEnum):
     Standard = 0x0,
@@ -48,77 +50,147 @@ class MaterialFlags(IntEnum):
     NoRayTracing = 0x01 << 31
 
 
+def GetMDFRoot(path: str) -> str:
+    from pathlib import Path
+    parts = Path(path).parts
+
+    # Look for the x64 folder and return its directory if present
+    for idx, part in enumerate(parts):
+        if part.lower() == "x64":
+            root = parts[0]
+            for i in range(1, idx + 1):
+                root = os.path.join(root, parts[i])
+
+            return root
+
+    # Return the directory of the mdf file itself if not x64 folder was found
+    return os.path.dirname(path)
+
+
+def ResolveTexturePath(filePath: str, root: str, useHQTex: bool = True,
+                       fileSystem: PakFileSystem or None = None) -> str or None:
+    # File of a texture referenced by an MDF, the streaming (high quality) version is preferred if asked for
+    # With a pak file system the root and the returned path are paths inside the paks (natives/x64/...)
+    lqTexPath = os.path.join(root, filePath + ".11")
+    hqTexPath = os.path.join(root, "Streaming", filePath + ".11")
+    isFile = fileSystem.IsFile if fileSystem is not None else os.path.isfile
+
+    if useHQTex and isFile(hqTexPath):
+        return hqTexPath
+    elif isFile(lqTexPath):
+        return lqTexPath
+    return None
+
+
+class StringPool:
+    # Strings of the file memoized by their offset, since many records point at the same shared strings
+    def __init__(self, buffer: list[int], offsets: list[int] or np.ndarray = ()):
+        self.__buffer = buffer
+
+        uniqueOffsets = np.unique(np.asarray(offsets, np.int64))
+        self.__strings: dict[int, str] = dict(zip(uniqueOffsets.tolist(), ReadUTF16Strings(buffer, uniqueOffsets)))
+
+    def __getitem__(self, offset: int) -> str:
+        string = self.__strings.get(offset)
+        if string is None:
+            string = ReadWString(self.__buffer, offset)
+            self.__strings[offset] = string
+        return string
+
+
 class PropertyInfo:
-    def __init__(self, buffer: list[int], pos: int = 0, propertyBufferOffset: int = 0):
-        self.nameOffset = ReadInt64(buffer, pos + 0)
-        self.utf16NameMurmur3 = ReadInt32(buffer, pos + 8)
-        self.ut8NameMurmur3 = ReadInt32(buffer, pos + 12)
-        self.parameterCount = ReadInt32(buffer, pos + 16)
-        self.propertyOffsetInBuffer = ReadInt32(buffer, pos + 20)
+    def __init__(self, buffer: list[int], pos: int = 0, propertyBufferOffset: int = 0, record: np.void or None = None,
+                 stringPool: StringPool or None = None):
+        AssignFields(self, ReadStruct(buffer, pos, self.dtype) if record is None else record)
+        stringPool = StringPool(buffer) if stringPool is None else stringPool
 
         # Calculated data
-        self.name = ReadWString(buffer, self.nameOffset)
+        self.name = stringPool[self.nameOffset]
 
         self.parameters: list[float] = ReadFloat(buffer, propertyBufferOffset + self.propertyOffsetInBuffer,
                                                  self.parameterCount)
 
-    size = 24
+    dtype = np.dtype([
+        ('nameOffset', '<u8'),
+        ('utf16NameMurmur3', '<u4'),
+        ('ut8NameMurmur3', '<u4'),
+        ('parameterCount', '<u4'),
+        ('propertyOffsetInBuffer', '<u4'),
+    ])
+
+    size = dtype.itemsize
 
 
 class TextureInfo:
-    def __init__(self, buffer: list[int], pos: int = 0):
-        self.typeOffset = ReadInt64(buffer, pos + 0)
-        self.utf16TypeMurmur3 = ReadInt32(buffer, pos + 8)
-        self.utf8TypeMurmur3 = ReadInt32(buffer, pos + 12)
-        self.filePathOffset = ReadInt64(buffer, pos + 16)
+    def __init__(self, buffer: list[int], pos: int = 0, record: np.void or None = None,
+                 stringPool: StringPool or None = None):
+        AssignFields(self, ReadStruct(buffer, pos, self.dtype) if record is None else record)
+        stringPool = StringPool(buffer) if stringPool is None else stringPool
 
         # Calculated data
-        self.type = ReadWString(buffer, self.typeOffset)
-        self.filePath = ReadWString(buffer, self.filePathOffset)
+        self.type = stringPool[self.typeOffset]
+        self.filePath = stringPool[self.filePathOffset]
+
+    dtype = np.dtype([
+        ('typeOffset', '<u8'),
+        ('utf16TypeMurmur3', '<u4'),
+        ('utf8TypeMurmur3', '<u4'),
+        ('filePathOffset', '<u8'),
+    ])
 
-    size = 24
+    size = dtype.itemsize
 
 
 class Material:
-    def __init__(self, buffer: list[int], pos: int = 0):
-        self.nameOffset = ReadInt64(buffer, pos + 0)
-        self.nameHash = ReadInt32(buffer, pos + 8)
-        self.propertyBufferSize = ReadInt32(buffer, pos + 12)
-        self.propertyCount = ReadInt32(buffer, pos + 16)
-        self.textureCount = ReadInt32(buffer, pos + 20)
-        self.shaderType = ReadInt32(buffer, pos + 24)
-        self.flags = ReadInt32(buffer, pos + 28)
-        self.propertyInfoOffset = ReadInt64(buffer, pos + 32)
-        self.textureInfoOffset = ReadInt64(buffer, pos + 40)
-        self.propertyBufferOffset = ReadInt64(buffer, pos + 48)
-        self.masterMaterialFilePathOffset = ReadInt64(buffer, pos + 56)
+    def __init__(self, buffer: list[int], pos: int = 0, record: np.void or None = None,
+                 stringPool: StringPool or None = None):
+        AssignFields(self, ReadStruct(buffer, pos, self.dtype) if record is None else record)
+        stringPool = StringPool(buffer) if stringPool is None else stringPool
 
         # Calculated data
-        self.name = ReadWString(buffer, self.nameOffset)
-        self.masterMaterialFilePath = ReadWString(buffer, self.masterMaterialFilePathOffset)
-
-        self.textureInfo: list[TextureInfo] = [None] * self.textureCount
-        for i in range(self.textureCount):
-            self.textureInfo[i] = TextureInfo(buffer, self.textureInfoOffset + i * TextureInfo.size)
-
-        self.properties: list[PropertyInfo] = [None] * self.propertyCount
-        for i in range(self.propertyCount):
-            self.properties[i] = PropertyInfo(buffer, self.propertyInfoOffset + i * PropertyInfo.size,
-                                                self.propertyBufferOffset)
-
-    size = 64
+        self.name = stringPool[self.nameOffset]
+        self.masterMaterialFilePath = stringPool[self.masterMaterialFilePathOffset]
+
+        self.textureInfo: list[TextureInfo] = \
+            [TextureInfo(buffer, record=record, stringPool=stringPool) for record in
+             ReadStruct(buffer, self.textureInfoOffset, TextureInfo.dtype, self.textureCount)]
+
+        self.properties: list[PropertyInfo] = \
+            [PropertyInfo(buffer, propertyBufferOffset=self.propertyBufferOffset, record=record,
+                          stringPool=stringPool) for record in
+             ReadStruct(buffer, self.propertyInfoOffset, PropertyInfo.dtype, self.propertyCount)]
+
+    dtype = np.dtype([
+        ('nameOffset', '<u8'),
+        ('nameHash', '<u4'),
+        ('propertyBufferSize', '<u4'),
+        ('propertyCount', '<u4'),
+        ('textureCount', '<u4'),
+        ('shaderType', '<u4'),
+        ('flags', '<u4'),
+        ('propertyInfoOffset', '<u8'),
+        ('textureInfoOffset', '<u8'),
+        ('propertyBufferOffset', '<u8'),
+        ('masterMaterialFilePathOffset', '<u8'),
+    ])
+
+    size = dtype.itemsize
 
 
 class Header:
     def __init__(self, buffer: list[int], pos: int = 0):
-        self.magic = ReadInt32(buffer, pos + 0)
+        AssignFields(self, ReadStruct(buffer, pos, self.dtype))
         if self.magic != 0x0046444D:  # MDF
             raise RuntimeError("Wrong magic, file format not supported!")
-        self.version = ReadInt16(buffer, pos + 4)
-        self.materialCount = ReadInt16(buffer, pos + 6)
-        self.reserved = ReadInt64(buffer, pos + 8)
 
-    size = 16
+    dtype = np.dtype([
+        ('magic', '<u4'),
+        ('version', '<u2'),
+        ('materialCount', '<u2'),
+        ('reserved', '<u8'),
+    ])
+
+    size = dtype.itemsize
 
 
 class MDF:
@@ -130,9 +202,22 @@ class MDF:
         self.header = Header(self.fileBuffer, 0)
 
         # Read materials info
-        self.materials: list[Material] = [None] * self.header.materialCount
-        for i in range(self.header.materialCount):
-            self.materials[i] = Material(fileBuffer, 16 + i * Material.size)
+        materialRecords = ReadStruct(fileBuffer, Header.size, Material.dtype, self.header.materialCount)
+
+        # Gather the offsets of every string in the file, so they are all decoded at once and only once
+        stringOffsets: list[np.ndarray] = [materialRecords['nameOffset'],
+                                           materialRecords['masterMaterialFilePathOffset']]
+        for record in materialRecords:
+            textureRecords = ReadStruct(fileBuffer, record['textureInfoOffset'], TextureInfo.dtype,
+                                        record['textureCount'])
+            propertyRecords = ReadStruct(fileBuffer, record['propertyInfoOffset'], PropertyInfo.dtype,
+                                         record['propertyCount'])
+            stringOffsets += [textureRecords['typeOffset'], textureRecords['filePathOffset'],
+                              propertyRecords['nameOffset']]
+        self.stringPool = StringPool(fileBuffer, np.concatenate(stringOffsets))
+
+        self.materials: list[Material] = \
+            [Material(fileBuffer, record=record, stringPool=self.stringPool) for record in materialRecords]
 
         self.__nameIdxMap: dict[str:int] = {}
         for idx in range(self.header.materialCount):
@@ -1,109 +1,135 @@
 from .BinaryFunctions import *
 from enum import Enum
+from functools import cached_property
+from typing import Iterator
 
 class Header:
     def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0):
-        self.magic = ReadInt32(buffer, pos + 0)
+        AssignFields(self, ReadStruct(buffer, pos, self.dtype))
         if self.magic != 0x4853454D:  # MESH
             raise RuntimeError("Wrong magic, file format not supported!")
-        self.version = ReadInt32(buffer, pos + 4)
-        self.fileSize = ReadInt32(buffer, pos + 8)
-        self.lodGroupHash = ReadInt32(buffer, pos + 12)
-        self.flag = ReadByte(buffer, pos + 16)
-        self.solvedOffset = ReadByte(buffer, pos + 17)
-        self.nameTableNodeCount = ReadInt16(buffer, pos + 18)
-        self.padding1 = ReadInt32(buffer, pos + 20)
-        self.lodDescriptionsOffset = ReadInt64(buffer, pos + 24)
-        self.shadowLODDescriptionsOffset = ReadInt64(buffer, pos + 32)
-        self.occluderMeshOffset = ReadInt64(buffer, pos + 40)
-        self.armatureHeaderOffset = ReadInt64(buffer, pos + 48)
-        self.topologoyOffset = ReadInt64(buffer, pos + 56)
-        self.bsHeader = ReadInt64(buffer, pos + 64)
-        self.boundingBoxHeaderOffset = ReadInt64(buffer, pos + 72)
-        self.vertexBufferHeaderOffset = ReadInt64(buffer, pos + 80)
-        self.padding2 = ReadInt64(buffer, pos + 88)
-        self.materialNameIndexBufferOffset = ReadInt64(buffer, pos + 96)
-        self.boneNameIndexBufferOffset = ReadInt64(buffer, pos + 104)
-        self.bsIndexBufferOffset = ReadInt64(buffer, pos + 112)
-        self.nameTableOffset = ReadInt64(buffer, pos + 120)
-
-    size = 128
+
+    dtype = np.dtype([
+        ('magic', '<u4'),
+        ('version', '<u4'),
+        ('fileSize', '<u4'),
+        ('lodGroupHash', '<u4'),
+        ('flag', '<u1'),
+        ('solvedOffset', '<u1'),
+        ('nameTableNodeCount', '<u2'),
+        ('padding1', '<u4'),
+        ('lodDescriptionsOffset', '<u8'),
+        ('shadowLODDescriptionsOffset', '<u8'),
+        ('occluderMeshOffset', '<u8'),
+        ('armatureHeaderOffset', '<u8'),
+        ('topologoyOffset', '<u8'),
+        ('bsHeader', '<u8'),
+        ('boundingBoxHeaderOffset', '<u8'),
+        ('vertexBufferHeaderOffset', '<u8'),
+        ('padding2', '<u8'),
+        ('materialNameIndexBufferOffset', '<u8'),
+        ('boneNameIndexBufferOffset', '<u8'),
+        ('bsIndexBufferOffset', '<u8'),
+        ('nameTableOffset', '<u8'),
+    ])
+
+    size = dtype.itemsize
 
 class NormalAndTangent:
-    def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0):
-        readBuff = ReadByte(buffer, pos + 0, 8, signed=True)
-        self.normalX = self.__NormalizeByte(readBuff[0])
-        self.normalY = self.__NormalizeByte(readBuff[1])
-        self.normalZ = self.__NormalizeByte(readBuff[2])
-        self.normalW = self.__NormalizeByte(readBuff[3])
-        self.tangentX = self.__NormalizeByte(readBuff[4])
-        self.tangentY = self.__NormalizeByte(readBuff[5])
-        self.tangentZ = self.__NormalizeByte(readBuff[6])
-        self.tangentW = self.__NormalizeByte(readBuff[7])
+    # Decodes the whole normal/tangent stream of a submesh at once
+    @staticmethod
+    def Decode(buffer: bytes or bytearray or list[int], pos: int = 0, count: int = 0,
+               stride: int = 8) -> tuple[np.ndarray, np.ndarray]:
+        readBuff = ReadStrided(buffer, pos, count, np.byte, NormalAndTangent.size, stride)
+        normalized = NormalAndTangent.__NormalizeBytes(readBuff)
+        return normalized[:, 0:3].copy(), normalized[:, 4:8].copy()
 
     @staticmethod
-    def __NormalizeByte(byte: int) -> float:
-        return byte / (128.0 if byte & 0b10000000 else 127.0)
+    def Encode(normals: np.ndarray, tangents: np.ndarray, stride: int = 8) -> np.ndarray:
+        # Inverse of Decode as (count, stride) bytes, the unused fourth byte of the normal is written as zero
+        values = np.zeros((len(normals), NormalAndTangent.size), np.float32)
+        values[:, 0:3] = normals
+        values[:, 4:8] = tangents
+        encoded = np.where(values < 0, np.rint(values * np.float32(128.0)), np.rint(values * np.float32(127.0)))
+        records = np.zeros((len(normals), stride), np.ubyte)
+        WriteStrided(records, 0, np.clip(encoded, -128, 127), np.byte)
+        return records
+
+    @staticmethod
+    def __NormalizeBytes(byteArray: np.ndarray) -> np.ndarray:
+        return np.where(byteArray < 0, byteArray / np.float32(128.0), byteArray / np.float32(127.0)).astype(np.float32)
 
     size = 8
 
 class SkinWeights:
-    def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0):
-        self.indices: np.ndarray[int] = ReadByte(buffer, pos, 8)
-        self.weights: np.ndarray[float] = np.array([w / 255.0 for w in ReadByte(buffer, pos + 8, 8)])
+    # Decodes the whole skin weight stream of a submesh at once
+    @staticmethod
+    def Decode(buffer: bytes or bytearray or list[int], pos: int = 0, count: int = 0,
+               stride: int = 16) -> tuple[np.ndarray, np.ndarray]:
+        indices: np.ndarray[int] = ReadStrided(buffer, pos, count, np.ubyte, 8, stride)
+        weights: np.ndarray[float] = ReadStrided(buffer, pos + 8, count, np.ubyte, 8, stride) / np.float32(255.0)
+        return indices, weights.astype(np.float32, copy=False)
+
+    @staticmethod
+    def Encode(indices: np.ndarray, weights: np.ndarray, stride: int = 16) -> np.ndarray:
+        # Inverse of Decode as (count, stride) bytes
+        records = np.zeros((len(indices), stride), np.ubyte)
+        WriteStrided(records, 0, indices, np.ubyte)
+        WriteStrided(records, 8, np.clip(np.rint(weights * np.float32(255.0)), 0, 255), np.ubyte)
+        return records
 
     size = 16
 
 class BoneTransform:
-    def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0):
-        self.transformMatrix: np.ndarray[tuple[float, float, float, float]] = ReadFloat(buffer,
-                                                                                        pos + 0, 16).reshape((-1, 4))
+    # One 4x4 matrix per bone, a whole transform table reads as a (boneCount, 4, 4) array
+    dtype = np.dtype(('<f4', (4, 4)))
 
-    size = 64
+    size = dtype.itemsize
 
 class BoneHierarchy:
-    def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0):
-        readBuffer = ReadInt16(buffer, pos, 8, signed=True)
-        self.index = readBuffer[0]
-        self.parent = readBuffer[1]
-        self.nextSibling = readBuffer[2]
-        self.nextChild = readBuffer[3]
-        self.cousin = readBuffer[4]
-        self.ukn1 = readBuffer[5]
-        self.ukn2 = readBuffer[6]
-        self.ukn3 = readBuffer[7]
+    dtype = np.dtype([
+        ('index', '<i2'),
+        ('parent', '<i2'),
+        ('nextSibling', '<i2'),
+        ('nextChild', '<i2'),
+        ('cousin', '<i2'),
+        ('ukn1', '<i2'),
+        ('ukn2', '<i2'),
+        ('ukn3', '<i2'),
+    ])
 
-    size = 16
+    size = dtype.itemsize
 
 
 class ArmatureHeader:
     def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0):
-        self.boneCount = ReadInt32(buffer, pos + 0)
-        self.skinMapSize = ReadInt32(buffer, pos + 4)
-        self.ukn1 = ReadInt64(buffer, pos + 8)
-        self.boneHierarchyTableOffset = ReadInt32(buffer, pos + 16)
-        self.localBoneTransformsTableOffset = ReadInt32(buffer, pos + 24)
-        self.globalBoneTransformsTableOffset = ReadInt32(buffer, pos + 32)
-        self.inverseGlobalBoneTransformsTableOffset = ReadInt32(buffer, pos + 40)
+        AssignFields(self, ReadStruct(buffer, pos, self.dtype))
 
         # Calculated data
+        # The tables are small, so they are copied out instead of keeping views into the file buffer
         # Index of the bone index in the BoneMapIndices
-        self.skinBoneMap: np.ndarray[int] = ReadInt16(buffer, pos + self.size, self.skinMapSize)
-        self.boneHierarchy: list[BoneHierarchy] = [None] * self.boneCount
-        self.localBoneTransforms: list[BoneTransform] = [None] * self.boneCount
-        self.globalBoneTransforms: list[BoneTransform] = [None] * self.boneCount
-        self.inverseGlobalTransfroms: list[BoneTransform] = [None] * self.boneCount
-
-        for i in range(self.boneCount):
-            self.boneHierarchy[i] = BoneHierarchy(buffer, self.boneHierarchyTableOffset + i * BoneHierarchy.size)
-            self.localBoneTransforms[i] = BoneTransform(buffer,
-                                                          self.localBoneTransformsTableOffset + i * BoneTransform.size)
-            self.globalBoneTransforms[i] = BoneTransform(buffer, self.globalBoneTransformsTableOffset +
-                                                           i * BoneTransform.size)
-            self.inverseGlobalTransfroms[i] = BoneTransform(buffer, self.inverseGlobalBoneTransformsTableOffset +
-                                                              i * BoneTransform.size)
-
-    size = 48
+        self.skinBoneMap: np.ndarray[int] = \
+            ReadStruct(buffer, pos + self.size, np.dtype('<u2'), self.skinMapSize).copy()
+        self.boneHierarchy: np.ndarray = \
+            ReadStruct(buffer, self.boneHierarchyTableOffset, BoneHierarchy.dtype, self.boneCount).copy()
+        self.localBoneTransforms: np.ndarray[tuple[int, int, int]] = \
+            ReadStruct(buffer, self.localBoneTransformsTableOffset, BoneTransform.dtype, self.boneCount).copy()
+        self.globalBoneTransforms: np.ndarray[tuple[int, int, int]] = \
+            ReadStruct(buffer, self.globalBoneTransformsTableOffset, BoneTransform.dtype, self.boneCount).copy()
+        self.inverseGlobalTransfroms: np.ndarray[tuple[int, int, int]] = \
+            ReadStruct(buffer, self.inverseGlobalBoneTransformsTableOffset, BoneTransform.dtype, self.boneCount).copy()
+
+    dtype = np.dtype([
+        ('boneCount', '<u4'),
+        ('skinMapSize', '<u4'),
+        ('ukn1', '<u8'),
+        ('boneHierarchyTableOffset', '<u8'),
+        ('localBoneTransformsTableOffset', '<u8'),
+        ('globalBoneTransformsTableOffset', '<u8'),
+        ('inverseGlobalBoneTransformsTableOffset', '<u8'),
+    ])
+
+    size = dtype.itemsize
 
 
 class VertexElementHeader:
@@ -114,63 +140,150 @@ class VertexElementHeader:
         UV1 = 3
         BoneInfo = 4
 
-    def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0):
-        self.elementType = self.ElementType(ReadInt16(buffer, pos + 0))
-        self.bytesPerVertex = ReadInt16(buffer, pos + 2)
-        self.offsetInVertexBuffer = ReadInt32(buffer, pos + 4)
+    def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0, record: np.void or None = None):
+        AssignFields(self, ReadStruct(buffer, pos, self.dtype) if record is None else record)
+        self.elementType = self.ElementType(self.elementType)
 
-    size = 8
+    dtype = np.dtype([
+        ('elementType', '<u2'),
+        ('bytesPerVertex', '<u2'),
+        ('offsetInVertexBuffer', '<u4'),
+    ])
+
+    size = dtype.itemsize
 
 
 class GeometryBuffersHeader:
-    def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0, fileBuffer: list[int] = -1):
-        self.vertexElementHeadersOffset = ReadInt64(buffer, pos + 0)
-        self.vertexBufferOffset = ReadInt64(buffer, pos + 8)
-        self.faceIndexBufferOffset = ReadInt64(buffer, pos + 16)
-        self.vertexBufferSize = ReadInt32(buffer, pos + 24)
-        self.faceIndexBufferSize = ReadInt32(buffer, pos + 28)
-        self.vertexElementCount = ReadInt16(buffer, pos + 32, 2)
-        self.ukn = ReadInt64(buffer, pos + 36)
-        self.blendShapesOffset = ReadInt32(buffer, pos + 44, signed=True)
+    def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0, fileBuffer: list[int] = -1,
+                 faceIndexSize: int = 2, decodedElements: dict[int, np.ndarray or tuple] or None = None):
+        AssignFields(self, ReadStruct(buffer, pos, self.dtype))
 
         # Calculated data
         self.fileBuffer = fileBuffer
-        self.vertexElementHeaders: list[VertexElementHeader] = [None] * self.vertexElementCount[1]
-
-        for i in range(self.vertexElementCount[1]):
-            self.vertexElementHeaders[i] = VertexElementHeader(buffer, self.vertexElementHeadersOffset +
-                                                                 i * VertexElementHeader.size)
-
-    size = 48
+        # Size of each face index value in bytes (unsigned short or unsigned int)
+        self.faceIndexSize = faceIndexSize
+        self.vertexElementHeaders: list[VertexElementHeader] = \
+            [VertexElementHeader(buffer, record=record) for record in
+             ReadStruct(buffer, self.vertexElementHeadersOffset, VertexElementHeader.dtype,
+                        self.vertexElementCount[1])]
+
+        # Each element stream spans up to the start of the next one, or to the end of the vertex buffer
+        elementOffsets = sorted(set(element.offsetInVertexBuffer for element in self.vertexElementHeaders))
+        self.elementVertexCounts: list[int] = [None] * len(self.vertexElementHeaders)
+        for i, element in enumerate(self.vertexElementHeaders):
+            streamEnd = next((offset for offset in elementOffsets if offset > element.offsetInVertexBuffer),
+                             self.vertexBufferSize)
+            self.elementVertexCounts[i] = (streamEnd - element.offsetInVertexBuffer) // element.bytesPerVertex
+
+        # Streams decoded earlier (e.g. loaded from a MeshCache) can be handed in and are used as they are, a stream
+        # may only hold the first vertices of the element (e.g. the ones of LOD0)
+        self.__decodedElements: dict[int, np.ndarray or tuple[np.ndarray, np.ndarray]] = \
+            dict(decodedElements) if decodedElements is not None else {}
+
+    def DecodeElement(self, index: int, first: int = 0,
+                      count: int or None = None) -> np.ndarray or tuple[np.ndarray, np.ndarray]:
+        # Decodes a whole element stream once, submeshes take their arrays as slices of it
+        # With a count only that range of vertices is decoded and nothing is kept, for streaming one submesh at a time
+        decoded = self.__decodedElements.get(index)
+        if count is not None:
+            if first + count > self.DecodedVertexCount(index):
+                return self.__DecodeRange(index, first, count)
+            if type(decoded) == tuple:
+                return tuple(stream[first:first + count] for stream in decoded)
+            return decoded[first:first + count]
+
+        return self.DecodeElementPrefix(index, self.elementVertexCounts[index])
+
+    def DecodeElementPrefix(self, index: int, count: int) -> np.ndarray or tuple[np.ndarray, np.ndarray]:
+        # Decodes and keeps the first count vertices of an element stream, unless at least that many are kept already
+        decoded = self.__decodedElements.get(index)
+        if decoded is None or self.DecodedVertexCount(index) < count:
+            decoded = self.__DecodeRange(index, 0, count)
+            self.__decodedElements[index] = decoded
+        return decoded
+
+    def DecodedVertexCount(self, index: int) -> int:
+        # How many vertices of an element stream are decoded and kept, from the first one on
+        decoded = self.__decodedElements.get(index)
+        if decoded is None:
+            return 0
+        return len(decoded[0]) if type(decoded) == tuple else len(decoded)
+
+    def DecodedElements(self) -> dict[int, np.ndarray or tuple[np.ndarray, np.ndarray]]:
+        # The kept streams by element index, e.g. for a MeshCache to store
+        return dict(self.__decodedElements)
+
+    def DecodedLayout(self, index: int) -> list[tuple[tuple[int, int], np.dtype]]:
+        # Shape and type of each array DecodeElement returns for an element stream, without decoding it
+        count = self.elementVertexCounts[index]
+        match self.vertexElementHeaders[index].elementType:
+            case VertexElementHeader.ElementType.VertexPosition:
+                return [((count, 3), GetDType(np.single))]
+
+            case VertexElementHeader.ElementType.NormalsTangents:
+                return [((count, 3), GetDType(np.single)), ((count, 4), GetDType(np.single))]
+
+            case VertexElementHeader.ElementType.UV0 | VertexElementHeader.ElementType.UV1:
+                return [((count, 2), GetDType(np.half))]
+
+            case VertexElementHeader.ElementType.BoneInfo:
+                return [((count, 8), GetDType(np.ubyte)), ((count, 8), GetDType(np.single))]
+
+    def ReleaseElements(self):
+        # Drops the decoded streams, arrays already handed out stay valid
+        self.__decodedElements.clear()
+
+    def __DecodeRange(self, index: int, first: int, count: int) -> np.ndarray or tuple[np.ndarray, np.ndarray]:
+        element = self.vertexElementHeaders[index]
+        pos = self.vertexBufferOffset + element.offsetInVertexBuffer + first * element.bytesPerVertex
+        match element.elementType:
+            case element.ElementType.VertexPosition:
+                decoded = ReadStrided(self.fileBuffer, pos, count, np.single, 3, element.bytesPerVertex)
+
+            case element.ElementType.NormalsTangents:
+                decoded = NormalAndTangent.Decode(self.fileBuffer, pos, count, element.bytesPerVertex)
+
+            case element.ElementType.UV0 | element.ElementType.UV1:
+                decoded = ReadStrided(self.fileBuffer, pos, count, np.half, 2, element.bytesPerVertex)
+
+            case element.ElementType.BoneInfo:
+                decoded = SkinWeights.Decode(self.fileBuffer, pos, count, element.bytesPerVertex)
+
+        return decoded
+
+    dtype = np.dtype([
+        ('vertexElementHeadersOffset', '<u8'),
+        ('vertexBufferOffset', '<u8'),
+        ('faceIndexBufferOffset', '<u8'),
+        ('vertexBufferSize', '<u4'),
+        ('faceIndexBufferSize', '<u4'),
+        ('vertexElementCount', '<u2', (2,)),
+        ('ukn', '<u8'),
+        ('blendShapesOffset', '<i4'),
+    ])
+
+    size = dtype.itemsize
 
 
 class SubMesh:
     def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0, vertexBufferHeader: GeometryBuffersHeader = -1,
-                 vertexCount: int = -1, faceBufferOffset: int = 0, isShadowGeo: bool = False, preview: bool = False):
-        self.materialID = ReadInt32(buffer, pos + 0)
-        self.faceIndexCount = ReadInt32(buffer, pos + 4)
-        self.faceIndicesBefore = ReadInt32(buffer, pos + 8)
-        self.verticesBefore = ReadInt32(buffer, pos + 12)
+                 vertexCount: int = -1, faceBufferOffset: int = 0, isShadowGeo: bool = False, lazy: bool = False,
+                 record: np.void or None = None):
+        AssignFields(self, ReadStruct(buffer, pos, self.dtype) if record is None else record)
 
         # Calculated data
         self.vertexCount = vertexCount
-
-        if preview:
-            return
+        # When not set, the submesh decodes only its own vertices instead of slicing whole decoded streams
+        self.sliceStreams: bool = True
 
         if vertexBufferHeader == -1 or vertexBufferHeader.fileBuffer == -1:
             return
 
+        self.__fileBuffer = vertexBufferHeader.fileBuffer
+        self.__vertexBufferHeader = vertexBufferHeader
         self.faceIndexBufferPos = faceBufferOffset + vertexBufferHeader.faceIndexBufferOffset +\
-                                                        self.faceIndicesBefore * 2
-
-        self.faces: np.ndarray[tuple[int, int, int]] = ReadInt16(buffer, self.faceIndexBufferPos,
-                                                           self.faceIndexCount).reshape((-1, 3))
-        self.vertexBuffer: np.ndarray[tuple[float, float, float]] #[None] * self.vertexCount
-        self.normalsTangents: list[NormalAndTangent] = [None] * self.vertexCount
-        self.uv0s: np.ndarray[tuple[float, float]] = np.array([]) #[None] * self.vertexCount
-        self.uv1s: np.ndarray[tuple[float, float]] = np.array([])#[None] * self.vertexCount
-        self.boneInfo: list[SkinWeights] = [None] * self.vertexCount
+                                                        self.faceIndicesBefore * vertexBufferHeader.faceIndexSize
+        self.__faceIndexType = GetDType(np.uintc if vertexBufferHeader.faceIndexSize == 4 else np.ushort)
 
         self.elemIdxRange: tuple[int, int]
         if isShadowGeo:
@@ -178,105 +291,194 @@ class SubMesh:
         else:
             self.elemIdxRange = (0, vertexBufferHeader.vertexElementCount[0])
 
+        # Only the element streams used by the submesh are recorded here, they are decoded on first access
         self.elementOffsets: list[int] = []
+        self.elementStreams: dict[VertexElementHeader.ElementType, int] = {}
         for i in range(self.elemIdxRange[0], self.elemIdxRange[1]):
             elementInfo = vertexBufferHeader.vertexElementHeaders[i]
             self.elementOffsets.append(vertexBufferHeader.vertexBufferOffset + elementInfo.offsetInVertexBuffer)
-            match elementInfo.elementType:
-                case elementInfo.ElementType.VertexPosition:
-                    self.vertexBuffer = ReadFloat(buffer, vertexBufferHeader.vertexBufferOffset +
-                                                  elementInfo.offsetInVertexBuffer + self.verticesBefore *
-                                                  elementInfo.bytesPerVertex, 3 * self.vertexCount).reshape((-1, 3))
-
-                case elementInfo.ElementType.NormalsTangents:
-                    for j in range(self.vertexCount):
-                        self.normalsTangents[j] = NormalAndTangent(vertexBufferHeader.fileBuffer,
-                                                                   vertexBufferHeader.vertexBufferOffset +
-                                                                   elementInfo.offsetInVertexBuffer +
-                                                                   self.verticesBefore * elementInfo.bytesPerVertex +
-                                                                   j * elementInfo.bytesPerVertex)
-
-                case elementInfo.ElementType.UV0:
-                    self.uv0s = ReadHalfFloat(buffer, vertexBufferHeader.vertexBufferOffset +
-                                              elementInfo.offsetInVertexBuffer + self.verticesBefore *
-                                              elementInfo.bytesPerVertex, 2 * self.vertexCount).reshape((-1, 2))
-#
-                case elementInfo.ElementType.UV1:
-                    self.uv1s = ReadHalfFloat(buffer, vertexBufferHeader.vertexBufferOffset +
-                                              elementInfo.offsetInVertexBuffer + self.verticesBefore *
-                                              elementInfo.bytesPerVertex, 2 * self.vertexCount).reshape((-1, 2))
-
-                case elementInfo.ElementType.BoneInfo:
-                    for j in range(self.vertexCount):
-                        self.boneInfo[j] = SkinWeights(vertexBufferHeader.fileBuffer,
-                                                         vertexBufferHeader.vertexBufferOffset +
-                                                         elementInfo.offsetInVertexBuffer + self.verticesBefore *
-                                                         elementInfo.bytesPerVertex + j * elementInfo.bytesPerVertex)
-
-    size = 16
+            self.elementStreams[elementInfo.elementType] = i
+
+        if not lazy:
+            self.Decode()
+
+    def Decode(self):
+        # Touching every stream decodes and caches all of them
+        _ = self.faces, self.vertexBuffer, self.normals, self.uv0s, self.uv1s, self.boneIndices
+
+    @cached_property
+    def boundingBox(self) -> np.ndarray[tuple[float, float, float]]:
+        # Min and max corners of the submesh vertices
+        return ComputeBoundingBoxes(self.vertexBuffer, [0], [len(self.vertexBuffer)])[0]
+
+    def Release(self):
+        # Forgets every decoded array, they get decoded again if accessed later
+        for name in ('faces', 'vertexBuffer', 'uv0s', 'uv1s', '_SubMesh__normalsTangents', '_SubMesh__skinWeights'):
+            self.__dict__.pop(name, None)
+
+    def __SliceElement(self, elementType: VertexElementHeader.ElementType) -> np.ndarray or tuple or None:
+        # The submesh arrays are views into the stream decoded once for the whole geometry buffer
+        index = self.elementStreams.get(elementType)
+        if index is None:
+            return None
+
+        if not self.sliceStreams:
+            return self.__vertexBufferHeader.DecodeElement(index, self.verticesBefore, self.vertexCount)
+
+        decoded = self.__vertexBufferHeader.DecodeElement(index)
+        vertexRange = slice(self.verticesBefore, self.verticesBefore + self.vertexCount)
+        if type(decoded) == tuple:
+            return tuple(stream[vertexRange] for stream in decoded)
+        return decoded[vertexRange]
+
+    @cached_property
+    def faces(self) -> np.ndarray[tuple[int, int, int]]:
+        return ReadStruct(self.__fileBuffer, self.faceIndexBufferPos, self.__faceIndexType,
+                          self.faceIndexCount).reshape((-1, 3))
+
+    @cached_property
+    def vertexBuffer(self) -> np.ndarray[tuple[float, float, float]]:
+        positions = self.__SliceElement(VertexElementHeader.ElementType.VertexPosition)
+        return positions if positions is not None else np.zeros((0, 3), np.single)
+
+    @cached_property
+    def uv0s(self) -> np.ndarray[tuple[float, float]]:
+        uvs = self.__SliceElement(VertexElementHeader.ElementType.UV0)
+        return uvs if uvs is not None else np.array([])
+
+    @cached_property
+    def uv1s(self) -> np.ndarray[tuple[float, float]]:
+        uvs = self.__SliceElement(VertexElementHeader.ElementType.UV1)
+        return uvs if uvs is not None else np.array([])
+
+    @cached_property
+    def __normalsTangents(self) -> tuple[np.ndarray, np.ndarray]:
+        normalsTangents = self.__SliceElement(VertexElementHeader.ElementType.NormalsTangents)
+        return normalsTangents if normalsTangents is not None else\
+            (np.zeros((0, 3), np.float32), np.zeros((0, 4), np.float32))
+
+    @property
+    def normals(self) -> np.ndarray[tuple[float, float, float]]:
+        return self.__normalsTangents[0]
+
+    @property
+    def tangents(self) -> np.ndarray[tuple[float, float, float, float]]:
+        return self.__normalsTangents[1]
+
+    @cached_property
+    def __skinWeights(self) -> tuple[np.ndarray, np.ndarray]:
+        skinWeights = self.__SliceElement(VertexElementHeader.ElementType.BoneInfo)
+        return skinWeights if skinWeights is not None else\
+            (np.zeros((0, 8), np.ubyte), np.zeros((0, 8), np.float32))
+
+    @property
+    def boneIndices(self) -> np.ndarray[tuple[int, ...]]:
+        return self.__skinWeights[0]
+
+    @property
+    def boneWeights(self) -> np.ndarray[tuple[float, ...]]:
+        return self.__skinWeights[1]
+
+    dtype = np.dtype([
+        ('materialID', '<u4'),
+        ('faceIndexCount', '<u4'),
+        ('faceIndicesBefore', '<u4'),
+        ('verticesBefore', '<u4'),
+    ])
+
+    size = dtype.itemsize
 
 class Mainmesh:
     def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0,
-                 vertexBufferHeader: GeometryBuffersHeader = -1, faceBufferOffset: int = 0, isShadowGeo: bool = False):
-        self.groupID = ReadByte(buffer, pos + 0)
-        self.submeshCount = ReadByte(buffer, pos + 1)
-        self.ukn1: np.ndarray[int] = ReadByte(buffer, pos + 2, 2)
-        self.ukn2 = ReadInt32(buffer, pos + 4)
-        self.mainmeshVertexCount = ReadInt32(buffer, pos + 8)
-        self.mainmeshFaceIndexCount = ReadInt32(buffer, pos + 12)
+                 vertexBufferHeader: GeometryBuffersHeader = -1, faceBufferOffset: int = 0, isShadowGeo: bool = False,
+                 verticesBefore: int = 0, lazy: bool = False):
+        AssignFields(self, ReadStruct(buffer, pos, self.dtype))
 
         # Calculated data
-        Mainmesh.verticesRead += self.mainmeshVertexCount
-        self.submeshes: list[SubMesh]  = [None] * self.submeshCount
-        for i in range(self.submeshCount):
-            self.submeshes[i] = SubMesh(buffer, pos + Mainmesh.size + i * SubMesh.size, vertexBufferHeader,
-                                          faceBufferOffset=faceBufferOffset, isShadowGeo=isShadowGeo, preview=True)
+        # Vertices of the model read up to and including this mainmesh, carried by the caller instead of global state
+        self.verticesRead: int = verticesBefore + self.mainmeshVertexCount
 
-        for i in range(1, self.submeshCount):
-            self.submeshes[i - 1].vertexCount = self.submeshes[i].verticesBefore - self.submeshes[i - 1].verticesBefore
-        self.submeshes[-1].vertexCount = self.verticesRead - self.submeshes[-1].verticesBefore
+        # The whole submesh table is read at once, each submesh ends where the next one begins
+        submeshRecords = ReadStruct(buffer, pos + Mainmesh.size, SubMesh.dtype, self.submeshCount)
+        submeshVertexCounts = np.diff(submeshRecords['verticesBefore'].astype(np.int64),
+                                      append=self.verticesRead)
 
+        self.submeshes: list[SubMesh] = [None] * self.submeshCount
         for i in range(self.submeshCount):
-            submeshVertexCount = self.submeshes[i].vertexCount
             self.submeshes[i] = SubMesh(buffer, pos + Mainmesh.size + i * SubMesh.size, vertexBufferHeader,
-                                        submeshVertexCount, faceBufferOffset, isShadowGeo)
+                                        int(submeshVertexCounts[i]), faceBufferOffset, isShadowGeo, lazy,
+                                        submeshRecords[i])
 
-    @staticmethod
-    def Reset():
-        Mainmesh.verticesRead = 0
-
-    verticesRead = 0
+    dtype = np.dtype([
+        ('groupID', '<u1'),
+        ('submeshCount', '<u1'),
+        ('ukn1', '<u1', (2,)),
+        ('ukn2', '<u4'),
+        ('mainmeshVertexCount', '<u4'),
+        ('mainmeshFaceIndexCount', '<u4'),
+    ])
 
-    size = 16
+    size = dtype.itemsize
 
 
 class LODGroup:
     def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0,
-                 vertexBufferHeader: GeometryBuffersHeader = -1, faceBufferOffset: int = 0, isShadowGeo: bool = False):
-        self.mainmeshCount = ReadByte(buffer, pos + 0)
-        self.ukn1 = ReadByte(buffer, pos + 1, 3)
-        self.ukn2 = ReadFloat(buffer, pos + 4)
-        self.mainmeshHeaderOffsetsOffset = ReadInt64(buffer, pos + 8)
+                 vertexBufferHeader: GeometryBuffersHeader = -1, faceBufferOffset: int = 0, isShadowGeo: bool = False,
+                 verticesBefore: int = 0, lazy: bool = False):
+        AssignFields(self, ReadStruct(buffer, pos, self.dtype))
 
         # Calculated info
+        self.__vertexBufferHeader = vertexBufferHeader
         self.faceBufferTotalSize: int = 0
-        self.mainmeshOffsets: list[int] = [None] * self.mainmeshCount
+        self.verticesRead: int = verticesBefore
+        self.mainmeshOffsets: list[int] = ReadStruct(buffer, self.mainmeshHeaderOffsetsOffset, np.dtype('<u8'),
+                                                     self.mainmeshCount).tolist()
         self.mainmeshes: list[Mainmesh] = [None] * self.mainmeshCount
         for i in range(self.mainmeshCount):
-            self.mainmeshOffsets[i] = ReadInt64(buffer, self.mainmeshHeaderOffsetsOffset + i * 8)
             self.mainmeshes[i] = Mainmesh(buffer, self.mainmeshOffsets[i], vertexBufferHeader, faceBufferOffset,
-                                            isShadowGeo)
-            # Size of each index value in bytes (unsigned short)
-            self.faceBufferTotalSize += self.mainmeshes[i].mainmeshFaceIndexCount * 2
-    size = 16
+                                          isShadowGeo, self.verticesRead, lazy)
+            self.verticesRead = self.mainmeshes[i].verticesRead
+            # Size of each index value in bytes (unsigned short or unsigned int)
+            self.faceBufferTotalSize += self.mainmeshes[i].mainmeshFaceIndexCount *\
+                (vertexBufferHeader.faceIndexSize if vertexBufferHeader != -1 else 2)
+
+        self.submeshes: list[SubMesh] = [submesh for mainmesh in self.mainmeshes for submesh in mainmesh.submeshes]
+
+    @cached_property
+    def submeshBoundingBoxes(self) -> np.ndarray[tuple[int, int, int]]:
+        # Bounding boxes of every submesh of the LOD, in the order they are stored, only the positions of this LOD are
+        # decoded for them
+        boundingBoxes = np.zeros((len(self.submeshes), 2, 3), np.single)
+        if not self.submeshes or self.__vertexBufferHeader == -1:
+            return boundingBoxes
+
+        positionIndex = self.submeshes[0].elementStreams.get(VertexElementHeader.ElementType.VertexPosition)
+        if positionIndex is None:
+            return boundingBoxes
+
+        starts = np.array([submesh.verticesBefore for submesh in self.submeshes], np.int64)
+        counts = np.array([submesh.vertexCount for submesh in self.submeshes], np.int64)
+        first = int(starts.min())
+        positions = self.__vertexBufferHeader.DecodeElement(positionIndex, first, int((starts + counts).max()) - first)
+        return ComputeBoundingBoxes(positions, starts - first, counts)
+
+    dtype = np.dtype([
+        ('mainmeshCount', '<u1'),
+        ('ukn1', '<u1', (3,)),
+        ('ukn2', '<f4'),
+        ('mainmeshHeaderOffsetsOffset', '<u8'),
+    ])
+
+    size = dtype.itemsize
 
 
 class BoundingBox:
     def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0):
+        corners = BinaryReader(buffer).UnpackFrom('8f', pos)
         # Bottom back left
-        self.min: tuple[float, float, float, float] = tuple(ReadFloat(buffer, pos + 32, 4))
+        self.min: tuple[float, float, float, float] = corners[0:4]
         # Top right front
-        self.max: tuple[float, float, float, float] = tuple(ReadFloat(buffer, pos + 48, 4))
+        self.max: tuple[float, float, float, float] = corners[4:8]
 
         # Calculated data
         self.botLeftBack = self.min
@@ -291,57 +493,189 @@ class BoundingBox:
 
     size = 32
 
+def ComputeBoundingBoxes(positions: np.ndarray, starts: list[int] or np.ndarray,
+                         counts: list[int] or np.ndarray) -> np.ndarray:
+    # Min and max corners (count, 2, 3) of many vertex ranges of one position stream, ranges that follow each other
+    # back to back (as submeshes do) are reduced all at once, empty ranges get an empty box at the origin
+    starts = np.asarray(starts, np.int64)
+    counts = np.asarray(counts, np.int64)
+    boundingBoxes = np.zeros((starts.size, 2, 3), np.single)
+
+    filled = np.flatnonzero(counts > 0)
+    if filled.size == 0:
+        return boundingBoxes
+
+    order = filled[np.argsort(starts[filled], kind='stable')]
+    rangeStarts = starts[order]
+    rangeEnds = rangeStarts + counts[order]
+    if np.array_equal(rangeStarts[1:], rangeEnds[:-1]) and rangeEnds[-1] <= len(positions):
+        span = positions[rangeStarts[0]:rangeEnds[-1]]
+        boundingBoxes[order, 0] = np.minimum.reduceat(span, rangeStarts - rangeStarts[0], axis=0)
+        boundingBoxes[order, 1] = np.maximum.reduceat(span, rangeStarts - rangeStarts[0], axis=0)
+    else:
+        for i in order.tolist():
+            vertices = positions[starts[i]:starts[i] + counts[i]]
+            if len(vertices):
+                boundingBoxes[i] = (vertices.min(axis=0), vertices.max(axis=0))
+
+    return boundingBoxes
+
+
 class ModelInfo:
     def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0,
-                 vertexBufferHeader: GeometryBuffersHeader = -1, faceBufferOffset: int = 0, isShadowGeo: bool = False):
-        self.lodGroupCount = ReadByte(buffer, pos + 0)
-        self.materialCount = ReadByte(buffer, pos + 1)
-        self.uvLayerCount = ReadByte(buffer, pos + 2)
-        self.ukn1 = ReadByte(buffer, pos + 3)
-        self.totalMeshCount = ReadInt32(buffer, pos + 4)
-        self.ukn2 = ReadInt64(buffer, pos + 8)
-        self.ukn3 = ReadFloat(buffer, pos + 16, 4)
+                 vertexBufferHeader: GeometryBuffersHeader = -1, faceBufferOffset: int = 0, isShadowGeo: bool = False,
+                 lazy: bool = False):
+        AssignFields(self, ReadStruct(buffer, pos, self.dtype))
         self.boundingBox = BoundingBox(buffer, pos + 32)
-        self.ukn4 = ReadInt64(buffer, pos + 64)
 
         # Calculated info
         self.faceBufferTotalSize: int = 0
         self.uniqueLodCount = 0
-        self.lodGroupOffsets: list[int] = [None] * self.lodGroupCount
-        for i in range(self.lodGroupCount):
-            self.lodGroupOffsets[i] = ReadInt64(buffer, pos + 72 + i * 8)
+        self.lodGroupOffsets: list[int] = ReadStruct(buffer, pos + ModelInfo.size, np.dtype('<u8'),
+                                                     self.lodGroupCount).tolist()
         self.uniqueLODGroupOffsets = list(dict.fromkeys(self.lodGroupOffsets))
         self.uniqueLodCount = self.uniqueLODGroupOffsets.__len__()
 
         self.lodGroups = [None] * self.uniqueLodCount
-        Mainmesh.Reset()
+        verticesRead = 0
         for i in range(self.uniqueLodCount):
             self.lodGroups[i] = LODGroup(buffer, self.uniqueLODGroupOffsets[i], vertexBufferHeader, faceBufferOffset,
-                                           isShadowGeo)
+                                         isShadowGeo, verticesRead, lazy)
+            verticesRead = self.lodGroups[i].verticesRead
             self.faceBufferTotalSize += self.lodGroups[i].faceBufferTotalSize
 
-    size = 72
+        self.submeshes: list[SubMesh] = [submesh for lodGroup in self.lodGroups for submesh in lodGroup.submeshes]
+
+    @cached_property
+    def submeshBoundingBoxes(self) -> np.ndarray[tuple[int, int, int]]:
+        # Bounding boxes of every submesh of every LOD, in the order they are stored, LODs that only need their own
+        # boxes should use LODGroup.submeshBoundingBoxes
+        return np.concatenate([lodGroup.submeshBoundingBoxes for lodGroup in self.lodGroups]) if self.lodGroups else \
+            np.zeros((0, 2, 3), np.single)
+
+    dtype = np.dtype([
+        ('lodGroupCount', '<u1'),
+        ('materialCount', '<u1'),
+        ('uvLayerCount', '<u1'),
+        ('ukn1', '<u1'),
+        ('totalMeshCount', '<u4'),
+        ('ukn2', '<u8'),
+        ('ukn3', '<f4', (4,)),
+        ('boundingBox', '<f4', (8,)),
+        ('ukn4', '<u8'),
+    ])
+
+    size = dtype.itemsize
 
 
 class NameTable:
     def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0, nodeCount: int = 0):
-        self.nameOffsets: list[int] = [int] * nodeCount
-        self.nameList: list[str] = [str] * nodeCount
+        self.nameOffsets: list[int] = ReadStruct(buffer, pos, np.dtype('<u8'), nodeCount).tolist()
+        self.nameList: list[str] = ReadUTF8Strings(buffer, self.nameOffsets)
 
-        stringOffsets = ReadInt64(buffer, pos, nodeCount)
-        for i in range(nodeCount):
-            self.nameOffsets[i] = stringOffsets[i]
-            self.nameList[i] = ReadString(buffer, stringOffsets[i])
+        # Calculated data
+        # Index of the first node with each name
+        self.nameIndexMap: dict[str, int] = {}
+        for idx, name in enumerate(self.nameList):
+            self.nameIndexMap.setdefault(name, idx)
 
 
 class BoundingBoxHeader:
     def __init__(self, buffer: bytes or bytearray or list[int], pos: int = 0):
-        self.boundingBoxCount = ReadInt64(buffer, pos + 0)
-        self.boundingBoxBufferOffset = ReadInt64(buffer, pos + 8)
+        self.boundingBoxCount, self.boundingBoxBufferOffset = BinaryReader(buffer, pos).Unpack('QQ')
 
 
-class REEMesh:
+def ReadMainmeshRecords(buffer: bytes or bytearray or list[int], pos: int = 0) -> list[list[np.void]]:
+    # Mainmesh header records of every unique LOD group of a model, without building any submesh
+    modelRecord = ReadStruct(buffer, pos, ModelInfo.dtype)
+    lodGroupOffsets = ReadStruct(buffer, pos + ModelInfo.size, np.dtype('<u8'), modelRecord['lodGroupCount']).tolist()
+
+    lodMainmeshRecords: list[list[np.void]] = []
+    for lodGroupOffset in dict.fromkeys(lodGroupOffsets):
+        lodRecord = ReadStruct(buffer, lodGroupOffset, LODGroup.dtype)
+        mainmeshOffsets = ReadStruct(buffer, lodRecord['mainmeshHeaderOffsetsOffset'], np.dtype('<u8'),
+                                     lodRecord['mainmeshCount']).tolist()
+        lodMainmeshRecords.append([ReadStruct(buffer, offset, Mainmesh.dtype) for offset in mainmeshOffsets])
+
+    return lodMainmeshRecords
+
+
+def DetectFaceIndexSize(buffer: bytes or bytearray or list[int], header: Header) -> int:
+    # The face buffer of very large meshes holds 32-bit indices, which shows in its size: it holds every face index of
+    # the main and shadow geometry at exactly one of the two widths, give or take the padding up to 16 byte alignment
+    faceIndexCount = 0
+    for modelOffset in (header.lodDescriptionsOffset, header.shadowLODDescriptionsOffset):
+        if modelOffset != 0:
+            faceIndexCount += sum(int(record['mainmeshFaceIndexCount'])
+                                  for records in ReadMainmeshRecords(buffer, modelOffset) for record in records)
+
+    faceIndexBufferSize = int(ReadStruct(buffer, header.vertexBufferHeaderOffset,
+                                         GeometryBuffersHeader.dtype)['faceIndexBufferSize'])
+    if faceIndexCount == 0:
+        return 2
+
+    fittingSizes = [indexSize for indexSize in (2, 4)
+                    if faceIndexCount * indexSize <= faceIndexBufferSize <= (faceIndexCount * indexSize + 15) // 16 * 16]
+    if len(fittingSizes) != 1:
+        raise RuntimeError(f"Can't tell the face index size from a {faceIndexBufferSize} byte face buffer holding "
+                           f"{faceIndexCount} indices!")
+    return fittingSizes[0]
+
+
+class REEMeshSummary:
+    # Counts and names of a mesh file gathered from its headers alone, without touching any vertex data
     def __init__(self, fileBuffer: bytes or bytearray or list[int]):
+        header = Header(fileBuffer, 0)
+        modelRecord = ReadStruct(fileBuffer, header.lodDescriptionsOffset, ModelInfo.dtype)
+
+        # Counts of the main geometry per unique LOD group
+        self.lodVertexCounts: list[int] = []
+        self.lodFaceCounts: list[int] = []
+        for mainmeshRecords in ReadMainmeshRecords(fileBuffer, header.lodDescriptionsOffset):
+            self.lodVertexCounts.append(sum(int(record['mainmeshVertexCount']) for record in mainmeshRecords))
+            self.lodFaceCounts.append(sum(int(record['mainmeshFaceIndexCount']) for record in mainmeshRecords) // 3)
+
+        self.lodCount: int = len(self.lodVertexCounts)
+        self.vertexCount: int = sum(self.lodVertexCounts)
+        self.faceCount: int = sum(self.lodFaceCounts)
+        self.faceIndexSize: int = DetectFaceIndexSize(fileBuffer, header)
+
+        # Bottom back left and top right front corners of the whole model
+        boundingBox = modelRecord['boundingBox']
+        self.boundingBox: tuple[tuple[float, float, float], tuple[float, float, float]] = \
+            (tuple(boundingBox[0:3].tolist()), tuple(boundingBox[4:7].tolist()))
+
+        nameTable = NameTable(fileBuffer, header.nameTableOffset, header.nameTableNodeCount)
+
+        self.hasShadowGeo: bool = header.shadowLODDescriptionsOffset != 0
+        self.materialCount: int = int(modelRecord['materialCount'])
+        if self.hasShadowGeo:
+            shadowRecord = ReadStruct(fileBuffer, header.shadowLODDescriptionsOffset, ModelInfo.dtype)
+            self.materialCount = max(self.materialCount, int(shadowRecord['materialCount']))
+        self.materialNames: list[str] = [nameTable.nameList[idx] for idx in
+                                         ReadInt16(fileBuffer, header.materialNameIndexBufferOffset,
+                                                   self.materialCount).tolist()] if self.materialCount else []
+
+        self.hasArmature: bool = header.armatureHeaderOffset != 0
+        self.boneCount: int = 0
+        self.boneNames: list[str] = []
+        if self.hasArmature:
+            self.boneCount = int(ReadStruct(fileBuffer, header.armatureHeaderOffset, ArmatureHeader.dtype)['boneCount'])
+            if self.boneCount:
+                self.boneNames = [nameTable.nameList[idx] for idx in
+                                  ReadInt16(fileBuffer, header.boneNameIndexBufferOffset, self.boneCount).tolist()]
+
+
+class REEMesh:
+    @staticmethod
+    def Probe(source: str or bytes or bytearray) -> REEMeshSummary:
+        # Summarizes a mesh file (path or buffer) from its headers, a mapped file only pages in what is read
+        return REEMeshSummary(MapFile(source) if type(source) == str else source)
+
+    def __init__(self, fileBuffer: bytes or bytearray or list[int], lazy: bool = False,
+                 decodedElements: dict[int, np.ndarray or tuple] or None = None):
+        # With lazy set, submesh vertex streams are only decoded when they are first accessed
+        # Vertex streams already decoded before (by element index) are used instead of decoding the file again
         # Taking the file buffer in
         self.fileBuffer = fileBuffer
 
@@ -350,25 +684,23 @@ class REEMesh:
 
         # Read vertex buffer header
         self.vertexBufferHeader = GeometryBuffersHeader(self.fileBuffer, self.header.vertexBufferHeaderOffset,
-                                                        self.fileBuffer)
+                                                        self.fileBuffer, DetectFaceIndexSize(self.fileBuffer,
+                                                                                             self.header),
+                                                        decodedElements)
 
-        # Read vertex element headers
-        self.vertexElementHeaders: list[VertexElementHeader] =\
-            [VertexElementHeader] * self.vertexBufferHeader.vertexElementCount[1]
-        for i in range(self.vertexBufferHeader.vertexElementCount[1]):
-            self.vertexElementHeaders[i] = VertexElementHeader(self.fileBuffer,
-                                                                 self.vertexBufferHeader.vertexElementHeadersOffset +
-                                                                 i * VertexElementHeader.size)
+        # Vertex element headers
+        self.vertexElementHeaders: list[VertexElementHeader] = self.vertexBufferHeader.vertexElementHeaders
 
         # Read LOD groups descriptions
-        self.mainModel = ModelInfo(self.fileBuffer, self.header.lodDescriptionsOffset, self.vertexBufferHeader)
+        self.mainModel = ModelInfo(self.fileBuffer, self.header.lodDescriptionsOffset, self.vertexBufferHeader,
+                                   lazy=lazy)
 
         # Read shadow LOD groups descriptions if exists
         self.hasShadowGeo: bool = False
         if self.header.shadowLODDescriptionsOffset:
             self.hasShadowGeo = True
             self.shadowModel = ModelInfo(self.fileBuffer, self.header.shadowLODDescriptionsOffset,
-                                         self.vertexBufferHeader, self.mainModel.faceBufferTotalSize, True)
+                                         self.vertexBufferHeader, self.mainModel.faceBufferTotalSize, True, lazy)
 
         # Read armature info if exists
         self.hasArmature: bool = False
@@ -383,18 +715,90 @@ class REEMesh:
         matNIdxBuffLen = max([self.mainModel.materialCount, self.shadowModel.materialCount])\
             if self.hasShadowGeo else self.mainModel.materialCount
         self.materialNameIndexBuffer: np.ndarray[int] = ReadInt16(self.fileBuffer, self.header.materialNameIndexBufferOffset,
-                                                            matNIdxBuffLen)
+                                                            matNIdxBuffLen).copy()
+        self.materialNames: list[str] = [self.nameTable.nameList[idx] for idx in self.materialNameIndexBuffer.tolist()]
 
         # Bone name index buffer
         if self.hasArmature:
             self.boneNameIndexBuffer: np.ndarray[int] = ReadInt16(self.fileBuffer, self.header.boneNameIndexBufferOffset,
-                                                        self.armature.boneCount)
+                                                        self.armature.boneCount).copy()
+            self.boneNames: list[str] = [self.nameTable.nameList[idx] for idx in self.boneNameIndexBuffer.tolist()]
 
         # Skin map bounding boxes
+        self.boundingBoxes: list[BoundingBox] = []
+        # The same boxes as min and max corners (count, 2, 3), one per entry of the skin bone map
+        self.boneBoundingBoxes: np.ndarray[tuple[int, int, int]] = np.zeros((0, 2, 3), np.single)
         if self.header.boundingBoxHeaderOffset != 0:
             self.boundingBoxHeader = BoundingBoxHeader(self.fileBuffer, self.header.boundingBoxHeaderOffset)
 
-            self.boundingBoxes: list[BoundingBox] = [BoundingBox] * self.boundingBoxHeader.boundingBoxCount
+            self.boundingBoxes = [BoundingBox] * self.boundingBoxHeader.boundingBoxCount
             for i in range(self.boundingBoxHeader.boundingBoxCount):
                 self.boundingBoxes[i] = BoundingBox(self.fileBuffer, self.boundingBoxHeader.boundingBoxBufferOffset + i *
                                                     BoundingBox.size)
+
+            if self.boundingBoxHeader.boundingBoxCount:
+                self.boneBoundingBoxes = ReadFloat(self.fileBuffer, self.boundingBoxHeader.boundingBoxBufferOffset,
+                                                   8 * self.boundingBoxHeader.boundingBoxCount)\
+                    .reshape((-1, 2, 4))[:, :, 0:3].copy()
+
+
+    def DecodeElements(self, lodCount: int or None = None, shadowGeo: bool = True):
+        # Decodes and keeps the element streams used by the first lodCount LODs, each up to the last vertex of those
+        # LODs, the LODs after them stay undecoded
+        models = [self.mainModel, self.shadowModel] if shadowGeo and self.hasShadowGeo else [self.mainModel]
+        vertexEnds: dict[int, int] = {}
+        for model in models:
+            for lodGroup in model.lodGroups[0:lodCount]:
+                for submesh in lodGroup.submeshes:
+                    vertexEnd = submesh.verticesBefore + submesh.vertexCount
+                    for index in submesh.elementStreams.values():
+                        vertexEnds[index] = max(vertexEnds.get(index, 0), vertexEnd)
+
+        for index, vertexEnd in vertexEnds.items():
+            self.vertexBufferHeader.DecodeElementPrefix(index, vertexEnd)
+
+    def IterSubmeshes(self, shadowGeo: bool = False, lodCount: int or None = None,
+                      closeFile: bool = False) -> Iterator[tuple[int, int, int, SubMesh]]:
+        # Yields (LOD index, mainmesh index, submesh index, submesh) in file order with every array of the submesh
+        # decoded from its own vertex range only, the arrays are released once the next submesh is asked for, so
+        # peak memory follows the largest submesh rather than the whole model
+        # With closeFile set the file mapping is closed at the end if nothing read from it is still alive, the end
+        # also comes when the consumer stops early (break, an exception or closing the generator)
+        # Asking for the shadow geometry of a model without any yields nothing
+        lodGroups = []
+        if not shadowGeo:
+            lodGroups = self.mainModel.lodGroups[0:lodCount]
+        elif self.hasShadowGeo:
+            lodGroups = self.shadowModel.lodGroups[0:lodCount]
+
+        try:
+            for lodIdx, lodGroup in enumerate(lodGroups):
+                for mmIdx, mainmesh in enumerate(lodGroup.mainmeshes):
+                    for smIdx, submesh in enumerate(mainmesh.submeshes):
+                        submesh.Release()
+                        submesh.sliceStreams = False
+                        submesh.Decode()
+                        try:
+                            yield lodIdx, mmIdx, smIdx, submesh
+                        finally:
+                            submesh.Release()
+                            submesh.sliceStreams = True
+        finally:
+            self.vertexBufferHeader.ReleaseElements()
+            if closeFile:
+                self.Close()
+
+    def Close(self) -> bool:
+        # Releases the decoded geometry and the file mapping, the mapping stays open (and is unmapped once the last
+        # array read from it is garbage collected) while any array viewing it is still alive
+        for model in (self.mainModel, self.shadowModel) if self.hasShadowGeo else (self.mainModel,):
+            for submesh in model.submeshes:
+                submesh.Release()
+        self.vertexBufferHeader.ReleaseElements()
+
+        if type(self.fileBuffer) == mmap.mmap:
+            try:
+                self.fileBuffer.close()
+            except BufferError:
+                return False
+        return True
@@ -0,0 +1,452 @@
+from .REEMeshFile import *
+
+# Version of the .mesh.1808282334 files written by the generator
+meshVersion = 2008058288
+
+
+class SubmeshData:
+    # Faces are (count, 3) indices local to the submesh, faceIndicesBefore is worked out while writing
+    def __init__(self, record: np.void or None = None, faces: np.ndarray or None = None):
+        self.materialID: int = 0
+        self.verticesBefore: int = 0
+        if record is not None:
+            AssignFields(self, record)
+
+        self.faces: np.ndarray = faces if faces is not None else np.zeros((0, 3), np.uintc)
+
+
+class MainmeshData:
+    def __init__(self, record: np.void or None = None, submeshes: list[SubmeshData] or None = None):
+        self.groupID: int = 0
+        self.mainmeshVertexCount: int = 0
+        if record is not None:
+            AssignFields(self, record)
+
+        self.submeshes: list[SubmeshData] = submeshes if submeshes is not None else []
+
+
+class LODGroupData:
+    def __init__(self, record: np.void or None = None, mainmeshes: list[MainmeshData] or None = None):
+        if record is not None:
+            AssignFields(self, record)
+
+        self.mainmeshes: list[MainmeshData] = mainmeshes if mainmeshes is not None else []
+
+
+class ModelData:
+    # LOD slots index into the unique LOD groups, files point several slots at the same group
+    def __init__(self, record: np.void or None = None, lodGroups: list[LODGroupData] or None = None,
+                 lodSlots: list[int] or None = None):
+        if record is not None:
+            AssignFields(self, record)
+
+        self.lodGroups: list[LODGroupData] = lodGroups if lodGroups is not None else []
+        self.lodSlots: list[int] = lodSlots if lodSlots is not None else list(range(len(self.lodGroups)))
+
+
+class VertexElementData:
+    # A whole element stream in the decoded form GeometryBuffersHeader.DecodeElement returns
+    def __init__(self, elementType: VertexElementHeader.ElementType, bytesPerVertex: int,
+                 data: np.ndarray or tuple[np.ndarray, np.ndarray]):
+        self.elementType = elementType
+        self.bytesPerVertex = bytesPerVertex
+        self.data = data
+
+    @property
+    def vertexCount(self) -> int:
+        return len(self.data[0] if type(self.data) == tuple else self.data)
+
+    def Encode(self) -> np.ndarray:
+        # The stream as (count, bytesPerVertex) bytes, built with one vectorized pass
+        match self.elementType:
+            case VertexElementHeader.ElementType.NormalsTangents:
+                return NormalAndTangent.Encode(*self.data, self.bytesPerVertex)
+
+            case VertexElementHeader.ElementType.BoneInfo:
+                return SkinWeights.Encode(*self.data, self.bytesPerVertex)
+
+        records = np.zeros((self.vertexCount, self.bytesPerVertex), np.ubyte)
+        WriteStrided(records, 0, self.data,
+                     np.single if self.elementType == VertexElementHeader.ElementType.VertexPosition else np.half)
+        return records
+
+
+class ArmatureData:
+    def __init__(self, record: np.void or None = None):
+        if record is not None:
+            AssignFields(self, record)
+
+        self.skinBoneMap: np.ndarray[int] = np.zeros(0, np.ushort)
+        self.boneHierarchy: np.ndarray = np.zeros(0, BoneHierarchy.dtype)
+        self.localBoneTransforms: np.ndarray[tuple[int, int, int]] = np.zeros((0, 4, 4), np.single)
+        self.globalBoneTransforms: np.ndarray[tuple[int, int, int]] = np.zeros((0, 4, 4), np.single)
+        self.inverseGlobalTransfroms: np.ndarray[tuple[int, int, int]] = np.zeros((0, 4, 4), np.single)
+        self.boneNames: list[str] = []
+        # Min and max corners (count, 2, 3), one per entry of the skin bone map
+        self.boneBoundingBoxes: np.ndarray[tuple[int, int, int]] = np.zeros((0, 2, 3), np.single)
+
+
+class REEMeshWriter:
+    # Serializes a model to the .mesh.1808282334 layout REEMesh reads: header, LOD/mainmesh/submesh tables of the main
+    # and shadow geometry, armature, bounding boxes, geometry buffers and the name table
+    # Counts and offsets are worked out while writing, unknown fields are written back as they were read
+    # Blend shapes and the occluder mesh are not written
+    def __init__(self):
+        self.version: int = meshVersion
+        self.lodGroupHash: int = 0
+        self.flag: int = 0
+        self.solvedOffset: int = 0
+        # Main element count and the count including the shadow geometry elements
+        self.vertexElementCount: tuple[int, int] = (0, 0)
+        self.ukn: int = 0
+
+        self.vertexElements: list[VertexElementData] = []
+        self.mainModel: ModelData = ModelData()
+        self.shadowModel: ModelData or None = None
+        self.armature: ArmatureData or None = None
+        self.materialNames: list[str] = []
+
+    @staticmethod
+    def FromREEMesh(reModel: REEMesh) -> 'REEMeshWriter':
+        # Copies everything the writer needs out of a parsed model, so the file it was read from can be closed
+        writer = REEMeshWriter()
+        for name in ('version', 'lodGroupHash', 'flag', 'solvedOffset'):
+            setattr(writer, name, getattr(reModel.header, name))
+
+        vertexBufferHeader = reModel.vertexBufferHeader
+        writer.vertexElementCount = tuple(vertexBufferHeader.vertexElementCount.tolist())
+        writer.ukn = vertexBufferHeader.ukn
+        for index, element in enumerate(vertexBufferHeader.vertexElementHeaders):
+            decoded = vertexBufferHeader.DecodeElement(index, 0, vertexBufferHeader.elementVertexCounts[index])
+            decoded = tuple(np.array(part) for part in decoded) if type(decoded) == tuple else np.array(decoded)
+            writer.vertexElements.append(VertexElementData(element.elementType, element.bytesPerVertex, decoded))
+
+        writer.mainModel = REEMeshWriter.__ModelFromInfo(reModel.fileBuffer, reModel.header.lodDescriptionsOffset,
+                                                         reModel.mainModel)
+        if reModel.hasShadowGeo:
+            writer.shadowModel = REEMeshWriter.__ModelFromInfo(reModel.fileBuffer,
+                                                               reModel.header.shadowLODDescriptionsOffset,
+                                                               reModel.shadowModel)
+
+        if reModel.hasArmature:
+            writer.armature = ArmatureData(PackRecord(ArmatureHeader.dtype, reModel.armature))
+            for name in ('skinBoneMap', 'boneHierarchy', 'localBoneTransforms', 'globalBoneTransforms',
+                         'inverseGlobalTransfroms'):
+                setattr(writer.armature, name, getattr(reModel.armature, name))
+            writer.armature.boneBoundingBoxes = reModel.boneBoundingBoxes.copy()
+            writer.armature.boneNames = list(reModel.boneNames)
+
+        writer.materialNames = list(reModel.materialNames)
+        return writer
+
+    @staticmethod
+    def __ModelFromInfo(fileBuffer: bytes or bytearray or mmap.mmap, pos: int, modelInfo: ModelInfo) -> ModelData:
+        lodGroups: list[LODGroupData] = []
+        for lodGroup in modelInfo.lodGroups:
+            mainmeshes: list[MainmeshData] = []
+            for mainmesh in lodGroup.mainmeshes:
+                submeshes: list[SubmeshData] = []
+                for submesh in mainmesh.submeshes:
+                    submeshes.append(SubmeshData(PackRecord(SubMesh.dtype, submesh), submesh.faces.copy()))
+                    submesh.Release()
+                mainmeshes.append(MainmeshData(PackRecord(Mainmesh.dtype, mainmesh), submeshes))
+            lodGroups.append(LODGroupData(PackRecord(LODGroup.dtype, lodGroup), mainmeshes))
+
+        return ModelData(ReadStruct(fileBuffer, pos, ModelInfo.dtype), lodGroups,
+                         [modelInfo.uniqueLODGroupOffsets.index(offset) for offset in modelInfo.lodGroupOffsets])
+
+    def FaceIndexSize(self) -> int:
+        # 32-bit indices are only used when some submesh has more vertices than 16-bit indices can address
+        for model in (self.mainModel, self.shadowModel):
+            if model is None:
+                continue
+            for submesh in self.__Submeshes(model):
+                if submesh.faces.size and int(submesh.faces.max()) > 0xFFFF:
+                    return 4
+        return 2
+
+    @staticmethod
+    def __Submeshes(model: ModelData) -> Iterator[SubmeshData]:
+        for lodGroup in model.lodGroups:
+            for mainmesh in lodGroup.mainmeshes:
+                yield from mainmesh.submeshes
+
+    def ToBytes(self) -> bytearray:
+        writer = BinaryWriter()
+        writer.Reserve(Header.size)
+        writer.Align()
+
+        lodDescriptionsOffset = self.__WriteModel(writer, self.mainModel)
+        shadowLODDescriptionsOffset = self.__WriteModel(writer, self.shadowModel) if self.shadowModel is not None else 0
+
+        armatureHeaderOffset = boundingBoxHeaderOffset = 0
+        if self.armature is not None:
+            armatureHeaderOffset, boundingBoxHeaderOffset = self.__WriteArmature(writer, self.armature)
+
+        vertexBufferHeaderOffset = self.__WriteGeometry(writer)
+
+        # Materials come first in the name table, then the bones
+        names = list(dict.fromkeys(self.materialNames + (self.armature.boneNames if self.armature is not None else [])))
+        nameIndices = {name: idx for idx, name in enumerate(names)}
+        materialNameIndexBufferOffset = writer.Write(np.array([nameIndices[name] for name in self.materialNames],
+                                                              GetDType(np.ushort)))
+        writer.Align()
+        boneNameIndexBufferOffset = 0
+        if self.armature is not None:
+            boneNameIndexBufferOffset = writer.Write(np.array([nameIndices[name] for name in self.armature.boneNames],
+                                                              GetDType(np.ushort)))
+            writer.Align()
+
+        nameTableOffset = writer.Reserve(8 * len(names))
+        nameOffsets = [writer.Write(name.encode('utf-8') + b'\0') for name in names]
+        writer.WriteAt(nameTableOffset, np.array(nameOffsets, GetDType(np.ulonglong)))
+        writer.Align()
+
+        writer.WriteAt(0, PackRecord(Header.dtype, self, magic=0x4853454D, fileSize=writer.pos,
+                                     nameTableNodeCount=len(names),
+                                     lodDescriptionsOffset=lodDescriptionsOffset,
+                                     shadowLODDescriptionsOffset=shadowLODDescriptionsOffset,
+                                     armatureHeaderOffset=armatureHeaderOffset,
+                                     boundingBoxHeaderOffset=boundingBoxHeaderOffset,
+                                     vertexBufferHeaderOffset=vertexBufferHeaderOffset,
+                                     materialNameIndexBufferOffset=materialNameIndexBufferOffset,
+                                     boneNameIndexBufferOffset=boneNameIndexBufferOffset,
+                                     nameTableOffset=nameTableOffset))
+        return writer.buffer
+
+    def Write(self, path: str):
+        with open(path, 'wb') as file:
+            file.write(self.ToBytes())
+
+    @staticmethod
+    def __WriteModel(writer: BinaryWriter, model: ModelData) -> int:
+        # Every record is reserved before the records it points to, so the tables come out in the order REEMesh
+        # walks them, face indices of the submeshes follow each other through the whole model
+        modelOffset = writer.Reserve(ModelInfo.size + 8 * len(model.lodSlots))
+        writer.Align()
+
+        faceIndicesBefore = 0
+        lodGroupOffsets: list[int] = []
+        for lodGroup in model.lodGroups:
+            lodGroupOffset = writer.Reserve(LODGroup.size + 8 * len(lodGroup.mainmeshes))
+            writer.Align()
+
+            mainmeshOffsets: list[int] = []
+            for mainmesh in lodGroup.mainmeshes:
+                mainmeshOffset = writer.Reserve(Mainmesh.size + SubMesh.size * len(mainmesh.submeshes))
+                writer.Align()
+
+                submeshRecords = np.zeros(len(mainmesh.submeshes), SubMesh.dtype)
+                submeshRecords['materialID'] = [submesh.materialID for submesh in mainmesh.submeshes]
+                submeshRecords['verticesBefore'] = [submesh.verticesBefore for submesh in mainmesh.submeshes]
+                submeshRecords['faceIndexCount'] = [submesh.faces.size for submesh in mainmesh.submeshes]
+                submeshRecords['faceIndicesBefore'] = faceIndicesBefore + \
+                    np.cumsum(submeshRecords['faceIndexCount'], dtype=np.int64) - submeshRecords['faceIndexCount']
+                mainmeshFaceIndexCount = int(submeshRecords['faceIndexCount'].sum(dtype=np.int64))
+                faceIndicesBefore += mainmeshFaceIndexCount
+
+                writer.WriteAt(mainmeshOffset, PackRecord(Mainmesh.dtype, mainmesh,
+                                                          submeshCount=len(mainmesh.submeshes),
+                                                          mainmeshFaceIndexCount=mainmeshFaceIndexCount))
+                writer.WriteAt(mainmeshOffset + Mainmesh.size, submeshRecords)
+                mainmeshOffsets.append(mainmeshOffset)
+
+            writer.WriteAt(lodGroupOffset, PackRecord(LODGroup.dtype, lodGroup, mainmeshCount=len(mainmeshOffsets),
+                                                      mainmeshHeaderOffsetsOffset=lodGroupOffset + LODGroup.size))
+            writer.WriteAt(lodGroupOffset + LODGroup.size, np.array(mainmeshOffsets, GetDType(np.ulonglong)))
+            lodGroupOffsets.append(lodGroupOffset)
+
+        writer.WriteAt(modelOffset, PackRecord(ModelInfo.dtype, model, lodGroupCount=len(model.lodSlots)))
+        writer.WriteAt(modelOffset + ModelInfo.size,
+                       np.array([lodGroupOffsets[slot] for slot in model.lodSlots], GetDType(np.ulonglong)))
+        return modelOffset
+
+    @staticmethod
+    def __WriteArmature(writer: BinaryWriter, armature: ArmatureData) -> tuple[int, int]:
+        armatureHeaderOffset = writer.Reserve(ArmatureHeader.size + 2 * len(armature.skinBoneMap))
+        writer.Align()
+
+        tableOffsets: list[int] = []
+        for table, dtype in ((armature.boneHierarchy, BoneHierarchy.dtype),
+                             (armature.localBoneTransforms, BoneTransform.dtype),
+                             (armature.globalBoneTransforms, BoneTransform.dtype),
+                             (armature.inverseGlobalTransfroms, BoneTransform.dtype)):
+            tableOffsets.append(writer.Write(np.asarray(table).astype(dtype.base if dtype.subdtype else dtype,
+                                                                      copy=False)))
+            writer.Align()
+
+        writer.WriteAt(armatureHeaderOffset, PackRecord(ArmatureHeader.dtype, armature,
+                                                        boneCount=len(armature.boneHierarchy),
+                                                        skinMapSize=len(armature.skinBoneMap),
+                                                        boneHierarchyTableOffset=tableOffsets[0],
+                                                        localBoneTransformsTableOffset=tableOffsets[1],
+                                                        globalBoneTransformsTableOffset=tableOffsets[2],
+                                                        inverseGlobalBoneTransformsTableOffset=tableOffsets[3]))
+        writer.WriteAt(armatureHeaderOffset + ArmatureHeader.size,
+                       np.asarray(armature.skinBoneMap, GetDType(np.ushort)))
+
+        # The boxes are stored with a zero fourth component on both corners
+        boundingBoxHeaderOffset = writer.Reserve(16)
+        writer.Align()
+        boundingBoxes = np.zeros((len(armature.boneBoundingBoxes), 2, 4), GetDType(np.single))
+        boundingBoxes[:, :, 0:3] = armature.boneBoundingBoxes
+        boundingBoxBufferOffset = writer.Write(boundingBoxes)
+        writer.Align()
+        writer.WriteAt(boundingBoxHeaderOffset, GetStruct('<QQ').pack(len(boundingBoxes), boundingBoxBufferOffset))
+        return armatureHeaderOffset, boundingBoxHeaderOffset
+
+    def __WriteGeometry(self, writer: BinaryWriter) -> int:
+        # Element streams follow each other in element order, which is how GeometryBuffersHeader tells their vertex
+        # counts apart, then come the faces of the main and the shadow geometry
+        vertexBufferHeaderOffset = writer.Reserve(GeometryBuffersHeader.size)
+        vertexElementHeadersOffset = writer.Reserve(VertexElementHeader.size * len(self.vertexElements))
+        writer.Align()
+
+        vertexBufferOffset = writer.pos
+        elementHeaders = np.zeros(len(self.vertexElements), VertexElementHeader.dtype)
+        for i, element in enumerate(self.vertexElements):
+            elementHeaders[i] = (element.elementType.value, element.bytesPerVertex,
+                                 writer.Write(element.Encode()) - vertexBufferOffset)
+            writer.Align(4)
+        vertexBufferSize = writer.pos - vertexBufferOffset
+        writer.WriteAt(vertexElementHeadersOffset, elementHeaders)
+        writer.Align()
+
+        faceIndexType = GetDType(np.uintc if self.FaceIndexSize() == 4 else np.ushort)
+        faceIndexBufferOffset = writer.pos
+        for model in (self.mainModel, self.shadowModel):
+            if model is not None:
+                faces = [submesh.faces.reshape(-1) for submesh in self.__Submeshes(model)]
+                if faces:
+                    writer.Write(np.concatenate(faces).astype(faceIndexType, copy=False))
+        faceIndexBufferSize = writer.pos - faceIndexBufferOffset
+        writer.Align()
+
+        writer.WriteAt(vertexBufferHeaderOffset, PackRecord(GeometryBuffersHeader.dtype, self,
+                                                            vertexElementHeadersOffset=vertexElementHeadersOffset,
+                                                            vertexBufferOffset=vertexBufferOffset,
+                                                            faceIndexBufferOffset=faceIndexBufferOffset,
+                                                            vertexBufferSize=vertexBufferSize,
+                                                            faceIndexBufferSize=faceIndexBufferSize,
+                                                            blendShapesOffset=-1))
+        return vertexBufferHeaderOffset
+
+
+def SyntheticModelData(lodGroups: list[LODGroupData], materialCount: int, positions: np.ndarray) -> ModelData:
+    # Counts and bounds of a generated model, the bounding sphere goes where the files keep it
+    model = ModelData(lodGroups=lodGroups)
+    model.materialCount = materialCount
+    model.uvLayerCount = 2
+    model.totalMeshCount = sum(len(lodGroup.mainmeshes) for lodGroup in lodGroups)
+
+    boxMin, boxMax = positions.min(axis=0), positions.max(axis=0)
+    center = (boxMin + boxMax) / 2
+    model.ukn3 = (*center, np.linalg.norm(boxMax - center))
+    model.boundingBox = (*boxMin, 0.0, *boxMax, 0.0)
+    return model
+
+
+def GenerateSyntheticMesh(vertexCount: int, boneCount: int = 0, materialCount: int = 1, lodCount: int = 1,
+                          shadowGeo: bool = False, seed: int = 0) -> REEMeshWriter:
+    # A model of random geometry for tests and benchmarks, each LOD has half the vertices of the one before and is
+    # split into one submesh per material, faces run along the vertices as a triangle strip
+    if not 1 <= materialCount <= 255:
+        raise RuntimeError("A mainmesh holds between 1 and 255 submeshes!")
+
+    rng = np.random.default_rng(seed)
+    writer = REEMeshWriter()
+
+    def StripFaces(count: int) -> np.ndarray:
+        return (np.arange(max(count - 2, 0), dtype=np.uintc)[:, None] + np.arange(3, dtype=np.uintc))
+
+    def RandomUnitVectors(count: int) -> np.ndarray:
+        vectors = rng.standard_normal((count, 3)).astype(np.single)
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), np.single(1e-6))
+
+    # Geometry of every LOD goes into the same streams
+    lodGroups: list[LODGroupData] = []
+    verticesBefore = 0
+    for lodIdx in range(lodCount):
+        lodVertexCount = max(vertexCount >> lodIdx, 3 * materialCount)
+        submeshes: list[SubmeshData] = []
+        for materialID, submeshVertexCount in enumerate(np.diff(np.linspace(0, lodVertexCount, materialCount + 1,
+                                                                            dtype=np.int64)).tolist()):
+            submesh = SubmeshData(faces=StripFaces(submeshVertexCount))
+            submesh.materialID = materialID
+            submesh.verticesBefore = verticesBefore
+            submeshes.append(submesh)
+            verticesBefore += submeshVertexCount
+
+        mainmesh = MainmeshData(submeshes=submeshes)
+        mainmesh.mainmeshVertexCount = lodVertexCount
+        lodGroup = LODGroupData(mainmeshes=[mainmesh])
+        lodGroup.ukn2 = np.single(lodIdx / max(lodCount, 1))
+        lodGroups.append(lodGroup)
+    mainVertexCount = verticesBefore
+
+    positions = rng.standard_normal((mainVertexCount, 3)).astype(np.single)
+    tangents = np.ones((mainVertexCount, 4), np.single)
+    tangents[:, 0:3] = RandomUnitVectors(mainVertexCount)
+    writer.vertexElements = [
+        VertexElementData(VertexElementHeader.ElementType.VertexPosition, 12, positions),
+        VertexElementData(VertexElementHeader.ElementType.NormalsTangents, 8,
+                          (RandomUnitVectors(mainVertexCount), tangents)),
+        VertexElementData(VertexElementHeader.ElementType.UV0, 4, rng.random((mainVertexCount, 2)).astype(np.half)),
+        VertexElementData(VertexElementHeader.ElementType.UV1, 4, rng.random((mainVertexCount, 2)).astype(np.half)),
+    ]
+
+    if boneCount:
+        # Skin weights can only address the first 256 bones through the skin bone map
+        skinMapSize = min(boneCount, 256)
+        weights = rng.random((mainVertexCount, 8)).astype(np.single)
+        writer.vertexElements.append(VertexElementData(
+            VertexElementHeader.ElementType.BoneInfo, 16,
+            (rng.integers(0, skinMapSize, (mainVertexCount, 8)).astype(np.ubyte),
+             weights / weights.sum(axis=1, keepdims=True))))
+
+        # Bones form a binary tree, each one a little above its parent
+        boneIndices = np.arange(boneCount)
+        depths = np.floor(np.log2(boneIndices + 1)).astype(np.single)
+        armature = ArmatureData()
+        armature.ukn1 = 0
+        armature.boneHierarchy = np.zeros(boneCount, BoneHierarchy.dtype)
+        armature.boneHierarchy['index'] = boneIndices
+        armature.boneHierarchy['parent'] = (boneIndices - 1) // 2
+        armature.boneHierarchy['nextSibling'] = np.where((boneIndices % 2 == 1) & (boneIndices + 1 < boneCount),
+                                                         boneIndices + 1, -1)
+        armature.boneHierarchy['nextChild'] = np.where(2 * boneIndices + 1 < boneCount, 2 * boneIndices + 1, -1)
+        armature.boneHierarchy['cousin'] = -1
+
+        # Transforms are row-major with the translation in the last row
+        armature.localBoneTransforms = np.tile(np.eye(4, dtype=np.single), (boneCount, 1, 1))
+        armature.localBoneTransforms[1:, 3, 1] = 0.1
+        armature.globalBoneTransforms = np.tile(np.eye(4, dtype=np.single), (boneCount, 1, 1))
+        armature.globalBoneTransforms[:, 3, 1] = depths * np.single(0.1)
+        armature.inverseGlobalTransfroms = np.tile(np.eye(4, dtype=np.single), (boneCount, 1, 1))
+        armature.inverseGlobalTransfroms[:, 3, 1] = -depths * np.single(0.1)
+
+        armature.skinBoneMap = np.arange(skinMapSize, dtype=np.ushort)
+        armature.boneBoundingBoxes = \
+            np.stack([positions.min(axis=0), positions.max(axis=0)])[None].repeat(skinMapSize, 0)
+        armature.boneNames = [f"Bone_{i}" for i in range(boneCount)]
+        writer.armature = armature
+
+    writer.vertexElementCount = (len(writer.vertexElements), len(writer.vertexElements))
+    writer.mainModel = SyntheticModelData(lodGroups, materialCount, positions)
+
+    if shadowGeo:
+        # The shadow geometry repeats the positions of the last LOD in a stream of its own
+        lastLOD = lodGroups[-1].mainmeshes[0]
+        shadowFirst = lastLOD.submeshes[0].verticesBefore
+        shadowPositions = positions[shadowFirst:shadowFirst + lastLOD.mainmeshVertexCount].copy()
+        writer.vertexElements.append(VertexElementData(VertexElementHeader.ElementType.VertexPosition, 12,
+                                                       shadowPositions))
+        writer.vertexElementCount = (writer.vertexElementCount[0], len(writer.vertexElements))
+
+        shadowSubmesh = SubmeshData(faces=StripFaces(len(shadowPositions)))
+        shadowMainmesh = MainmeshData(submeshes=[shadowSubmesh])
+        shadowMainmesh.mainmeshVertexCount = len(shadowPositions)
+        writer.shadowModel = SyntheticModelData([LODGroupData(mainmeshes=[shadowMainmesh])], 1, shadowPositions)
+
+    writer.materialNames = [f"Material_{i}" for i in range(materialCount)]
+    return writer
@@ -1,8 +1,41 @@
-from bpy.props import PointerProperty, StringProperty, BoolProperty, CollectionProperty
+from bpy.props import PointerProperty, StringProperty, BoolProperty, CollectionProperty, EnumProperty, IntProperty
 from bpy.types import PropertyGroup, Operator, Panel
 from bpy_extras.io_utils import ImportHelper
 import bpy
 
+def GetMeshCache(props) -> object or None:
+    from . import Import
+
+    return Import.GetMeshCache(props.meshCacheSize * 1024 ** 2) if props.useMeshCache else None
+
+
+def LoadSelectedProxy():
+    # Runs from a timer, outside of the message bus callback, since loading changes the scene and the object mode
+    from . import Import
+
+    context = bpy.context
+    if context.scene.reProps.loadProxyOnSelect and Import.IsREModelProxy(context.view_layer.objects.active):
+        Import.LoadProxyGeometry(context.view_layer.objects.active, GetMeshCache(context.scene.reProps))
+
+
+def OnActiveObjectChanged():
+    from . import Import
+
+    if Import.IsREModelProxy(bpy.context.view_layer.objects.active):
+        bpy.app.timers.register(LoadSelectedProxy)
+
+
+proxyMsgBusOwner = object()
+
+
+@bpy.app.handlers.persistent
+def SubscribeToActiveObject(*args):
+    # Subscriptions are cleared whenever a file is loaded, so this runs on register and after every load
+    bpy.msgbus.clear_by_owner(proxyMsgBusOwner)
+    bpy.msgbus.subscribe_rna(key=(bpy.types.LayerObjects, "active"), owner=proxyMsgBusOwner, args=(),
+                             notify=OnActiveObjectChanged)
+
+
 class UIProps(PropertyGroup):
 
     meshPath: StringProperty(
@@ -63,6 +96,34 @@ class UIProps(PropertyGroup):
         default=False
     )
 
+    proxyMode: EnumProperty(
+        name="Import As",
+        description="Import the full model, or only boxes that stand in for it until its geometry is loaded",
+        items=[('NONE', "Full Geometry", "Import the whole model"),
+               ('BOX', "Submesh Boxes", "Import one box per submesh of the highest quality LOD"),
+               ('BONE_BOX', "Bone Boxes", "Import one box per skinned bone, or per submesh if the file has none")],
+        default='NONE'
+    )
+
+    useMeshCache: BoolProperty(
+        name="Cache Decoded Meshes",
+        description="Keep the decoded vertex data of imported files on disk, so importing them again is faster",
+        default=False
+    )
+
+    meshCacheSize: IntProperty(
+        name="Cache Size (MB)",
+        description="Disk space the mesh cache may use before the least recently used files are removed from it",
+        default=2048,
+        min=64
+    )
+
+    loadProxyOnSelect: BoolProperty(
+        name="Load Proxies On Select",
+        description="Replace a proxy with its full model as soon as it becomes the active object",
+        default=True
+    )
+
     @classmethod
     def Register(cls):
         bpy.utils.register_class(cls)
@@ -129,10 +190,22 @@ class OBJECT_PT_REEModel(Panel):
         shadRow.separator(factor=1.0)
         shadRow.prop(props, "importShadowGeo")
 
+        proxyRow = col1ImportBox.row(align=True)
+        proxyRow.separator(factor=1.0)
+        proxyRow.prop(props, "proxyMode", text="")
+
         importButtonRow = col1ImportBox.row()
         importButtonRow.alignment = 'CENTER'
         importButtonRow.operator(OBJECT_OT_REMeshImport.bl_idname)
 
+        col1.prop(props, "useMeshCache")
+        if props.useMeshCache:
+            cacheRow = col1.row(align=True)
+            cacheRow.separator(factor=1.0)
+            cacheRow.prop(props, "meshCacheSize")
+        col1.prop(props, "loadProxyOnSelect")
+        col1.operator(OBJECT_OT_RELoadProxies.bl_idname)
+
     @classmethod
     def Register(cls):
         bpy.utils.register_class(cls)
@@ -153,7 +226,34 @@ class OBJECT_OT_REMeshImport(Operator):
         props = context.scene.reProps
         Import.LoadREModel(props.meshPath, props.mdfPath if props.importMDF else None, props.hqTextures,
                            props.assetRootDir if props.customRoot else None, props.importHQLODOnly,
-                           not props.importShadowGeo, props.importArmature)
+                           not props.importShadowGeo, props.importArmature, props.proxyMode, GetMeshCache(props))
+
+        return {'FINISHED'}
+
+    @classmethod
+    def Register(cls):
+        bpy.utils.register_class(cls)
+
+    @classmethod
+    def Unregister(cls):
+        bpy.utils.unregister_class(cls)
+
+class OBJECT_OT_RELoadProxies(Operator):
+    bl_idname = "reengine.load_proxies"
+    bl_label = "Load Selected Proxies"
+    bl_description = "Replace the selected (or isolated) model proxies with their full geometry"
+
+    def execute(self, context: bpy.types.Context):
+        from . import Import
+
+        proxies = [obj for obj in context.selected_objects if Import.IsREModelProxy(obj)]
+        if not proxies:
+            self.report({'WARNING'}, "No model proxy is selected")
+            return {'CANCELLED'}
+
+        meshCache = GetMeshCache(context.scene.reProps)
+        for proxy in proxies:
+            Import.LoadProxyGeometry(proxy, meshCache)
 
         return {'FINISHED'}
 
@@ -277,6 +377,8 @@ class IMPORT_OT_REModel(bpy.types.Operator, ImportHelper):
         layout.prop(props, "importArmature")
         layout.prop(props, "importHQLODOnly")
         layout.prop(props, "importShadowGeo")
+        layout.prop(props, "proxyMode")
+        layout.prop(props, "useMeshCache")
         layout.prop(props, "hqTextures")
 
     def execute(self, context):
@@ -288,13 +390,17 @@ class IMPORT_OT_REModel(bpy.types.Operator, ImportHelper):
             ret = {'CANCELLED'}
             dirName = os.path.dirname(self.filepath)
             modelPath: tuple[str or None, str or None] = (None, None)
+            meshPaths: list[str] = []
+            mdfPaths: dict[str, str] = {}
             for file in self.files:
                 path = os.path.join(dirName, file.name)
                 ext = os.path.splitext(file.name)[1]
                 if ext == ".1808282334":
                     modelPath = (path, modelPath[1])
+                    meshPaths.append(path)
                 elif ext == ".10":
                     modelPath = (modelPath[0], path)
+                    mdfPaths[os.path.splitext(os.path.splitext(file.name)[0])[0]] = path
 
             if modelPath[0] is None:
                 if modelPath[1] is None:
@@ -304,8 +410,17 @@ class IMPORT_OT_REModel(bpy.types.Operator, ImportHelper):
                 self.report({'ERROR'}, "A mesh file must be selected")
                 return ret
 
+            if len(meshPaths) > 1:
+                # Several models are decoded in parallel, each one gets the MDF file with the same name if selected
+                Import.LoadREModels(meshPaths, [mdfPaths.get(os.path.splitext(os.path.splitext(
+                    os.path.basename(path))[0])[0]) for path in meshPaths], useHQTex=props.hqTextures,
+                    hqLODOnly=props.importHQLODOnly, mainGeoOnly=not props.importShadowGeo,
+                    loadArmature=props.importArmature, proxyMode=props.proxyMode, meshCache=GetMeshCache(props))
+                return {'FINISHED'}
+
             Import.LoadREModel(modelPath[0], modelPath[1] if modelPath[1] is not None else None, props.hqTextures, None,
-                                props.importHQLODOnly, not props.importShadowGeo, props.importArmature)
+                                props.importHQLODOnly, not props.importShadowGeo, props.importArmature,
+                                props.proxyMode, GetMeshCache(props))
             ret = {'FINISHED'}
 
             return ret
@@ -314,7 +429,8 @@ class IMPORT_OT_REModel(bpy.types.Operator, ImportHelper):
 
             if os.path.splitext(self.filepath)[1] == ".1808282334":
                 Import.LoadREModel(props.filepath, None, props.hqTextures, None, props.importHQLODOnly,
-                                   not props.importShadowGeo, props.importArmature)
+                                   not props.importShadowGeo, props.importArmature, props.proxyMode,
+                                   GetMeshCache(props))
                 ret = {'FINISHED'}
 
             return ret
@@ -333,17 +449,23 @@ def MenuFuncImport(self, context: bpy.types.Context):
 def Register():
     UIProps.Register()
     OBJECT_OT_REMeshImport.Register()
+    OBJECT_OT_RELoadProxies.Register()
     OBJECT_PT_REEModel.Register()
     VIEWPORT_OT_FillPaths.Register()
     VIEWPORT_OT_FillMDFPath.Register()
     IMPORT_OT_REModel.Register()
     bpy.types.TOPBAR_MT_file_import.append(MenuFuncImport)
+    bpy.app.handlers.load_post.append(SubscribeToActiveObject)
+    SubscribeToActiveObject()
 
 def Unregister():
     UIProps.Unregister()
     OBJECT_OT_REMeshImport.Unregister()
+    OBJECT_OT_RELoadProxies.Unregister()
     OBJECT_PT_REEModel.Unregister()
     VIEWPORT_OT_FillPaths.Unregister()
     VIEWPORT_OT_FillMDFPath.Unregister()
     IMPORT_OT_REModel.Unregister()
-    bpy.types.TOPBAR_MT_file_import.remove(MenuFuncImport)
\ No newline at end of file
+    bpy.types.TOPBAR_MT_file_import.remove(MenuFuncImport)
+    bpy.app.handlers.load_post.remove(SubscribeToActiveObject)
+    bpy.msgbus.clear_by_owner(proxyMsgBusOwner)
\ No newline at end of file
@@ -18,9 +18,16 @@ bl_info = {
     "category": "Import - Node" }
 
 
-# Load the modules
-from . import UI
-from . import CustomNodes
+# Load the modules, the file format modules are also imported outside of Blender (by worker processes and command
+# line tools) where bpy is not available
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+if bpy is not None:
+    from . import UI
+    from . import CustomNodes
 
 # Register
 import traceback
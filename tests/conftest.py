@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+# The addon folder is the package, its name depends on how it was checked out or installed, so the tests import it
+# as re_engine_model through a link in a temporary directory
+# The link goes on sys.path rather than into sys.modules so the worker processes of ParsePool can import it too
+packageRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+linkDirectory = tempfile.mkdtemp(prefix="re_engine_model_tests_")
+os.symlink(packageRoot, os.path.join(linkDirectory, "re_engine_model"), target_is_directory=True)
+sys.path.insert(0, linkDirectory)
@@ -0,0 +1,36 @@
+import os
+
+from re_engine_model.AssetIndex import AssetIndex
+from re_engine_model.REEMeshFile import REEMesh
+from re_engine_model.REEMeshWriter import GenerateSyntheticMesh
+
+
+def WriteFile(path, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as file:
+        file.write(data)
+
+
+def test_UpdateAndQueries(tmp_path):
+    root = tmp_path / "x64"
+    meshBuffer = bytes(GenerateSyntheticMesh(3000, boneCount=4, materialCount=2, lodCount=2).ToBytes())
+    WriteFile(str(root / "character" / "body.mesh.1808282334"), meshBuffer)
+    WriteFile(str(root / "stage" / "rock.mesh.1808282334"), bytes(GenerateSyntheticMesh(500).ToBytes()))
+    WriteFile(str(root / "stage" / "broken.mesh.1808282334"), b"junk" * 16)
+    # Other version 10 files are not MDF files
+    WriteFile(str(root / "stage" / "rock.uvs.10"), b"junk" * 16)
+
+    summary = REEMesh.Probe(meshBuffer)
+    with AssetIndex(str(tmp_path / "index.db")) as index:
+        assert index.Update(str(root), 1) == (3, 0)
+        assert [path for path, _ in index.FailedFiles()] == ["stage/broken.mesh.1808282334"]
+        assert index.MeshesUsingMaterial(summary.materialNames[0]) == ["character/body.mesh.1808282334",
+                                                                       "stage/rock.mesh.1808282334"]
+        assert index.MeshesUsingBone(summary.boneNames[0]) == ["character/body.mesh.1808282334"]
+        # Only the highest quality LOD counts
+        assert index.FolderCounts("character") == (1, summary.lodVertexCounts[0], summary.lodFaceCounts[0])
+
+        assert index.Update(str(root), 1) == (0, 0)
+        os.remove(str(root / "stage" / "rock.mesh.1808282334"))
+        assert index.Update(str(root), 1) == (0, 1)
+        assert index.FolderCounts()[0] == 1
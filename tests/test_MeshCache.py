@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pytest
+
+from re_engine_model.MeshCache import MeshCache
+from re_engine_model.REEMeshFile import REEMesh
+from re_engine_model.REEMeshWriter import GenerateSyntheticMesh
+
+
+@pytest.fixture
+def meshPath(tmp_path) -> str:
+    path = str(tmp_path / "model.mesh.1808282334")
+    with open(path, 'wb') as file:
+        file.write(GenerateSyntheticMesh(2000, lodCount=2).ToBytes())
+    return path
+
+
+def ReadModel(path: str, decodedElements: dict or None = None) -> REEMesh:
+    with open(path, 'rb') as file:
+        return REEMesh(file.read(), True, decodedElements)
+
+
+def AssertSameSubmeshes(expected: REEMesh, actual: REEMesh, lodCount: int or None = None):
+    for lodGroup, actualLODGroup in zip(expected.mainModel.lodGroups[0:lodCount],
+                                        actual.mainModel.lodGroups[0:lodCount]):
+        for submesh, actualSubmesh in zip(lodGroup.submeshes, actualLODGroup.submeshes):
+            np.testing.assert_array_equal(submesh.vertexBuffer, actualSubmesh.vertexBuffer)
+            np.testing.assert_array_equal(submesh.uv0s, actualSubmesh.uv0s)
+
+
+def test_StoreWritesOnlyDecodedStreams(tmp_path, meshPath):
+    meshCache = MeshCache(str(tmp_path / "cache"))
+
+    # Nothing decoded, nothing stored
+    meshCache.Store(meshPath, ReadModel(meshPath))
+    assert not meshCache.Contains(meshPath)
+    assert meshCache.size == 0
+
+    reModel = ReadModel(meshPath)
+    reModel.DecodeElements(lodCount=1)
+    meshCache.Store(meshPath, reModel)
+
+    lod0End = max(submesh.verticesBefore + submesh.vertexCount for submesh in reModel.mainModel.lodGroups[0].submeshes)
+    decodedElements = meshCache.Load(meshPath)
+    assert set(decodedElements) == set(reModel.mainModel.submeshes[0].elementStreams.values())
+    for decoded in decodedElements.values():
+        assert len(decoded[0] if type(decoded) == tuple else decoded) == lod0End
+    assert lod0End < max(reModel.vertexBufferHeader.elementVertexCounts)
+
+    # LOD0 comes from the cache, the LODs after it are still decoded from the file
+    cachedModel = ReadModel(meshPath, decodedElements)
+    AssertSameSubmeshes(ReadModel(meshPath), cachedModel)
+
+
+def test_StoreExtendsEntry(tmp_path, meshPath):
+    meshCache = MeshCache(str(tmp_path / "cache"))
+    reModel = ReadModel(meshPath)
+    reModel.DecodeElements(lodCount=1)
+    meshCache.Store(meshPath, reModel)
+    lod0Size = meshCache.size
+
+    cachedModel = ReadModel(meshPath, meshCache.Load(meshPath))
+    cachedModel.DecodeElements()
+    meshCache.Store(meshPath, cachedModel)
+    assert meshCache.size > lod0Size
+
+    fullModel = ReadModel(meshPath, meshCache.Load(meshPath))
+    vertexBufferHeader = fullModel.vertexBufferHeader
+    for index in fullModel.mainModel.submeshes[0].elementStreams.values():
+        assert vertexBufferHeader.DecodedVertexCount(index) == vertexBufferHeader.elementVertexCounts[index]
+    AssertSameSubmeshes(ReadModel(meshPath), fullModel)
+
+
+def test_TrimOnlyOverBudget(tmp_path, meshPath, monkeypatch):
+    cacheDir = tmp_path / "cache"
+    meshCache = MeshCache(str(cacheDir))
+    trimCalls = []
+    trim = MeshCache.Trim
+    monkeypatch.setattr(MeshCache, "Trim", lambda self: trimCalls.append(self) or trim(self))
+
+    reModel = ReadModel(meshPath)
+    reModel.DecodeElements()
+    meshCache.Store(meshPath, reModel)
+    assert not trimCalls
+
+    # The tracked size is kept across instances and matches the files on disk
+    entryDirs = [entry for entry in cacheDir.iterdir() if entry.is_dir()]
+    assert MeshCache(str(cacheDir)).size == sum(os.path.getsize(file) for file in entryDirs[0].iterdir())
+
+    otherPath = str(tmp_path / "other.mesh.1808282334")
+    with open(otherPath, 'wb') as file:
+        file.write(GenerateSyntheticMesh(3000).ToBytes())
+    meshCache.maxSize = meshCache.size
+    otherModel = ReadModel(otherPath)
+    otherModel.DecodeElements()
+    meshCache.Store(otherPath, otherModel)
+
+    # The least recently used entry goes
+    assert len(trimCalls) == 1
+    assert not meshCache.Contains(meshPath)
+    assert meshCache.Contains(otherPath)
+    assert meshCache.size <= meshCache.maxSize
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from re_engine_model.PakFile import Murmur3Hash, PakFile, PakFileSystem, PakPathHash, WritePakFile
+from re_engine_model.REEMeshFile import REEMesh
+from re_engine_model.REEMeshWriter import GenerateSyntheticMesh
+
+meshPath = "natives/x64/character/pl0000/pl0000.mesh.1808282334"
+
+
+def test_Murmur3Hash():
+    assert Murmur3Hash(b"", 0) == 0
+    assert Murmur3Hash(b"", 0xFFFFFFFF) == 0x81F16F39
+    assert Murmur3Hash(b"hello", 0) == 0x248BFA47
+    assert Murmur3Hash(b"The quick brown fox jumps over the lazy dog", 0x9747B28C) == 0x2FA826CD
+
+
+def test_PathHashIgnoresCaseAndSeparators():
+    assert PakPathHash("natives\\x64\\Character\\PL0000\\pl0000.mesh.1808282334") == PakPathHash(meshPath)
+    assert PakPathHash("/" + meshPath) == PakPathHash(meshPath)
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_ReadBack(tmp_path, compress):
+    files = {meshPath: bytes(GenerateSyntheticMesh(2000, boneCount=8).ToBytes()),
+             "natives/x64/raw.bin": os.urandom(100), "natives/x64/empty.bin": b""}
+    WritePakFile(str(tmp_path / "re_chunk_000.pak"), files, compress)
+
+    pak = PakFile(str(tmp_path / "re_chunk_000.pak"))
+    try:
+        for path, data in files.items():
+            assert pak.Contains(path)
+            assert pak.Read(path) == data
+        assert not pak.Contains("natives/x64/missing.bin")
+        with pytest.raises(FileNotFoundError):
+            pak.Read("natives/x64/missing.bin")
+    finally:
+        pak.Close()
+
+
+def test_FileSystemReadsPatchesOverBasePaks(tmp_path):
+    meshBuffer = bytes(GenerateSyntheticMesh(2000).ToBytes())
+    WritePakFile(str(tmp_path / "re_chunk_000.pak"), {meshPath: meshBuffer, "natives/x64/raw.bin": b"base" * 64})
+    WritePakFile(str(tmp_path / "re_chunk_000.pak.patch_001.pak"), {"natives/x64/raw.bin": b"patched"}, False)
+
+    with PakFileSystem.FromGameDirectory(str(tmp_path), cacheSize=1024) as fileSystem:
+        assert len(fileSystem) == 2
+        assert fileSystem.Read("natives/x64/raw.bin") == b"patched"
+        assert fileSystem.Read(meshPath) == meshBuffer
+        # Larger than the whole cache, so it is read again every time
+        assert fileSystem.Read(meshPath) == meshBuffer
+        assert REEMesh(fileSystem.Read(meshPath, cache=False)).mainModel.submeshes
+
+        localPath = fileSystem.LocalPath("natives/x64/raw.bin")
+        with open(localPath, 'rb') as localFile:
+            assert localFile.read() == b"patched"
+    assert not os.path.exists(localPath)
@@ -0,0 +1,49 @@
+import numpy as np
+
+from re_engine_model.ParsePool import ParsePool
+from re_engine_model.REEMeshFile import REEMesh
+from re_engine_model.REEMeshWriter import GenerateSyntheticMesh
+
+
+def test_MapMatchesParsingInProcess(tmp_path):
+    paths = []
+    for i in range(5):
+        path = str(tmp_path / f"model_{i}.mesh.1808282334")
+        GenerateSyntheticMesh(2000 + 100 * i, boneCount=4, lodCount=2, seed=i).Write(path)
+        paths.append(path)
+
+    with ParsePool(2) as pool:
+        for path, (mappedPath, reModel) in zip(paths, pool.Map(paths)):
+            assert mappedPath == path
+            with open(path, 'rb') as file:
+                expected = REEMesh(file.read())
+            for submesh, expectedSubmesh in zip(reModel.mainModel.submeshes, expected.mainModel.submeshes):
+                assert np.array_equal(submesh.vertexBuffer, expectedSubmesh.vertexBuffer)
+                assert np.array_equal(submesh.normals, expectedSubmesh.normals)
+                assert np.array_equal(submesh.boneWeights, expectedSubmesh.boneWeights)
+
+
+def test_MapKeepsOnlyAWindowOfFilesInFlight(tmp_path):
+    paths = []
+    for i in range(6):
+        path = str(tmp_path / f"model_{i}.mesh.1808282334")
+        GenerateSyntheticMesh(1000, seed=i).Write(path)
+        paths.append(path)
+
+    with ParsePool(1) as pool:
+        submitted = []
+        submit = pool.Submit
+        pool.Submit = lambda path, lazy=True: submitted.append(path) or submit(path, lazy)
+
+        consumed = 0
+        for mappedPath, reModel in pool.Map(paths, window=2):
+            consumed += 1
+            assert mappedPath == paths[consumed - 1]
+            assert len(submitted) - consumed <= 1
+        assert consumed == len(paths) and submitted == paths
+
+        submitted.clear()
+        models = pool.Map(paths)
+        next(models)
+        assert len(submitted) == 2 * pool.processes
+        models.close()
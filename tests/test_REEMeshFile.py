@@ -0,0 +1,83 @@
+import pytest
+
+from re_engine_model.BinaryFunctions import MapFile
+from re_engine_model.REEMeshFile import DetectFaceIndexSize, GeometryBuffersHeader, Header, REEMesh
+from re_engine_model.REEMeshWriter import GenerateSyntheticMesh
+
+
+def SetFaceIndexBufferSize(fileBuffer: bytearray, size: int) -> bytearray:
+    pos = Header(fileBuffer, 0).vertexBufferHeaderOffset + GeometryBuffersHeader.dtype.fields['faceIndexBufferSize'][1]
+    fileBuffer[pos:pos + 4] = size.to_bytes(4, 'little')
+    return fileBuffer
+
+
+def FaceIndexCount(fileBuffer: bytearray) -> int:
+    reModel = REEMesh(bytes(fileBuffer), lazy=True)
+    models = (reModel.mainModel, reModel.shadowModel) if reModel.hasShadowGeo else (reModel.mainModel,)
+    return sum(submesh.faceIndexCount for model in models for submesh in model.submeshes)
+
+
+@pytest.mark.parametrize("vertexCount, faceIndexSize", [(1000, 2), (70000, 4)])
+def test_FaceIndexSize(vertexCount, faceIndexSize):
+    fileBuffer = GenerateSyntheticMesh(vertexCount, lodCount=2, shadowGeo=True).ToBytes()
+    assert DetectFaceIndexSize(fileBuffer, Header(fileBuffer, 0)) == faceIndexSize
+
+    reModel = REEMesh(bytes(fileBuffer))
+    assert reModel.vertexBufferHeader.faceIndexSize == faceIndexSize
+    for submesh in reModel.mainModel.submeshes:
+        assert submesh.faces.max() < submesh.vertexCount
+
+
+@pytest.mark.parametrize("vertexCount, faceIndexSize", [(1000, 2), (70000, 4)])
+def test_FaceIndexSizeWithAlignmentPadding(vertexCount, faceIndexSize):
+    fileBuffer = GenerateSyntheticMesh(vertexCount).ToBytes()
+    paddedSize = (FaceIndexCount(fileBuffer) * faceIndexSize + 15) // 16 * 16
+    SetFaceIndexBufferSize(fileBuffer, paddedSize)
+    assert DetectFaceIndexSize(fileBuffer, Header(fileBuffer, 0)) == faceIndexSize
+
+
+def test_FaceIndexSizeRaisesWhenAmbiguous():
+    # A single triangle at 32-bit fits in the alignment padding of the 16-bit one
+    fileBuffer = GenerateSyntheticMesh(3).ToBytes()
+    assert FaceIndexCount(fileBuffer) == 3
+    SetFaceIndexBufferSize(fileBuffer, 12)
+    with pytest.raises(RuntimeError):
+        DetectFaceIndexSize(fileBuffer, Header(fileBuffer, 0))
+
+
+def test_FaceIndexSizeRaisesOnSlack():
+    # Slack beyond the alignment of either width is not taken for 32-bit indices
+    fileBuffer = GenerateSyntheticMesh(1000).ToBytes()
+    SetFaceIndexBufferSize(fileBuffer, FaceIndexCount(fileBuffer) * 4 + 64)
+    with pytest.raises(RuntimeError):
+        DetectFaceIndexSize(fileBuffer, Header(fileBuffer, 0))
+
+
+def test_IterSubmeshesClosesFileWhenStoppedEarly(tmp_path):
+    path = str(tmp_path / "model.mesh.1808282334")
+    GenerateSyntheticMesh(3000, materialCount=4, lodCount=2).Write(path)
+
+    reModel = REEMesh(MapFile(path), lazy=True)
+    submeshes = reModel.IterSubmeshes(closeFile=True)
+    lodIdx, mmIdx, smIdx, submesh = next(submeshes)
+    assert (lodIdx, mmIdx, smIdx) == (0, 0, 0) and len(submesh.vertexBuffer) == submesh.vertexCount
+    submeshes.close()
+    assert reModel.fileBuffer.closed
+
+
+def test_IterSubmeshesClosesFileOnConsumerError(tmp_path):
+    path = str(tmp_path / "model.mesh.1808282334")
+    GenerateSyntheticMesh(3000, materialCount=4).Write(path)
+
+    reModel = REEMesh(MapFile(path), lazy=True)
+    with pytest.raises(KeyError):
+        for _ in reModel.IterSubmeshes(closeFile=True):
+            raise KeyError()
+    assert reModel.fileBuffer.closed
+
+
+def test_IterSubmeshesWithoutShadowGeometry():
+    reModel = REEMesh(bytes(GenerateSyntheticMesh(1000).ToBytes()), lazy=True)
+    assert not reModel.hasShadowGeo
+    assert list(reModel.IterSubmeshes(shadowGeo=True)) == []
+    assert len(list(reModel.IterSubmeshes())) == len(reModel.mainModel.submeshes)
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from re_engine_model.REEMeshFile import REEMesh
+from re_engine_model.REEMeshWriter import REEMeshWriter, GenerateSyntheticMesh
+
+syntheticMeshes = [
+    dict(vertexCount=1000),
+    dict(vertexCount=5000, boneCount=40, materialCount=4, lodCount=3, shadowGeo=True),
+    dict(vertexCount=70000, materialCount=1, lodCount=2),
+]
+
+
+@pytest.mark.parametrize("options", syntheticMeshes)
+def test_WriteParsedMeshIsByteIdentical(options):
+    fileBuffer = bytes(GenerateSyntheticMesh(**options).ToBytes())
+    assert bytes(REEMeshWriter.FromREEMesh(REEMesh(fileBuffer)).ToBytes()) == fileBuffer
+
+
+@pytest.mark.parametrize("options", syntheticMeshes)
+def test_WrittenMeshKeepsGeneratedData(options):
+    generated = GenerateSyntheticMesh(**options)
+    reModel = REEMesh(bytes(generated.ToBytes()))
+
+    assert reModel.hasShadowGeo == options.get("shadowGeo", False)
+    assert len(reModel.mainModel.lodGroups) == options.get("lodCount", 1)
+    assert np.array_equal(reModel.vertexBufferHeader.DecodeElement(0), generated.vertexElements[0].data)
+    for submesh in reModel.mainModel.submeshes:
+        assert submesh.faces.size == 0 or submesh.faces.max() < submesh.vertexCount
+    if options.get("boneCount"):
+        assert reModel.armature.boneCount == options["boneCount"]
+
+
+def test_FaceIndexSizeFollowsVertexCount():
+    assert GenerateSyntheticMesh(1000).FaceIndexSize() == 2
+    assert GenerateSyntheticMesh(70000, lodCount=1).FaceIndexSize() == 4